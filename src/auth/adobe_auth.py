@@ -1,3 +1,4 @@
+import asyncio
 import jwt
 import os
 from datetime import datetime, timedelta
@@ -23,12 +24,22 @@ class AdobeAuth:
         
         self.access_token = None
         self.token_expires_at = None
+        # 동시 요청이 토큰을 중복 발급받지 않도록 보호
+        self._token_lock = asyncio.Lock()
         
         if not all([self.client_id, self.client_secret, self.company_id, self.report_suite_id, self.token_endpoint, self.scopes]):
             raise ValueError("Missing required environment variables")
 
     async def get_access_token(self, session: aiohttp.ClientSession) -> str:
         """액세스 토큰을 가져옵니다."""
+        if self.access_token and self.token_expires_at and self.token_expires_at > datetime.now():
+            return self.access_token
+
+        async with self._token_lock:
+            return await self._fetch_access_token(session)
+
+    async def _fetch_access_token(self, session: aiohttp.ClientSession) -> str:
+        """토큰 엔드포인트에서 새 액세스 토큰을 발급받습니다."""
         try:
             if self.access_token and self.token_expires_at and self.token_expires_at > datetime.now():
                 return self.access_token
@@ -0,0 +1,494 @@
+"""
+MCP 엔드포인트 부하 테스트
+
+N 개의 동시 MCP 세션을 열고 get_report / get_metrics / get_dimensions /
+get_realtime_report 호출을 섞어서 반복합니다. 서버는 로컬 모의 Adobe 백엔드를
+바라보도록 띄워 실제 Adobe API 를 호출하지 않습니다.
+
+전송 방식(--transport)을 sse / streamable-http / stdio 로 바꿔 같은 부하를 비교할 수 있습니다.
+stdio 는 세션마다 서버 프로세스를 하나씩 띄우며, 이 프로세스들의 RSS / CPU 를 합산합니다.
+
+결과:
+- 세션 연결(initialize 완료까지) 시간
+- 도구별 응답 시간 백분위수 (p50 / p90 / p99), 오류율, 과부하 거절 수
+- 일정 간격으로 측정한 서버 RSS / CPU 사용률
+
+사용 예:
+    # 모의 백엔드와 서버를 함께 띄워서 50 세션으로 60초 동안 실행
+    python load_test.py --spawn-server --sessions 50 --duration 60
+
+    # 이미 실행 중인 서버 (모의 백엔드를 바라보는) 에 실행
+    python load_test.py --url http://127.0.0.1:8080/sse --server-pid 12345
+
+    # stateless streamable-http, 워커 4개
+    python load_test.py --spawn-server --transport streamable-http --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# 기본 호출 비율 (도구 이름 = 가중치)
+DEFAULT_MIX = "get_report=50,get_metrics=20,get_dimensions=15,get_realtime_report=15"
+
+REPORT_SHAPES = [
+    {"date_range": "last_7_days", "metrics": ["visits", "pageviews"], "dimension": "page", "limit": 50},
+    {"date_range": "last_30_days", "metrics": ["visits"], "dimension": "lasttouchchannel", "limit": 10},
+    {"date_range": "yesterday", "metrics": ["orders", "revenue"], "dimension": "daterangehour", "limit": 24},
+    {"date_range": "this_month", "metrics": ["visitors"], "dimension": "page", "limit": 200},
+]
+
+
+# ---------------------------------------------------------------------------
+# 모의 Adobe 백엔드
+# ---------------------------------------------------------------------------
+
+
+def build_mock_app(latency: float) -> web.Application:
+    """Adobe Analytics API 를 흉내 내는 aiohttp 앱. 모든 응답에 latency 초 지연을 줍니다."""
+
+    async def delay():
+        if latency:
+            await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+
+    async def token(request):
+        return web.json_response({"access_token": "mock-token", "expires_in": 3600})
+
+    async def reports(request):
+        await delay()
+        body = await request.json()
+        limit = body.get("settings", {}).get("limit", 10)
+        width = len(body.get("metricContainer", {}).get("metrics", []))
+        rows = [
+            {
+                "itemId": str(1000000 + i),
+                "value": f"item-{i}",
+                "data": [random.randint(0, 10000) for _ in range(width)],
+            }
+            for i in range(limit)
+        ]
+        return web.json_response(
+            {
+                "totalPages": 1,
+                "firstPage": True,
+                "lastPage": True,
+                "numberOfElements": limit,
+                "number": 0,
+                "totalElements": limit,
+                "rows": rows,
+                "summaryData": {"totals": [sum(r["data"][i] for r in rows) for i in range(width)]},
+            }
+        )
+
+    async def realtime(request):
+        await delay()
+        body = await request.json()
+        width = len(body.get("metricContainer", {}).get("metrics", []))
+        now = time.time()
+        rows = []
+        for minute in range(30):
+            moment = time.gmtime(now - minute * 60)
+            item_id = "{:03d}{:02d}{:02d}{:02d}{:02d}".format(
+                moment.tm_year - 1900, moment.tm_mon - 1, moment.tm_mday, moment.tm_hour, moment.tm_min
+            )
+            rows.append({"itemId": item_id, "value": "", "data": [random.randint(0, 500) for _ in range(width)]})
+        return web.json_response({"rows": rows})
+
+    async def report_suite(request):
+        await delay()
+        # 모의 실시간 분 항목은 UTC 기준
+        return web.json_response(
+            {"rsid": request.match_info["rsid"], "timezoneZoneinfo": "UTC"}
+        )
+
+    def catalog(prefix: str, count: int):
+        items = [
+            {
+                "id": f"{prefix}/item{i}",
+                "title": f"Item {i}",
+                "name": f"Item {i}",
+                "category": "Traffic",
+                "type": "int",
+                "description": "모의 항목",
+            }
+            for i in range(count)
+        ]
+
+        async def handler(request):
+            await delay()
+            return web.json_response(items)
+
+        return handler
+
+    app = web.Application()
+    app.router.add_post("/token", token)
+    app.router.add_post("/{company}/reports", reports)
+    app.router.add_post("/{company}/reports/realtime", realtime)
+    app.router.add_get("/{company}/reportsuites/collections/suites/{rsid}", report_suite)
+    app.router.add_get("/{company}/metrics", catalog("metrics", 300))
+    app.router.add_get("/{company}/dimensions", catalog("variables", 300))
+    return app
+
+
+async def start_mock(port: int, latency: float) -> web.AppRunner:
+    runner = web.AppRunner(build_mock_app(latency))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+TRANSPORT_PATHS = {"sse": "/sse", "streamable-http": "/mcp/"}
+
+
+def server_env(server_port: int, mock_port: int, transport: str, workers: int = 1) -> dict:
+    """모의 백엔드를 바라보는 server.py 실행 환경 변수"""
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    return {
+        **os.environ,
+        "MCP_TRANSPORT": transport,
+        "SERVER_WORKERS": str(workers),
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(server_port),
+        "ANALYTICS_API_URL": mock_url,
+        "TOKEN_ENDPOINT": f"{mock_url}/token",
+        "CLIENT_ID": os.getenv("CLIENT_ID", "load-test"),
+        "CLIENT_SECRET": os.getenv("CLIENT_SECRET", "load-test"),
+        "COMPANY_ID": os.getenv("COMPANY_ID", "loadtest"),
+        "REPORT_SUITE_ID": os.getenv("REPORT_SUITE_ID", "loadtest.rsid"),
+        "SCOPES": os.getenv("SCOPES", "openid"),
+    }
+
+
+def spawn_server(server_port: int, mock_port: int, transport: str, workers: int) -> subprocess.Popen:
+    """모의 백엔드를 바라보는 HTTP 서버(server.py)를 실행합니다."""
+    return subprocess.Popen(
+        [sys.executable, SERVER_PATH],
+        env=server_env(server_port, mock_port, transport, workers),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 서버 리소스 측정 (/proc)
+# ---------------------------------------------------------------------------
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for child in _children(pid):
+        pids.extend(_process_tree(child))
+    return pids
+
+
+def read_process_usage(pid: int, include_root: bool = True) -> Optional[Tuple[int, float]]:
+    """프로세스(자식 포함)의 (RSS bytes, 누적 CPU 초). /proc 이 없으면 None.
+
+    include_root=False 이면 자식 프로세스만 합산합니다 (stdio 서버 측정용).
+    """
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    rss = 0
+    cpu = 0.0
+    try:
+        pids = _process_tree(pid) if include_root else [
+            p for child in _children(pid) for p in _process_tree(child)
+        ]
+        for p in pids:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            # fields[0] 은 state (stat 의 3번째 필드)
+            cpu += (int(fields[11]) + int(fields[12])) / clock_ticks
+            rss += int(fields[21]) * page_size
+    except (OSError, IndexError, ValueError):
+        return None
+    return rss, cpu
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성
+# ---------------------------------------------------------------------------
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+def tool_arguments(name: str) -> dict:
+    if name == "get_report":
+        params = dict(random.choice(REPORT_SHAPES))
+        params["page"] = random.randint(0, 2)
+    elif name == "get_realtime_report":
+        params = {"metrics": random.choice([["occurrences"], ["occurrences", "visitors"]])}
+    else:
+        params = {"limit": random.choice([50, 100])}
+    return {"params": params}
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+
+class LoadStats:
+    def __init__(self):
+        self.setup_times: List[float] = []
+        self.setup_errors = 0
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.overloaded: Dict[str, int] = defaultdict(int)
+        self.active_sessions = 0
+        self.completed = 0
+        self.timeline: List[dict] = []
+
+    def summary(self, elapsed: float) -> dict:
+        tools = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies[name]
+            calls = len(samples) + self.errors[name]
+            tools[name] = {
+                "calls": calls,
+                "p50_ms": percentile(samples, 0.5),
+                "p90_ms": percentile(samples, 0.9),
+                "p99_ms": percentile(samples, 0.99),
+                "errors": self.errors[name],
+                "overloaded": self.overloaded[name],
+                "error_rate": round(self.errors[name] / calls, 4) if calls else 0.0,
+            }
+        return {
+            "elapsed_seconds": round(elapsed, 1),
+            "throughput_per_second": round(self.completed / elapsed, 1) if elapsed else None,
+            "sessions": {
+                "opened": len(self.setup_times),
+                "failed": self.setup_errors,
+                "setup_p50_ms": percentile(self.setup_times, 0.5),
+                "setup_p99_ms": percentile(self.setup_times, 0.99),
+            },
+            "tools": tools,
+            "server": self.timeline,
+        }
+
+
+def open_transport(transport: str, url: str, env: Optional[dict]):
+    """전송 방식에 맞는 MCP 클라이언트 스트림을 엽니다."""
+    if transport == "stdio":
+        from mcp.client.stdio import StdioServerParameters, stdio_client
+
+        return stdio_client(
+            StdioServerParameters(command=sys.executable, args=[SERVER_PATH], env=env)
+        )
+    if transport == "streamable-http":
+        from mcp.client.streamable_http import streamablehttp_client
+
+        return streamablehttp_client(url)
+
+    from mcp.client.sse import sse_client
+
+    return sse_client(url)
+
+
+async def run_session(
+    transport: str,
+    url: str,
+    env: Optional[dict],
+    mix: Dict[str, int],
+    deadline: float,
+    think_time: float,
+    stats: LoadStats,
+):
+    from mcp import ClientSession
+
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    started = time.perf_counter()
+    initialized = False
+    try:
+        async with open_transport(transport, url, env) as streams:
+            read, write = streams[0], streams[1]
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                initialized = True
+                stats.setup_times.append(time.perf_counter() - started)
+                stats.active_sessions += 1
+                try:
+                    while time.monotonic() < deadline:
+                        name = random.choices(names, weights)[0]
+                        call_started = time.perf_counter()
+                        try:
+                            result = await session.call_tool(name, tool_arguments(name))
+                            if result.isError:
+                                stats.errors[name] += 1
+                                text = result.content[0].text if result.content else ""
+                                if "retry_after=" in text:
+                                    stats.overloaded[name] += 1
+                            else:
+                                stats.latencies[name].append(time.perf_counter() - call_started)
+                        except Exception:
+                            stats.errors[name] += 1
+                        stats.completed += 1
+                        if think_time:
+                            await asyncio.sleep(random.expovariate(1 / think_time))
+                finally:
+                    stats.active_sessions -= 1
+    except Exception:
+        if not initialized:
+            stats.setup_errors += 1
+
+
+async def sample_server(
+    pid: Optional[int], stats: LoadStats, interval: float, started: float, include_root: bool = True
+):
+    previous = read_process_usage(pid, include_root) if pid else None
+    previous_time = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.monotonic()
+        sample = {
+            "t": round(now - started, 1),
+            "active_sessions": stats.active_sessions,
+            "completed_calls": stats.completed,
+        }
+        usage = read_process_usage(pid, include_root) if pid else None
+        if usage is not None:
+            sample["rss_mb"] = round(usage[0] / (1024 * 1024), 1)
+            if previous is not None:
+                sample["cpu_percent"] = round((usage[1] - previous[1]) / (now - previous_time) * 100, 1)
+            previous, previous_time = usage, now
+        stats.timeline.append(sample)
+
+
+async def wait_for_server(port: int, timeout: float = 30) -> None:
+    """서버 포트가 연결을 받을 때까지 기다립니다."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            await asyncio.sleep(0.3)
+    raise RuntimeError(f"서버가 응답하지 않습니다: 127.0.0.1:{port}")
+
+
+async def main(args) -> dict:
+    mock_runner = None
+    server = None
+    pid = args.server_pid
+    url = args.url
+    env = None
+    include_root = True
+    try:
+        if args.mock_only:
+            mock_runner = await start_mock(args.mock_port, args.mock_latency / 1000)
+            print(f"모의 Adobe 백엔드 실행 중: http://127.0.0.1:{args.mock_port}", flush=True)
+            await asyncio.Event().wait()
+
+        if args.spawn_server:
+            mock_runner = await start_mock(args.mock_port, args.mock_latency / 1000)
+            if args.transport == "stdio":
+                # 세션마다 이 프로세스의 자식으로 서버가 실행됨
+                env = server_env(args.server_port, args.mock_port, "stdio")
+                pid, include_root = os.getpid(), False
+            else:
+                server = spawn_server(
+                    args.server_port, args.mock_port, args.transport, args.workers
+                )
+                pid = server.pid
+                url = f"http://127.0.0.1:{args.server_port}{TRANSPORT_PATHS[args.transport]}"
+                await wait_for_server(args.server_port)
+        elif args.transport == "stdio":
+            env = dict(os.environ)
+            pid, include_root = os.getpid(), False
+
+        stats = LoadStats()
+        started = time.monotonic()
+        deadline = started + args.duration
+        sampler = asyncio.create_task(
+            sample_server(pid, stats, args.sample_interval, started, include_root)
+        )
+
+        sessions = []
+        mix = parse_mix(args.mix)
+        for i in range(args.sessions):
+            sessions.append(
+                asyncio.create_task(
+                    run_session(
+                        args.transport, url, env, mix, deadline, args.think_time / 1000, stats
+                    )
+                )
+            )
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.sessions)
+        await asyncio.gather(*sessions)
+        sampler.cancel()
+        return {"transport": args.transport, **stats.summary(time.monotonic() - started)}
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if mock_runner is not None:
+            await mock_runner.cleanup()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="MCP 엔드포인트 부하 테스트")
+    parser.add_argument(
+        "--transport",
+        choices=["sse", "streamable-http", "stdio"],
+        default="sse",
+        help="MCP 전송 방식",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8080/sse", help="MCP 엔드포인트 URL")
+    parser.add_argument("--sessions", type=int, default=20, help="동시 세션 수")
+    parser.add_argument("--duration", type=float, default=30, help="실행 시간 (초)")
+    parser.add_argument("--ramp", type=float, default=5, help="모든 세션을 여는 데 걸리는 시간 (초)")
+    parser.add_argument("--think-time", type=float, default=200, help="세션 내 호출 간 평균 대기 (ms)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="도구별 호출 비율")
+    parser.add_argument("--sample-interval", type=float, default=2, help="서버 리소스 측정 간격 (초)")
+    parser.add_argument("--server-pid", type=int, help="RSS / CPU 를 측정할 서버 프로세스 ID")
+    parser.add_argument("--spawn-server", action="store_true", help="모의 백엔드와 서버를 함께 실행")
+    parser.add_argument("--mock-only", action="store_true", help="모의 Adobe 백엔드만 실행")
+    parser.add_argument("--server-port", type=int, default=18080, help="--spawn-server 서버 포트")
+    parser.add_argument("--workers", type=int, default=1, help="--spawn-server 워커 프로세스 수")
+    parser.add_argument("--mock-port", type=int, default=18090, help="모의 백엔드 포트")
+    parser.add_argument("--mock-latency", type=float, default=50, help="모의 백엔드 평균 응답 지연 (ms)")
+    parser.add_argument("--output", help="결과를 JSON 파일로 저장")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = asyncio.run(main(args))
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
@@ -2,9 +2,11 @@ import asyncio
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
 from auth.adobe_auth import AdobeAuth
 from tools.get_report import GetReportTool
+from tools.get_report_multi_suite import GetReportMultiSuiteTool
 from tools.get_dimensions import GetDimensionsTool
 from tools.get_metrics import GetMetricsTool
 from tools.get_segments import GetSegmentsTool
@@ -12,6 +14,29 @@ from tools.get_calculated_metrics import GetCalculatedMetricsTool
 from tools.get_report_suites import GetReportSuitesTool
 from tools.get_realtime_report import GetRealtimeReportTool
 from tools.get_data_feeds import GetDataFeedsTool
+from tools.evaluate_calculated_metrics import EvaluateCalculatedMetricsTool
+from tools.lookup_dimension_items import LookupDimensionItemsTool
+from tools.data_feed_sketches import GetDistinctCountsTool, IngestDataFeedTool
+from tools.analyze_trend import AnalyzeTrendTool
+from tools.configure_profiling import ConfigureProfilingTool
+from tools.export_report import ExportReportTool
+from utils.adobe_client import upstream_health
+from utils.realtime_buffer import realtime_buffer
+from utils.item_index import item_index, save_item_index
+from utils.admission import admission
+from utils.profiling import profiler
+from utils.report_fusion import report_fuser
+from utils.cache import catalog_cache, report_cache
+from utils.compression import (
+    MCP_COMPRESSION,
+    MCP_COMPRESSION_LEVEL,
+    MCP_COMPRESSION_MIN_SIZE,
+    CompressionMiddleware,
+    compression_stats,
+)
+from utils.page_sizer import page_sizer
+from utils.report_warmer import load_report_warmer
+from utils.lane_router import LaneRouter, lane_message_path
 from dotenv import load_dotenv
 
 # .env 파일 불러오기
@@ -21,6 +46,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MCP 전송 방식: sse (기본값), streamable-http, stdio
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "sse")
+if MCP_TRANSPORT not in ("sse", "streamable-http", "stdio"):
+    raise ValueError(f"지원하지 않는 MCP_TRANSPORT 입니다: {MCP_TRANSPORT}")
+
+# 워커 프로세스 수 (1보다 크면 supervisor 모드로 실행)
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 1))
+
+# supervisor 가 띄운 워커에만 설정됨 (supervisor.py 참고)
+SERVER_SOCKET_FD = os.getenv("SERVER_SOCKET_FD")
+SERVER_WORKER_ID = int(os.getenv("SERVER_WORKER_ID", 0))
+SERVER_WORKER_LANE = (
+    int(os.environ["SERVER_WORKER_LANE"]) if os.getenv("SERVER_WORKER_LANE") else None
+)
+
 # MCP 서버 인스턴스 생성
 mcp = FastMCP(
     name="adobe-analytics-server",
@@ -39,6 +79,15 @@ mcp = FastMCP(
         6. get_calculated_metrics – 계산된 지표 목록을 조회합니다.
         7. get_report_suites – 사용 가능한 Report Suite 목록을 조회합니다.
         8. get_data_feeds – 사용 가능한 데이터 피드 목록을 조회합니다.
+        9. get_report_multi_suite – 여러 Report Suite 에 같은 리포트를 동시에 실행하고 rsid 기준으로 합칩니다.
+        10. get_cache_stats – 리포트 캐시와 캐시 워머의 히트율을 조회합니다.
+        11. evaluate_calculated_metrics – 계산된 지표 수식을 기본 지표 리포트 하나로 로컬 계산합니다.
+        12. lookup_dimension_items – 차원 값 이름에 해당하는 itemId 를 조회합니다.
+        13. ingest_data_feed – 데이터 피드 파일로 일별 고유값 스케치(HyperLogLog)를 만듭니다.
+        14. get_distinct_counts – 일별 스케치를 병합해 기간 고유 방문자/페이지 수를 추정합니다.
+        15. analyze_trend – 일별 지표 시계열에서 이상치(요일 보정 z-score)와 추세 요약만 반환합니다.
+        16. configure_profiling – (관리자) 다음 도구 호출의 단계별 CPU / 메모리 프로파일을 저장합니다.
+        17. export_report – 큰 리포트를 로컬 파일(CSV / NDJSON / Parquet)로 내보내고 파일 경로, 행 수, 스키마, 미리보기만 반환합니다.
 
         ### 중요 사용 규칙
         - `get_report` 또는 `get_realtime_report`에 전달할 때는 `/` 기준으로 마지막 segment만 사용해야 합니다:
@@ -49,8 +98,14 @@ mcp = FastMCP(
 
         - `rsid`(Report Suite ID)는 명시적으로 지정하지 않으면 기본 환경 변수 값을 사용합니다.
     """,
-    host="0.0.0.0",
+    host=os.getenv("SERVER_HOST", "0.0.0.0"),
     port=int(os.getenv("SERVER_PORT", 8080)),  # .env에서 불러오며, 기본값 8080
+    # streamable-http: 요청마다 새 세션을 만들어 세션 고정 없이 로드 밸런싱 가능
+    stateless_http=os.getenv("MCP_STATELESS_HTTP", "true").lower() == "true",
+    # streamable-http: 응답을 SSE 스트림 대신 단일 JSON 으로 반환
+    json_response=os.getenv("MCP_JSON_RESPONSE", "true").lower() == "true",
+    # sse: 멀티 프로세스 모드에서는 워커마다 다른 메시지 경로를 사용
+    message_path=lane_message_path(SERVER_WORKER_LANE),
 )
 
 # 환경 변수에서 RSID 가져오기
@@ -59,6 +114,10 @@ if not REPORT_SUITE_ID:
     raise ValueError("REPORT_SUITE_ID 환경 변수가 설정되지 않았습니다.")
 
 
+# 리포트 캐시 워머 (REPORT_WARMER_CONFIG 가 설정된 경우에만 동작, 멀티 프로세스 모드에서는 워커 0 만)
+report_warmer = load_report_warmer() if SERVER_WORKER_ID == 0 else None
+
+
 def get_report_suite_id(params: dict) -> str:
     """파라미터에서 리포트 스위트 ID를 가져오거나 환경 변수에서 가져옵니다.
     기본적으로는 환경 변수에서 가져오며, 파라미터에 rsid가 명시적으로 지정된 경우에만 파라미터 값을 사용합니다.
@@ -75,6 +134,8 @@ def get_report_suite_id(params: dict) -> str:
 
 
 @mcp.tool()
+@admission.limited("get_report")
+@profiler.profiled("get_report")
 async def get_report(params: dict) -> dict:
     """Adobe Analytics 리포트를 가져옵니다.
 
@@ -86,6 +147,15 @@ async def get_report(params: dict) -> dict:
             - dimension (str, optional): 차원
             - limit (int, optional): 결과 제한 수
             - page (int, optional): 페이지 번호
+            - adaptive (bool, optional): 업스트림 페이지 크기 자동 조정 (응답은 요청한 페이지만 반환)
+            - item_values (list, optional): 차원 값 이름으로 행 필터 (예: ["Paid Search"])
+            - segments (list, optional): 세그먼트 ID 목록 (기본: 모두 적용)
+            - compare_segments (bool, optional): 세그먼트별로 동시에 실행해 항목 기준으로 나란히 비교
+            - search_clause (str, optional): 차원 값 검색 clause (예: "( CONTAINS 'checkout' )")
+            - include_item_ids (list, optional): 포함할 차원 항목 itemId 목록
+            - exclude_item_ids (list, optional): 제외할 차원 항목 itemId 목록
+            - exclude_nones (bool, optional): 값이 없는 (Unspecified) 행 제외
+            - metric_filters (list, optional): 지표 임계값 필터 (예: [{"metric": "visits", "operator": "ge", "value": 100}])
     """
     logger.error("get_report : ", params)
     auth = AdobeAuth()
@@ -98,6 +168,31 @@ async def get_report(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_report_multi_suite")
+@profiler.profiled("get_report_multi_suite")
+async def get_report_multi_suite(params: dict) -> dict:
+    """여러 리포트 스위트에 같은 리포트를 동시에 실행하고 rsid 기준 테이블로 합칩니다.
+
+    Args:
+        params (dict): 리포트 파라미터
+            - date_range (str): 날짜 범위
+            - metrics (list): 지표 목록
+            - dimension (str, optional): 차원
+            - limit (int, optional): 결과 제한 수
+            - page (int, optional): 페이지 번호
+            - rsids (list, optional): 리포트 스위트 ID 목록
+            - suite_name_filter (str, optional): 리포트 스위트 이름 필터 (rsids 가 없을 때 사용)
+            - max_suites (int, optional): 최대 리포트 스위트 수 (기본값: 50)
+    """
+    logger.error(f"get_report_multi_suite : {params}")
+    auth = AdobeAuth()
+    tool = GetReportMultiSuiteTool(auth)
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("get_dimensions")
+@profiler.profiled("get_dimensions")
 async def get_dimensions(params: dict) -> dict:
     """사용 가능한 차원 목록을 가져옵니다.
 
@@ -118,6 +213,8 @@ async def get_dimensions(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_metrics")
+@profiler.profiled("get_metrics")
 async def get_metrics(params: dict) -> dict:
     """사용 가능한 지표 목록을 가져옵니다.
 
@@ -151,39 +248,79 @@ async def get_metrics(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_segments")
+@profiler.profiled("get_segments")
 async def get_segments(params: dict) -> dict:
     """사용 가능한 세그먼트 목록을 가져옵니다.
 
     Args:
         params (dict): 파라미터
-            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
-            - limit (int, optional): 결과 제한 수
+            - limit (int, optional): 결과 제한 수 (페이지 크기)
             - page (int, optional): 페이지 번호
+            - max_results (int, optional): 최대 결과 수 (limit 보다 크면 여러 페이지를 동시에 조회)
+            - rsids (list, optional): 리포트 스위트 ID 필터 (없으면 모든 리포트 스위트)
+            - rsid (str, optional): rsids 대신 쓸 수 있는 리포트 스위트 ID 하나
+            - owner_id (int, optional): 소유자 ID 필터
+            - name (str, optional): 이름 검색 필터
+            - fields (list, optional): 반환할 필드 목록
+            - sync (bool, optional): 마지막 동기화 이후 수정된 항목만 다시 조회하는 증분 동기화
+              (삭제된 항목은 COMPONENT_FULL_SYNC_INTERVAL 마다 하는 전체 동기화에서 반영)
+            - full_sync (bool, optional): 증분 동기화 스냅샷을 전체 재동기화
     """
     logger.error(f"get_segments : {params}")
     auth = AdobeAuth()
     tool = GetSegmentsTool(auth)
 
-    # 리포트 스위트 ID 설정
-    params["rsid"] = get_report_suite_id(params)
-
     return await tool.execute(params)
 
 
 @mcp.tool()
+@admission.limited("get_calculated_metrics")
+@profiler.profiled("get_calculated_metrics")
 async def get_calculated_metrics(params: dict) -> dict:
     """사용 가능한 계산된 지표 목록을 가져옵니다.
 
     Args:
         params (dict): 파라미터
-            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
-            - limit (int, optional): 결과 제한 수
+            - limit (int, optional): 결과 제한 수 (페이지 크기)
             - page (int, optional): 페이지 번호
+            - max_results (int, optional): 최대 결과 수 (limit 보다 크면 여러 페이지를 동시에 조회)
+            - rsids (list, optional): 리포트 스위트 ID 필터 (없으면 모든 리포트 스위트)
+            - rsid (str, optional): rsids 대신 쓸 수 있는 리포트 스위트 ID 하나
+            - owner_id (int, optional): 소유자 ID 필터
+            - name (str, optional): 이름 검색 필터
+            - fields (list, optional): 반환할 필드 목록
+            - sync (bool, optional): 마지막 동기화 이후 수정된 항목만 다시 조회하는 증분 동기화
+              (삭제된 항목은 COMPONENT_FULL_SYNC_INTERVAL 마다 하는 전체 동기화에서 반영)
+            - full_sync (bool, optional): 증분 동기화 스냅샷을 전체 재동기화
     """
     logger.error(f"get_calculated_metrics : {params}")
     auth = AdobeAuth()
     tool = GetCalculatedMetricsTool(auth)
 
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("evaluate_calculated_metrics")
+@profiler.profiled("evaluate_calculated_metrics")
+async def evaluate_calculated_metrics(params: dict) -> dict:
+    """계산된 지표 수식을 로컬에서 계산합니다. 여러 계산된 지표의 기본 지표를 한 번의 리포트로 조회합니다.
+
+    Args:
+        params (dict): 파라미터
+            - calculated_metric_ids (list): 계산된 지표 ID 목록
+            - date_range (str): 날짜 범위
+            - dimension (str, optional): 차원
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - limit (int, optional): 결과 제한 수
+            - page (int, optional): 페이지 번호
+            - include_base_metrics (bool, optional): 기본 지표 값도 함께 반환 (기본값: True)
+    """
+    logger.error(f"evaluate_calculated_metrics : {params}")
+    auth = AdobeAuth()
+    tool = EvaluateCalculatedMetricsTool(auth)
+
     # 리포트 스위트 ID 설정
     params["rsid"] = get_report_suite_id(params)
 
@@ -191,6 +328,8 @@ async def get_calculated_metrics(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_report_suites")
+@profiler.profiled("get_report_suites")
 async def get_report_suites(params: dict) -> dict:
     """사용 가능한 리포트 스위트 목록을 가져옵니다.
 
@@ -206,6 +345,8 @@ async def get_report_suites(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_realtime_report")
+@profiler.profiled("get_realtime_report")
 async def get_realtime_report(params: dict) -> dict:
     """실시간 리포트를 가져옵니다.
 
@@ -213,8 +354,11 @@ async def get_realtime_report(params: dict) -> dict:
         params (dict): 파라미터
             - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
             - metrics (list): 지표 목록
-            - dimension (str, optional): 차원
-            - limit (int, optional): 결과 제한 수
+            - elements (list, optional): 차원 목록
+            - mode (str, optional): fetch (기본값, Adobe 조회 후 버퍼에 기록) 또는 history (버퍼에서만 조회,
+              elements 를 주면 차원 항목별 시계열)
+            - hours (float, optional): history 모드 조회 기간 (기본값: 1)
+            - granularity (str, optional): history 모드 집계 단위 (minute, 5minute, hour)
     """
     logger.error(f"get_realtime_report : {params}")
     auth = AdobeAuth()
@@ -227,6 +371,8 @@ async def get_realtime_report(params: dict) -> dict:
 
 
 @mcp.tool()
+@admission.limited("get_data_feeds")
+@profiler.profiled("get_data_feeds")
 async def get_data_feeds(params: dict) -> dict:
     """데이터 피드 목록을 가져옵니다.
 
@@ -241,10 +387,271 @@ async def get_data_feeds(params: dict) -> dict:
     return await tool.execute(params)
 
 
+@mcp.tool()
+@admission.limited("analyze_trend")
+@profiler.profiled("analyze_trend")
+async def analyze_trend(params: dict) -> dict:
+    """일별 지표 시계열을 분석해 이상치와 추세 요약 통계만 반환합니다.
+
+    Args:
+        params (dict): 파라미터
+            - date_range (str): 날짜 범위
+            - metrics (list): 지표 목록
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - segments (list, optional): 세그먼트 ID 목록
+            - window (int, optional): 이동 기준선 기간 (기본값: 14일)
+            - threshold (float, optional): 이상치 z-score 기준 (기본값: 3.0)
+            - seasonal (bool, optional): 요일 보정 사용 (기본값: True)
+    """
+    logger.error(f"analyze_trend : {params}")
+    auth = AdobeAuth()
+    tool = AnalyzeTrendTool(auth)
+
+    # 리포트 스위트 ID 설정
+    params["rsid"] = get_report_suite_id(params)
+
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("ingest_data_feed")
+@profiler.profiled("ingest_data_feed")
+async def ingest_data_feed(params: dict) -> dict:
+    """데이터 피드 파일(hit_data.tsv)을 읽어 일별 HyperLogLog 스케치를 만듭니다.
+
+    Args:
+        params (dict): 파라미터
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - hit_data_path (str): DATA_FEED_DIR 기준 hit_data.tsv(.gz) 경로
+            - column_headers_path (str, optional): DATA_FEED_DIR 기준 column_headers.tsv 경로
+            - dimensions (list, optional): 값별 고유 방문자 스케치를 만들 컬럼 (예: post_evar1)
+    """
+    logger.error(f"ingest_data_feed : {params}")
+    auth = AdobeAuth()
+    tool = IngestDataFeedTool(auth)
+
+    # 리포트 스위트 ID 설정
+    params["rsid"] = get_report_suite_id(params)
+
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("get_distinct_counts")
+@profiler.profiled("get_distinct_counts")
+async def get_distinct_counts(params: dict) -> dict:
+    """데이터 피드 일별 스케치를 병합해 기간 고유 방문자 / 고유 페이지 수를 추정합니다.
+
+    Args:
+        params (dict): 파라미터
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - date_range (str): 날짜 범위
+            - metric (str, optional): visitors (기본값) 또는 pages
+            - dimension (str, optional): 값별로 나눌 컬럼
+            - values (list, optional): 조회할 컬럼 값 목록
+    """
+    logger.error(f"get_distinct_counts : {params}")
+    auth = AdobeAuth()
+    tool = GetDistinctCountsTool(auth)
+
+    # 리포트 스위트 ID 설정
+    params["rsid"] = get_report_suite_id(params)
+
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("export_report")
+@profiler.profiled("export_report")
+async def export_report(params: dict) -> dict:
+    """리포트 전체를 페이지 단위로 로컬 파일에 쓰고 파일 정보(경로, 행 수, 스키마, 미리보기)만 반환합니다.
+
+    Args:
+        params (dict): 파라미터
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - date_range (str): 날짜 범위
+            - metrics (list): 지표 목록
+            - dimension (str, optional): 차원
+            - segments (list, optional): 세그먼트 ID 목록
+            - search_clause (str, optional): 차원 값 검색 clause
+            - include_item_ids (list, optional): 포함할 차원 항목 itemId 목록
+            - exclude_item_ids (list, optional): 제외할 차원 항목 itemId 목록
+            - exclude_nones (bool, optional): 값이 없는 (Unspecified) 행 제외
+            - metric_filters (list, optional): 지표 임계값 필터
+            - format (str, optional): csv (기본값), ndjson, parquet
+            - file_name (str, optional): EXPORT_DIR 안의 파일 이름 (이미 있으면 오류, 덮어쓰지 않음)
+            - page_size (int, optional): 업스트림 페이지당 행 수 (기본값: 5000)
+            - max_rows (int, optional): 내보낼 최대 행 수 (기본값: 1000000)
+            - concurrency (int, optional): 동시에 가져올 페이지 수 (기본값: 4)
+    """
+    logger.error(f"export_report : {params}")
+    auth = AdobeAuth()
+    tool = ExportReportTool(auth)
+
+    # 리포트 스위트 ID 설정
+    params["rsid"] = get_report_suite_id(params)
+
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("lookup_dimension_items")
+@profiler.profiled("lookup_dimension_items")
+async def lookup_dimension_items(params: dict) -> dict:
+    """차원 값과 itemId 를 조회합니다. get_report 응답으로 채워진 인덱스를 먼저 사용합니다.
+
+    Args:
+        params (dict): 파라미터
+            - dimension (str): 차원 (예: lasttouchchannel)
+            - values (list, optional): itemId 를 찾을 값 목록
+            - search (str, optional): 값에 포함된 문자열로 검색
+            - rsid (str, optional): 리포트 스위트 ID. 없으면 환경 변수에서 가져옵니다.
+            - discover (bool, optional): 인덱스에 없으면 리포트를 조회해 인덱스를 채움 (기본값: True)
+    """
+    logger.error(f"lookup_dimension_items : {params}")
+    auth = AdobeAuth()
+    tool = LookupDimensionItemsTool(auth)
+
+    # 리포트 스위트 ID 설정
+    params["rsid"] = get_report_suite_id(params)
+
+    return await tool.execute(params)
+
+
+@mcp.tool()
+@admission.limited("get_cache_stats")
+@profiler.profiled("get_cache_stats")
+async def get_cache_stats(params: dict) -> dict:
+    """리포트 캐시, 캐시 워머, 적응형 페이지 크기, 업스트림 상태, 압축, 실시간 버퍼, 차원 항목 인덱스, 수용 제어, 요청 병합 통계를 가져옵니다.
+
+    Args:
+        params (dict): 파라미터 (사용하지 않음)
+    """
+    return {
+        "report_cache": report_cache.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "report_warmer": report_warmer.stats() if report_warmer else [],
+        "adaptive_paging": page_sizer.snapshot(),
+        "upstream": upstream_health(),
+        "compression": compression_stats(),
+        "realtime_buffer": realtime_buffer.stats(),
+        "item_index": item_index.stats(),
+        "admission": admission.stats(),
+        "report_fusion": report_fuser.stats(),
+    }
+
+
+@mcp.tool()
+@admission.limited("configure_profiling")
+async def configure_profiling(params: dict) -> dict:
+    """(관리자) 다음 N 번의 도구 호출에 단계별 CPU / 메모리 프로파일링을 설정합니다.
+
+    Args:
+        params (dict): 파라미터
+            - admin_token (str): 관리자 토큰 (PROFILING_ADMIN_TOKEN)
+            - action (str, optional): arm, disarm, status (기본값: status)
+            - count (int, optional): 프로파일링할 호출 수 (기본값: 1)
+            - tool (str, optional): 대상 도구 이름
+            - match (dict, optional): 파라미터 일치 조건
+    """
+    tool = ConfigureProfilingTool()
+    return await tool.execute(params)
+
+
+async def start_background() -> None:
+    """서버 시작 시 캐시 워머를 시작합니다."""
+    if report_warmer:
+        report_warmer.start()
+
+
+async def stop_background() -> None:
+    """서버 종료 시 캐시 워머를 멈추고 차원 항목 인덱스를 저장합니다."""
+    if report_warmer:
+        await report_warmer.stop()
+    # 멀티 프로세스 모드에서는 워커 0 만 같은 ITEM_INDEX_PATH 에 저장
+    if SERVER_WORKER_ID == 0:
+        save_item_index()
+
+
+def build_http_app(transport: str):
+    """전송 방식에 맞는 ASGI 앱을 만들고 시작 / 종료 훅을 연결합니다."""
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+
+    # streamable-http 앱은 자체 lifespan(세션 매니저)을 사용하므로 on_startup 대신 감싸서 연결
+    inner_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app):
+        await start_background()
+        try:
+            async with inner_lifespan(starlette_app):
+                yield
+        finally:
+            await stop_background()
+
+    app.router.lifespan_context = lifespan
+    if MCP_COMPRESSION:
+        app = CompressionMiddleware(
+            app, minimum_size=MCP_COMPRESSION_MIN_SIZE, level=MCP_COMPRESSION_LEVEL
+        )
+    if SERVER_WORKER_LANE is not None:
+        # 다른 워커의 SSE 세션 메시지는 해당 워커로 전달 (이미 압축된 응답을 그대로 전달)
+        app = LaneRouter(app, SERVER_WORKER_LANE, int(os.getenv("WORKER_BASE_PORT")))
+    return app
+
+
+def run_http(transport: str) -> None:
+    """SSE 또는 streamable-http 서버를 실행합니다."""
+    import uvicorn
+
+    if SERVER_SOCKET_FD:
+        from supervisor import serve_worker
+
+        asyncio.run(
+            serve_worker(
+                build_http_app(transport),
+                fd=int(SERVER_SOCKET_FD),
+                internal_port=int(os.getenv("WORKER_BASE_PORT")) + SERVER_WORKER_LANE,
+                drain_timeout=float(os.getenv("WORKER_DRAIN_TIMEOUT", 30)),
+                log_level=mcp.settings.log_level.lower(),
+            )
+        )
+        return
+
+    uvicorn.run(
+        build_http_app(transport),
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+
+
+async def run_stdio() -> None:
+    """로컬 에이전트용 stdio 서버를 실행합니다."""
+    await start_background()
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await stop_background()
+
+
 if __name__ == "__main__":
     try:
         logger.error("Initializing server...")
-        mcp.run(transport="sse")
+        if MCP_TRANSPORT == "stdio":
+            asyncio.run(run_stdio())
+        elif SERVER_WORKERS > 1:
+            from supervisor import run_supervisor
+
+            run_supervisor(
+                workers=SERVER_WORKERS,
+                port=mcp.settings.port,
+                host=mcp.settings.host,
+                transport=MCP_TRANSPORT,
+                stateless_http=mcp.settings.stateless_http,
+            )
+        else:
+            run_http(MCP_TRANSPORT)
         logger.error("Server started and connected successfully")
     except Exception as e:
         logger.error(f"Error starting server: {str(e)}", exc_info=True)
@@ -0,0 +1,328 @@
+"""
+멀티 프로세스 서버 모드 (supervisor)
+
+supervisor 는 SERVER_PORT 리스닝 소켓을 하나 만들어 워커 프로세스(src/server.py)에 물려주고,
+워커들이 같은 소켓에서 직접 연결을 받습니다. 요청은 프록시를 거치지 않으므로 워커 수만큼
+CPU 코어를 사용할 수 있습니다. supervisor 는 프로세스 관리만 합니다.
+
+- SSE: 워커마다 고유한 lane 을 메시지 경로(/messages/<lane>/)로 사용합니다. 다른 워커에 도착한
+  메시지는 세션을 가진 워커의 내부 포트(127.0.0.1:WORKER_BASE_PORT + lane)로 전달됩니다.
+- streamable-http: MCP_STATELESS_HTTP=true 일 때만 지원합니다 (요청마다 아무 워커나 처리).
+- 캐시 워머와 차원 항목 인덱스 저장은 워커 0 에서만 실행합니다.
+- SIGHUP: 워커를 하나씩 교체하는 graceful 재시작. 기존 워커는 새 연결을 받지 않고
+  열린 SSE 스트림이 끝날 때까지 (최대 WORKER_DRAIN_TIMEOUT 초) 남아 있습니다.
+- 워커가 비정상 종료되면 재시작에 성공할 때까지 간격을 늘려 가며 다시 띄웁니다.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+
+# 워커 재시작 실패 시 재시도 간격 (초)
+RESPAWN_BACKOFF_INITIAL = 1.0
+RESPAWN_BACKOFF_MAX = 30.0
+
+# 기존 워커에 보내는 drain 신호 (SIGTERM 은 SSE 스트림을 바로 닫음)
+DRAIN_SIGNAL = signal.SIGUSR1
+
+
+def worker_lane(slot: int, generation: int, workers: int) -> int:
+    """워커 lane 번호. 교체 중에는 기존 워커가 lane 을 유지하므로 세대마다 대역을 번갈아 사용"""
+    return slot + (generation % 2) * workers
+
+
+class Worker:
+    """워커 프로세스 하나의 상태"""
+
+    def __init__(self, slot: int, lane: int, generation: int = 0):
+        self.slot = slot
+        self.lane = lane
+        self.generation = generation
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.draining = False
+        self.started_at = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+
+class Supervisor:
+    """리스닝 소켓을 워커 프로세스들과 공유하고 워커를 관리합니다."""
+
+    def __init__(
+        self,
+        workers: int,
+        port: int,
+        host: str = "0.0.0.0",
+        worker_base_port: Optional[int] = None,
+        drain_timeout: float = 30.0,
+    ):
+        self.num_workers = workers
+        self.host = host
+        self.port = port
+        self.worker_base_port = worker_base_port or port + 1
+        self.drain_timeout = drain_timeout
+
+        self.workers: List[Worker] = []
+        self.draining: List[Worker] = []
+        self.stopping = False
+        self.restarting = False
+        self.sock: Optional[socket.socket] = None
+        self._tasks: set = set()
+
+    # ------------------------------------------------------------------
+    # 워커 프로세스 관리
+    # ------------------------------------------------------------------
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        # listen 은 첫 워커가 연결을 받기 시작할 때 호출됨 (그 전에는 연결 거부)
+        sock.set_inheritable(True)
+        return sock
+
+    def _internal_port(self, worker: Worker) -> int:
+        return self.worker_base_port + worker.lane
+
+    async def _spawn(self, slot: int, previous: Optional[Worker] = None) -> Worker:
+        generation = previous.generation + 1 if previous else 0
+        worker = Worker(slot, worker_lane(slot, generation, self.num_workers), generation)
+        env = dict(os.environ)
+        env.update(
+            {
+                "SERVER_WORKERS": "1",
+                "SERVER_SOCKET_FD": str(self.sock.fileno()),
+                "SERVER_WORKER_ID": str(slot),
+                "SERVER_WORKER_LANE": str(worker.lane),
+                "WORKER_BASE_PORT": str(self.worker_base_port),
+                "WORKER_DRAIN_TIMEOUT": str(self.drain_timeout),
+            }
+        )
+        worker.process = await asyncio.create_subprocess_exec(
+            sys.executable, SERVER_SCRIPT, env=env, pass_fds=(self.sock.fileno(),)
+        )
+        try:
+            await self._wait_ready(worker)
+        except RuntimeError:
+            await self._stop_worker(worker)
+            raise
+        logger.info(
+            "워커 시작 - slot: %d, lane: %d, pid: %d", slot, worker.lane, worker.process.pid
+        )
+        return worker
+
+    async def _wait_ready(self, worker: Worker, timeout: float = 30.0) -> None:
+        """워커의 내부 포트가 열리면 (앱 시작 완료 후) 준비된 것으로 봅니다."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not worker.alive:
+                raise RuntimeError(f"워커 시작 실패 (slot {worker.slot})")
+            try:
+                _, writer = await asyncio.open_connection(
+                    "127.0.0.1", self._internal_port(worker)
+                )
+                writer.close()
+                await writer.wait_closed()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError(f"워커 시작 시간 초과 (slot {worker.slot})")
+
+    def _start_task(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _monitor(self, worker: Worker) -> None:
+        """워커가 비정상 종료되면 같은 slot 에 새 워커를 띄웁니다. 실패하면 간격을 늘려 재시도합니다."""
+        await worker.process.wait()
+        if self.stopping or worker.draining:
+            return
+        logger.error(
+            "워커 비정상 종료 - slot: %d, code: %s", worker.slot, worker.process.returncode
+        )
+        backoff = RESPAWN_BACKOFF_INITIAL
+        while not self.stopping:
+            await asyncio.sleep(backoff)
+            if self.stopping:
+                return
+            try:
+                replacement = await self._spawn(worker.slot, worker)
+            except (OSError, RuntimeError) as e:
+                logger.error("워커 재시작 실패 - slot: %d, %s", worker.slot, str(e))
+                backoff = min(backoff * 2, RESPAWN_BACKOFF_MAX)
+                continue
+            self._replace(worker, replacement)
+            return
+
+    def _replace(self, old: Optional[Worker], new: Worker) -> None:
+        if old in self.workers:
+            self.workers[self.workers.index(old)] = new
+        else:
+            self.workers.append(new)
+        self._start_task(self._monitor(new))
+
+    async def _stop_worker(self, worker: Worker, timeout: float = 10.0) -> None:
+        if not worker.alive:
+            return
+        worker.process.terminate()
+        try:
+            await asyncio.wait_for(worker.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            worker.process.kill()
+            await worker.process.wait()
+
+    async def _drain_and_stop(self, worker: Worker) -> None:
+        """새 연결을 받지 않게 하고 열린 연결이 끝나면 종료되기를 기다립니다."""
+        worker.draining = True
+        self.draining.append(worker)
+        try:
+            if worker.alive:
+                worker.process.send_signal(DRAIN_SIGNAL)
+            try:
+                await asyncio.wait_for(worker.process.wait(), self.drain_timeout + 10)
+            except asyncio.TimeoutError:
+                await self._stop_worker(worker)
+        finally:
+            self.draining.remove(worker)
+
+    async def rolling_restart(self) -> None:
+        """워커를 하나씩 새 프로세스로 교체합니다. 기존 세션은 끝날 때까지 유지됩니다."""
+        if self.restarting or self.draining:
+            # 이전 세대가 아직 lane 을 쓰고 있으면 새 세대와 lane 이 겹침
+            logger.error("이전 재시작이 끝나지 않아 재시작 요청을 무시합니다.")
+            return
+        self.restarting = True
+        try:
+            logger.info("워커 순차 재시작 시작")
+            for old in list(self.workers):
+                if not old.alive:
+                    continue
+                try:
+                    new = await self._spawn(old.slot, old)
+                except (OSError, RuntimeError) as e:
+                    logger.error("워커 교체 실패 - slot: %d, %s", old.slot, str(e))
+                    continue
+                old.draining = True
+                self._replace(old, new)
+                self._start_task(self._drain_and_stop(old))
+            logger.info("워커 순차 재시작 완료")
+        finally:
+            self.restarting = False
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    async def serve(self) -> None:
+        self.sock = self._bind()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: self._start_task(self.rolling_restart()))
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+        try:
+            for worker in await asyncio.gather(
+                *(self._spawn(slot) for slot in range(self.num_workers))
+            ):
+                self._replace(None, worker)
+            await stop.wait()
+        finally:
+            self.stopping = True
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(
+                *(self._stop_worker(w) for w in self.workers + self.draining),
+                return_exceptions=True,
+            )
+            self.sock.close()
+
+    def run(self) -> None:
+        logger.info("Supervisor 시작 - port: %d, workers: %d", self.port, self.num_workers)
+        asyncio.run(self.serve())
+
+
+def run_supervisor(
+    workers: int,
+    port: int,
+    host: str = "0.0.0.0",
+    transport: str = "sse",
+    stateless_http: bool = True,
+) -> None:
+    """환경 변수 설정을 반영해 supervisor 를 실행합니다."""
+    if transport == "streamable-http" and not stateless_http:
+        # 세션이 만들어진 워커로 요청을 고정할 수 없음
+        raise ValueError("SERVER_WORKERS > 1 에서는 MCP_STATELESS_HTTP=true 가 필요합니다.")
+    Supervisor(
+        workers=workers,
+        port=port,
+        host=host,
+        worker_base_port=int(os.getenv("WORKER_BASE_PORT", port + 1)),
+        drain_timeout=float(os.getenv("WORKER_DRAIN_TIMEOUT", 30)),
+    ).run()
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스
+# ---------------------------------------------------------------------------
+
+
+async def serve_worker(
+    app, fd: int, internal_port: int, drain_timeout: float, log_level: str = "info"
+) -> None:
+    """supervisor 가 물려준 리스닝 소켓과 내부 포트에서 앱을 실행합니다.
+
+    drain 신호를 받으면 공유 소켓에서 새 연결을 받지 않고, 열린 연결이 끝나거나
+    drain_timeout 이 지나면 종료합니다. 그동안 내부 포트는 열어 두어 기존 SSE 세션의
+    메시지를 계속 받습니다.
+    """
+    import uvicorn
+
+    class InternalServer(uvicorn.Server):
+        # 종료 신호는 공개 소켓 서버가 처리
+        def install_signal_handlers(self) -> None:
+            pass
+
+    public_sock = socket.socket(fileno=fd)
+    internal_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    internal_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    internal_sock.bind(("127.0.0.1", internal_port))
+
+    public = uvicorn.Server(
+        uvicorn.Config(app, log_level=log_level, timeout_graceful_shutdown=drain_timeout)
+    )
+    internal = InternalServer(uvicorn.Config(app, log_level=log_level, lifespan="off"))
+
+    def drain() -> None:
+        logger.info("워커 drain 시작")
+        # handle_exit 를 거치지 않아야 열린 SSE 스트림이 바로 닫히지 않음
+        public.should_exit = True
+
+    async def serve_internal() -> None:
+        while not public.started:
+            await asyncio.sleep(0.05)
+        asyncio.get_running_loop().add_signal_handler(DRAIN_SIGNAL, drain)
+        internal_sock.listen(2048)
+        await internal.serve(sockets=[internal_sock])
+
+    internal_task = asyncio.create_task(serve_internal())
+    try:
+        await public.serve(sockets=[public_sock])
+    finally:
+        internal.should_exit = True
+        if not internal.started:
+            internal_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await internal_task
@@ -0,0 +1,120 @@
+import aiohttp
+import logging
+import numpy as np
+from datetime import date, datetime
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import GetReportParams, GetReportTool, parse_date_range
+from utils.calc_metric import report_columns
+from utils.trend import analyze_series, fill_missing_days, parse_day
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzeTrendParams(BaseModel):
+    """추세 / 이상치 분석 파라미터"""
+
+    date_range: str = Field(
+        ..., description="날짜 범위 (예: last_30_days, 2025-01-01/2025-03-31)"
+    )
+    metrics: List[str] = Field(..., description="지표 목록")
+    rsid: Optional[str] = Field(default=None, description="리포트 스위트 ID")
+    segments: Optional[List[str]] = Field(default=None, description="세그먼트 ID 목록")
+    window: Optional[int] = Field(default=14, description="이동 기준선 기간 (일)")
+    threshold: Optional[float] = Field(default=3.0, description="이상치 z-score 기준")
+    seasonal: Optional[bool] = Field(default=True, description="요일 보정 사용")
+    max_anomalies: Optional[int] = Field(default=20, description="반환할 최대 이상치 수")
+
+
+class AnalyzeTrendTool(Tool):
+    name: str = "analyze_trend"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "date_range": {
+                "type": "string",
+                "description": "날짜 범위 (예: last_30_days, 2025-01-01/2025-03-31)",
+            },
+            "metrics": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "지표 목록",
+            },
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "segments": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "세그먼트 ID 목록",
+            },
+            "window": {"type": "integer", "description": "이동 기준선 기간 (일)", "default": 14},
+            "threshold": {"type": "number", "description": "이상치 z-score 기준", "default": 3.0},
+            "seasonal": {"type": "boolean", "description": "요일 보정 사용", "default": True},
+            "max_anomalies": {
+                "type": "integer",
+                "description": "반환할 최대 이상치 수",
+                "default": 20,
+            },
+        },
+        "required": ["date_range", "metrics"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def execute(self, params: dict) -> dict:
+        """일별 지표 시계열을 가져와 이상치와 요약 통계만 반환합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = AnalyzeTrendParams(**params)
+            rsid = validated_params.rsid or self.auth.report_suite_id
+            if not rsid:
+                raise ValueError("리포트 스위트 ID가 설정되지 않았습니다.")
+
+            start, end = parse_date_range(validated_params.date_range).split("/")
+            days = (datetime.fromisoformat(end) - datetime.fromisoformat(start)).days + 1
+
+            report_params = GetReportParams(
+                date_range=validated_params.date_range,
+                metrics=validated_params.metrics,
+                dimension="daterangeday",
+                rsid=rsid,
+                limit=days,
+                segments=validated_params.segments,
+            )
+            report_tool = GetReportTool(self.auth)
+            request_body = report_tool.build_request_body(report_params, rsid)
+            # 기본 정렬은 첫 번째 지표 내림차순이므로 날짜 오름차순으로 요청
+            request_body["settings"]["dimensionSort"] = "asc"
+            async with aiohttp.ClientSession() as session:
+                report = await report_tool.fetch(session, request_body)
+
+            rows = report.get("rows", [])
+            parsed = [parse_day(row) for row in rows]
+            # 오늘 이후는 아직 집계 중인 부분 값이므로 제외
+            today = date.today()
+            keep = [i for i, day in enumerate(parsed) if day is not None and day < today]
+            columns = report_columns(report, validated_params.metrics)
+            values = np.column_stack([columns[m] for m in validated_params.metrics])[keep]
+            series_days, series = fill_missing_days([parsed[i] for i in keep], values)
+            if len(keep) < 4:
+                raise ValueError("분석하려면 최소 4일 이상의 데이터가 필요합니다.")
+
+            result = analyze_series(
+                series_days,
+                series,
+                validated_params.metrics,
+                window=validated_params.window,
+                threshold=validated_params.threshold,
+                seasonal=validated_params.seasonal,
+            )
+            result["anomaly_total"] = len(result["anomalies"])
+            result["anomalies"] = result["anomalies"][: validated_params.max_anomalies]
+            result["freshness"] = report.get("freshness")
+            return result
+
+        except Exception as e:
+            logger.error("추세 분석 중 오류 발생: %s", str(e))
+            raise
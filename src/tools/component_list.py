@@ -0,0 +1,89 @@
+import logging
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import ClassVar, Dict, Any, Optional, List, Type
+from mcp import Tool
+from utils.component_sync import ComponentSpec, fetch_components
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentListParams(BaseModel):
+    """세그먼트 / 계산된 지표 목록 공통 파라미터"""
+
+    limit: int = Field(default=10, ge=1, description="결과 제한 (페이지 크기)")
+    page: int = Field(default=0, ge=0, description="페이지 번호")
+    max_results: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="최대 결과 수 (limit 보다 크면 여러 페이지를 동시에 조회)",
+    )
+    rsids: Optional[List[str]] = Field(default=None, description="리포트 스위트 ID 필터")
+    rsid: Optional[str] = Field(
+        default=None, description="리포트 스위트 ID 필터 (rsids 가 없을 때 rsids=[rsid] 로 사용)"
+    )
+    owner_id: Optional[int] = Field(default=None, description="소유자 ID 필터")
+    name: Optional[str] = Field(default=None, description="이름 검색 필터")
+    fields: Optional[List[str]] = Field(default=None, description="반환할 필드 목록")
+    sync: Optional[bool] = Field(
+        default=False,
+        description="증분 동기화 (마지막 동기화 이후 수정된 항목만 다시 조회, 삭제는 전체 동기화 때 반영)",
+    )
+    full_sync: Optional[bool] = Field(default=False, description="전체 재동기화")
+
+
+COMPONENT_LIST_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "limit": {
+            "type": "integer",
+            "minimum": 1,
+            "description": "결과 제한 (페이지 크기)",
+            "default": 10,
+        },
+        "page": {"type": "integer", "minimum": 0, "description": "페이지 번호", "default": 0},
+        "max_results": {"type": "integer", "minimum": 1, "description": "최대 결과 수"},
+        "rsids": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "리포트 스위트 ID 필터",
+        },
+        "rsid": {
+            "type": "string",
+            "description": "리포트 스위트 ID 필터 (rsids 가 없을 때 rsids=[rsid] 로 사용)",
+        },
+        "owner_id": {"type": "integer", "description": "소유자 ID 필터"},
+        "name": {"type": "string", "description": "이름 검색 필터"},
+        "fields": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "반환할 필드 목록 (예: name, description, modified, definition)",
+        },
+        "sync": {"type": "boolean", "description": "증분 동기화", "default": False},
+        "full_sync": {"type": "boolean", "description": "전체 재동기화", "default": False},
+    },
+}
+
+
+class ComponentListTool(Tool):
+    """컴포넌트 목록 도구 공통 구현. 하위 클래스는 name / spec / params_model / label 만 정합니다."""
+
+    spec: ClassVar[ComponentSpec]
+    params_model: ClassVar[Type[ComponentListParams]] = ComponentListParams
+    label: ClassVar[str]
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def execute(self, params: dict) -> dict:
+        """컴포넌트 목록을 조회합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = self.params_model(**params)
+
+            return await fetch_components(self.auth, self.spec, validated_params)
+
+        except Exception as e:
+            logger.error("%s 조회 중 오류 발생: %s", self.label, str(e))
+            raise
@@ -0,0 +1,84 @@
+import hmac
+import logging
+import os
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional
+from mcp import Tool
+from utils.profiling import profiler
+
+logger = logging.getLogger(__name__)
+
+# 설정되지 않으면 configure_profiling 도구는 항상 거절합니다.
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+
+
+class ConfigureProfilingParams(BaseModel):
+    """프로파일링 설정 파라미터"""
+
+    admin_token: str = Field(..., description="관리자 토큰 (PROFILING_ADMIN_TOKEN)")
+    action: str = Field(default="status", description="arm, disarm, status 중 하나")
+    count: Optional[int] = Field(default=1, description="프로파일링할 호출 수 (arm)")
+    tool: Optional[str] = Field(default=None, description="대상 도구 이름 (없으면 모든 도구)")
+    match: Optional[Dict[str, Any]] = Field(
+        default=None, description="파라미터 일치 조건 (예: {\"dimension\": \"page\"})"
+    )
+
+
+class ConfigureProfilingTool(Tool):
+    name: str = "configure_profiling"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "admin_token": {
+                "type": "string",
+                "description": "관리자 토큰 (PROFILING_ADMIN_TOKEN)",
+            },
+            "action": {
+                "type": "string",
+                "enum": ["arm", "disarm", "status"],
+                "description": "arm, disarm, status 중 하나",
+                "default": "status",
+            },
+            "count": {
+                "type": "integer",
+                "description": "프로파일링할 호출 수 (arm)",
+                "default": 1,
+            },
+            "tool": {
+                "type": "string",
+                "description": "대상 도구 이름 (없으면 모든 도구)",
+            },
+            "match": {
+                "type": "object",
+                "description": "파라미터 일치 조건 (예: {\"dimension\": \"page\"})",
+            },
+        },
+        "required": ["admin_token"],
+    }
+
+    async def execute(self, params: dict) -> dict:
+        """다음 N 번의 (조건에 맞는) 도구 호출에 CPU / 메모리 프로파일링을 설정합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = ConfigureProfilingParams(**params)
+            if not PROFILING_ADMIN_TOKEN:
+                raise PermissionError("PROFILING_ADMIN_TOKEN 이 설정되지 않아 프로파일링을 사용할 수 없습니다.")
+            if not hmac.compare_digest(validated_params.admin_token, PROFILING_ADMIN_TOKEN):
+                raise PermissionError("관리자 토큰이 올바르지 않습니다.")
+
+            if validated_params.action == "arm":
+                if not validated_params.count or validated_params.count < 1:
+                    raise ValueError("count 는 1 이상이어야 합니다.")
+                profiler.arm(
+                    validated_params.count, validated_params.tool, validated_params.match
+                )
+            elif validated_params.action == "disarm":
+                profiler.disarm()
+            elif validated_params.action != "status":
+                raise ValueError(f"지원하지 않는 action 입니다: {validated_params.action}")
+
+            return profiler.status()
+
+        except Exception as e:
+            logger.error("프로파일링 설정 중 오류 발생: %s", str(e))
+            raise
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+from datetime import date
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import parse_date_range
+from utils.feed_sketches import feed_sketches, resolve_feed_path
+
+logger = logging.getLogger(__name__)
+
+
+class IngestDataFeedParams(BaseModel):
+    """데이터 피드 스케치 생성 파라미터"""
+
+    rsid: str = Field(..., description="리포트 스위트 ID")
+    hit_data_path: str = Field(
+        ..., description="DATA_FEED_DIR 기준 hit_data.tsv(.gz) 경로"
+    )
+    column_headers_path: Optional[str] = Field(
+        default=None,
+        description="DATA_FEED_DIR 기준 column_headers.tsv 경로 (기본값: hit_data 와 같은 디렉터리)",
+    )
+    dimensions: Optional[List[str]] = Field(
+        default=None, description="값별 고유 방문자 스케치를 만들 컬럼 (예: post_evar1)"
+    )
+
+
+class IngestDataFeedTool(Tool):
+    name: str = "ingest_data_feed"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "hit_data_path": {
+                "type": "string",
+                "description": "DATA_FEED_DIR 기준 hit_data.tsv(.gz) 경로",
+            },
+            "column_headers_path": {
+                "type": "string",
+                "description": "DATA_FEED_DIR 기준 column_headers.tsv 경로 (기본값: hit_data 와 같은 디렉터리)",
+            },
+            "dimensions": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "값별 고유 방문자 스케치를 만들 컬럼 (예: post_evar1)",
+            },
+        },
+        "required": ["rsid", "hit_data_path"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def execute(self, params: dict) -> dict:
+        """데이터 피드 파일을 읽어 일별 HyperLogLog 스케치를 만듭니다."""
+        try:
+            # 파라미터 검증
+            validated_params = IngestDataFeedParams(**params)
+            hit_data_path = resolve_feed_path(validated_params.hit_data_path)
+            column_headers_path = resolve_feed_path(
+                validated_params.column_headers_path
+                or os.path.join(
+                    os.path.dirname(validated_params.hit_data_path), "column_headers.tsv"
+                )
+            )
+
+            # 파일 읽기 / 해시 계산은 이벤트 루프를 막지 않도록 스레드에서 실행
+            return await asyncio.to_thread(
+                feed_sketches.ingest,
+                validated_params.rsid,
+                hit_data_path,
+                column_headers_path,
+                validated_params.dimensions or [],
+            )
+
+        except Exception as e:
+            logger.error("데이터 피드 스케치 생성 중 오류 발생: %s", str(e))
+            raise
+
+
+class GetDistinctCountsParams(BaseModel):
+    """고유값 개수 조회 파라미터"""
+
+    rsid: str = Field(..., description="리포트 스위트 ID")
+    date_range: str = Field(
+        ..., description="날짜 범위 (예: last_30_days, 2025-01-01/2025-03-31)"
+    )
+    metric: Optional[str] = Field(
+        default="visitors", description="visitors (고유 방문자) 또는 pages (고유 페이지)"
+    )
+    dimension: Optional[str] = Field(
+        default=None, description="값별로 나눌 컬럼 (ingest_data_feed 의 dimensions 중 하나)"
+    )
+    values: Optional[List[str]] = Field(default=None, description="조회할 컬럼 값 목록")
+
+
+class GetDistinctCountsTool(Tool):
+    name: str = "get_distinct_counts"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "date_range": {
+                "type": "string",
+                "description": "날짜 범위 (예: last_30_days, 2025-01-01/2025-03-31)",
+            },
+            "metric": {
+                "type": "string",
+                "enum": ["visitors", "pages"],
+                "description": "visitors (고유 방문자) 또는 pages (고유 페이지)",
+                "default": "visitors",
+            },
+            "dimension": {
+                "type": "string",
+                "description": "값별로 나눌 컬럼 (ingest_data_feed 의 dimensions 중 하나)",
+            },
+            "values": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "조회할 컬럼 값 목록",
+            },
+        },
+        "required": ["rsid", "date_range"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def execute(self, params: dict) -> dict:
+        """일별 스케치를 병합해 기간 고유값 개수를 추정합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = GetDistinctCountsParams(**params)
+            if validated_params.metric == "pages" and validated_params.dimension:
+                raise ValueError("pages 는 dimension 별로 나눌 수 없습니다.")
+
+            start_iso, end_iso = parse_date_range(validated_params.date_range).split("/")
+            start = date.fromisoformat(start_iso[:10])
+            end = date.fromisoformat(end_iso[:10])
+
+            return await asyncio.to_thread(
+                feed_sketches.distinct_count,
+                validated_params.rsid,
+                start,
+                end,
+                validated_params.metric,
+                validated_params.dimension,
+                validated_params.values,
+            )
+
+        except Exception as e:
+            logger.error("고유값 개수 조회 중 오류 발생: %s", str(e))
+            raise
@@ -0,0 +1,175 @@
+import aiohttp
+import logging
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import GetReportParams, GetReportTool
+from utils.adobe_client import request_json
+from utils.cache import catalog_cache, catalog_swr_policy, get_or_revalidate, make_cache_key
+from utils.calc_metric import CalculatedMetricFormula, report_columns, total_columns
+from utils.resilience import StaleFallbackError
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluateCalculatedMetricsParams(BaseModel):
+    """계산된 지표 로컬 계산 파라미터"""
+
+    calculated_metric_ids: List[str] = Field(..., description="계산된 지표 ID 목록")
+    date_range: str = Field(
+        ..., description="날짜 범위 (예: yesterday, last_3_days, this_week, last_month)"
+    )
+    dimension: Optional[str] = Field(
+        default="daterangeday", description="차원 (기본값: daterangeday)"
+    )
+    rsid: Optional[str] = Field(default=None, description="리포트 스위트 ID")
+    limit: int = Field(default=10, ge=1, description="결과 제한")
+    page: int = Field(default=0, ge=0, description="페이지 번호")
+    include_base_metrics: Optional[bool] = Field(
+        default=True, description="기본 지표 값도 함께 반환"
+    )
+
+
+class EvaluateCalculatedMetricsTool(Tool):
+    name: str = "evaluate_calculated_metrics"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "calculated_metric_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "계산된 지표 ID 목록",
+            },
+            "date_range": {
+                "type": "string",
+                "description": "날짜 범위 (예: yesterday, last_3_days, this_week, last_month)",
+            },
+            "dimension": {
+                "type": "string",
+                "description": "차원 (기본값: daterangeday)",
+            },
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "limit": {"type": "integer", "minimum": 1, "description": "결과 제한", "default": 10},
+            "page": {"type": "integer", "minimum": 0, "description": "페이지 번호", "default": 0},
+            "include_base_metrics": {
+                "type": "boolean",
+                "description": "기본 지표 값도 함께 반환",
+                "default": True,
+            },
+        },
+        "required": ["calculated_metric_ids", "date_range"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def load_definitions(self, ids: List[str]) -> dict:
+        """계산된 지표 정의를 조회합니다."""
+        async with aiohttp.ClientSession() as session:
+            try:
+                data = await request_json(
+                    session,
+                    self.auth,
+                    "GET",
+                    "calculatedmetrics",
+                    params={
+                        "filterByIds": ",".join(ids),
+                        "expansion": "definition",
+                        "limit": len(ids),
+                    },
+                )
+            except StaleFallbackError as e:
+                # 최근 성공 응답(원본 목록)도 같은 형태로 변환해 전달
+                raise StaleFallbackError(
+                    str(e), self.definitions(e.value), e.stored_at
+                ) from e
+        return self.definitions(data)
+
+    @staticmethod
+    def definitions(data: dict) -> dict:
+        """API 응답을 계산된 지표 ID 별 정의로 변환합니다."""
+        return {
+            item["id"]: {"name": item.get("name"), "definition": item["definition"]}
+            for item in data.get("content", [])
+        }
+
+    async def execute(self, params: dict) -> dict:
+        """계산된 지표의 기본 지표만 한 번에 조회한 뒤 수식을 로컬에서 계산합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = EvaluateCalculatedMetricsParams(**params)
+            ids = list(dict.fromkeys(validated_params.calculated_metric_ids))
+
+            definitions, _ = await get_or_revalidate(
+                catalog_cache,
+                make_cache_key("calculated_metric_definitions", [self.auth.company_id, ids]),
+                lambda: self.load_definitions(ids),
+                catalog_swr_policy,
+            )
+            missing = [cm_id for cm_id in ids if cm_id not in definitions]
+            if missing:
+                raise ValueError(f"계산된 지표를 찾을 수 없습니다: {missing}")
+
+            formulas = {
+                cm_id: CalculatedMetricFormula(definitions[cm_id]["definition"])
+                for cm_id in ids
+            }
+
+            # 모든 수식에 필요한 기본 지표를 하나의 리포트로 조회
+            base_metrics: List[str] = []
+            for formula in formulas.values():
+                base_metrics.extend(m for m in formula.base_metrics if m not in base_metrics)
+            if not base_metrics:
+                raise ValueError("기본 지표가 없는 수식은 리포트 행을 조회할 수 없습니다.")
+
+            report_params = GetReportParams(
+                date_range=validated_params.date_range,
+                metrics=base_metrics,
+                dimension=validated_params.dimension,
+                rsid=validated_params.rsid,
+                limit=validated_params.limit,
+                page=validated_params.page,
+            )
+            rsid = report_params.rsid or self.auth.report_suite_id
+            report_tool = GetReportTool(self.auth)
+            async with aiohttp.ClientSession() as session:
+                report = await report_tool.fetch(
+                    session, report_tool.build_request_body(report_params, rsid)
+                )
+
+            columns = report_columns(report, base_metrics)
+            totals = total_columns(report, base_metrics)
+            computed = {cm_id: formula.evaluate(columns) for cm_id, formula in formulas.items()}
+
+            output_columns = (base_metrics if validated_params.include_base_metrics else []) + ids
+            rows = []
+            for i, row in enumerate(report.get("rows", [])):
+                values = {}
+                if validated_params.include_base_metrics:
+                    values.update({m: float(columns[m][i]) for m in base_metrics})
+                values.update({cm_id: float(computed[cm_id][i]) for cm_id in ids})
+                rows.append({"itemId": row.get("itemId"), "value": row.get("value"), **values})
+
+            return {
+                "columns": ["itemId", "value"] + output_columns,
+                "rows": rows,
+                "totals": {
+                    cm_id: float(formula.evaluate(totals)[0])
+                    for cm_id, formula in formulas.items()
+                },
+                "calculated_metrics": {
+                    cm_id: {
+                        "name": definitions[cm_id]["name"],
+                        "base_metrics": formulas[cm_id].base_metrics,
+                    }
+                    for cm_id in ids
+                },
+                "base_metrics": base_metrics,
+                "freshness": report.get("freshness"),
+            }
+
+        except Exception as e:
+            logger.error("계산된 지표 계산 중 오류 발생: %s", str(e))
+            raise
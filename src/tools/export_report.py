@@ -0,0 +1,303 @@
+import asyncio
+import aiohttp
+import logging
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Deque, Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import (
+    GetReportParams,
+    GetReportTool,
+    MetricFilter,
+    metric_filter_checks,
+    past_sorted_cutoff,
+    row_matches,
+    sorted_by_first_metric_desc,
+)
+from utils.report_export import (
+    EXPORT_FORMATS,
+    ReportWriter,
+    export_path,
+    open_report_writer,
+)
+
+logger = logging.getLogger(__name__)
+
+# Adobe 리포트 API 의 페이지당 최대 행 수
+MAX_EXPORT_PAGE_SIZE = 50000
+
+
+class ExportReportParams(BaseModel):
+    """리포트 내보내기 파라미터"""
+
+    date_range: str = Field(
+        ..., description="날짜 범위 (예: yesterday, last_3_days, this_week, last_month)"
+    )
+    metrics: List[str] = Field(..., description="지표 목록")
+    dimension: Optional[str] = Field(
+        default="daterangeday", description="차원 (기본값: daterangeday)"
+    )
+    rsid: Optional[str] = Field(default=None, description="리포트 스위트 ID")
+    segments: Optional[List[str]] = Field(default=None, description="세그먼트 ID 목록")
+    search_clause: Optional[str] = Field(default=None, description="차원 값 검색 clause")
+    include_item_ids: Optional[List[str]] = Field(
+        default=None, description="포함할 차원 항목 itemId 목록"
+    )
+    exclude_item_ids: Optional[List[str]] = Field(
+        default=None, description="제외할 차원 항목 itemId 목록"
+    )
+    exclude_nones: Optional[bool] = Field(
+        default=False, description="값이 없는 (Unspecified) 행 제외"
+    )
+    metric_filters: Optional[List[MetricFilter]] = Field(
+        default=None, description="지표 임계값 필터 목록"
+    )
+    format: Optional[str] = Field(default="csv", description="csv, ndjson, parquet 중 하나")
+    file_name: Optional[str] = Field(
+        default=None, description="EXPORT_DIR 안의 파일 이름 (기본값: rsid-차원-시각, 기존 파일은 덮어쓰지 않음)"
+    )
+    page_size: Optional[int] = Field(default=5000, description="업스트림 페이지당 행 수")
+    max_rows: Optional[int] = Field(default=1000000, description="내보낼 최대 행 수")
+    concurrency: Optional[int] = Field(default=4, description="동시에 가져올 페이지 수")
+
+
+class ExportReportTool(Tool):
+    name: str = "export_report"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "date_range": {
+                "type": "string",
+                "description": "날짜 범위 (예: yesterday, last_3_days, this_week, last_month)",
+            },
+            "metrics": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "지표 목록",
+            },
+            "dimension": {
+                "type": "string",
+                "description": "차원 (기본값: daterangeday)",
+            },
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "segments": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "세그먼트 ID 목록",
+            },
+            "search_clause": {"type": "string", "description": "차원 값 검색 clause"},
+            "include_item_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "포함할 차원 항목 itemId 목록",
+            },
+            "exclude_item_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "제외할 차원 항목 itemId 목록",
+            },
+            "exclude_nones": {
+                "type": "boolean",
+                "description": "값이 없는 (Unspecified) 행 제외",
+                "default": False,
+            },
+            "metric_filters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "metric": {"type": "string"},
+                        "operator": {"type": "string"},
+                        "value": {"type": "number"},
+                    },
+                    "required": ["metric", "operator", "value"],
+                },
+                "description": "지표 임계값 필터 목록",
+            },
+            "format": {
+                "type": "string",
+                "enum": list(EXPORT_FORMATS),
+                "description": "csv, ndjson, parquet 중 하나",
+                "default": "csv",
+            },
+            "file_name": {
+                "type": "string",
+                "description": "EXPORT_DIR 안의 파일 이름 (기본값: rsid-차원-시각, 기존 파일은 덮어쓰지 않음)",
+            },
+            "page_size": {
+                "type": "integer",
+                "description": "업스트림 페이지당 행 수",
+                "default": 5000,
+            },
+            "max_rows": {
+                "type": "integer",
+                "description": "내보낼 최대 행 수",
+                "default": 1000000,
+            },
+            "concurrency": {
+                "type": "integer",
+                "description": "동시에 가져올 페이지 수",
+                "default": 4,
+            },
+        },
+        "required": ["date_range", "metrics"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def stream_pages(
+        self,
+        session: aiohttp.ClientSession,
+        report_tool: GetReportTool,
+        report_params: GetReportParams,
+        rsid: str,
+        writer: ReportWriter,
+        validated_params: ExportReportParams,
+    ) -> dict:
+        """페이지를 최대 concurrency 개까지 미리 가져오면서 순서대로 파일에 씁니다.
+
+        메모리에는 쓰는 중인 페이지와 미리 가져온 페이지만 유지합니다. 페이지는 리포트 캐시에
+        넣지 않습니다.
+        """
+        checks = (
+            metric_filter_checks(validated_params.metrics, validated_params.metric_filters)
+            if validated_params.metric_filters
+            else []
+        )
+        concurrency = max(1, validated_params.concurrency)
+        max_rows = max(1, validated_params.max_rows)
+
+        async def fetch_page(page: int) -> dict:
+            request_body = report_tool.build_request_body(report_params, rsid, page=page)
+            return await report_tool.post_report(session, request_body)
+
+        can_stop_early = sorted_by_first_metric_desc(
+            report_tool.build_request_body(report_params, rsid, page=0)
+        )
+        result = await fetch_page(0)
+        total_pages = result.get("totalPages") or 1
+        last_page = min(total_pages, math.ceil(max_rows / report_params.limit))
+        first = result
+
+        pending: Deque[asyncio.Task] = deque()
+        next_page = 1
+        pages = scanned = 0
+        early_stop = dropped = False
+        try:
+            while True:
+                while next_page < last_page and len(pending) < concurrency:
+                    pending.append(asyncio.create_task(fetch_page(next_page)))
+                    next_page += 1
+
+                rows = result.get("rows", [])
+                scanned += len(rows)
+                pages += 1
+                if checks:
+                    kept = []
+                    for row in rows:
+                        if row_matches(row, checks):
+                            kept.append(row)
+                        elif can_stop_early and past_sorted_cutoff(row, checks):
+                            early_stop = True
+                            break
+                    rows = kept
+                remaining = max_rows - writer.row_count
+                if len(rows) > remaining:
+                    rows, dropped = rows[:remaining], True
+                # 파일 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+                await asyncio.to_thread(writer.write_rows, rows)
+
+                if early_stop or dropped or not pending:
+                    break
+                result = await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return {
+            "pages": pages,
+            "scanned_rows": scanned,
+            "total_elements": first.get("totalElements"),
+            "truncated": dropped or (not early_stop and pages < total_pages),
+            "early_stop": early_stop,
+            "totals": dict(
+                zip(validated_params.metrics, first.get("summaryData", {}).get("totals", []))
+            ),
+        }
+
+    async def execute(self, params: dict) -> dict:
+        """리포트 전체를 페이지 단위로 로컬 파일에 쓰고 파일 정보만 반환합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = ExportReportParams(**params)
+            rsid = validated_params.rsid or self.auth.report_suite_id
+            if not rsid:
+                raise ValueError("리포트 스위트 ID가 설정되지 않았습니다.")
+            if validated_params.format not in EXPORT_FORMATS:
+                raise ValueError(
+                    f"지원하지 않는 형식입니다: {validated_params.format} (csv, ndjson, parquet)"
+                )
+
+            report_params = GetReportParams(
+                **validated_params.model_dump(
+                    include={
+                        "date_range",
+                        "metrics",
+                        "dimension",
+                        "segments",
+                        "search_clause",
+                        "include_item_ids",
+                        "exclude_item_ids",
+                        "exclude_nones",
+                    }
+                ),
+                rsid=rsid,
+                limit=min(max(1, validated_params.page_size), MAX_EXPORT_PAGE_SIZE),
+            )
+            file_name = validated_params.file_name or "{}-{}-{}".format(
+                rsid, validated_params.dimension, datetime.now().strftime("%Y%m%d-%H%M%S")
+            )
+            path = export_path(file_name, validated_params.format)
+            # 이름을 지정한 경우 기존 파일을 덮어쓰지 않음 (기본 이름은 겹치면 번호를 붙임)
+            if validated_params.file_name and os.path.exists(path):
+                raise ValueError(f"이미 있는 파일입니다: {os.path.basename(path)}")
+            writer = open_report_writer(
+                validated_params.format, path, validated_params.dimension, validated_params.metrics
+            )
+
+            started = time.monotonic()
+            report_tool = GetReportTool(self.auth)
+            try:
+                async with aiohttp.ClientSession() as session:
+                    summary = await self.stream_pages(
+                        session, report_tool, report_params, rsid, writer, validated_params
+                    )
+                size = await asyncio.to_thread(
+                    writer.commit, not validated_params.file_name
+                )
+            except BaseException:
+                await asyncio.to_thread(writer.abort)
+                raise
+
+            return {
+                "path": writer.path,
+                "format": validated_params.format,
+                "row_count": writer.row_count,
+                "bytes": size,
+                "schema": writer.schema(),
+                "preview": writer.preview,
+                **summary,
+                "elapsed": round(time.monotonic() - started, 3),
+            }
+
+        except Exception as e:
+            logger.error("리포트 내보내기 중 오류 발생: %s", str(e))
+            raise
@@ -4,6 +4,7 @@ from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 from mcp import Tool
+from utils.adobe_client import request_json
 
 logger = logging.getLogger(__name__)
 
@@ -37,30 +38,7 @@ class GetDataFeedsTool(Tool):
 
             # API 요청
             async with aiohttp.ClientSession() as session:
-                access_token = await self.auth.get_access_token(session)
-
-                headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "x-api-key": self.auth.client_id,
-                    "x-proxy-company-id": self.auth.company_id,
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                }
-
-                url = f"https://analytics.adobe.io/api/{self.auth.company_id}/datafeeds"
-                logger.error(f"url : { url }, headers : { headers }")
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            "API 요청 실패 - 상태: %d, 오류: %s",
-                            response.status,
-                            error_text,
-                        )
-                        raise Exception(f"API 요청 실패: {error_text}")
-
-                    result = await response.json()
-                    return result
+                return await request_json(session, self.auth, "GET", "datafeeds")
 
         except Exception as e:
             logger.error("데이터 피드 조회 중 오류 발생: %s", str(e))
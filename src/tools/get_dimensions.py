@@ -4,6 +4,9 @@ from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 from mcp import Tool
+from utils.adobe_client import request_json
+from utils.cache import catalog_cache, catalog_swr_policy, get_or_revalidate, make_cache_key
+from utils.resilience import StaleFallbackError
 import os
 
 logger = logging.getLogger(__name__)
@@ -39,65 +42,65 @@ class GetDimensionsTool(Tool):
             # 파라미터 검증
             validated_params = GetDimensionsParams(**params)
 
-            # API 요청
-            async with aiohttp.ClientSession() as session:
-                access_token = await self.auth.get_access_token(session)
+            # 캐시가 만료됐으면 만료된 값을 먼저 반환하고 백그라운드에서 갱신
+            result, freshness = await get_or_revalidate(
+                catalog_cache,
+                make_cache_key(
+                    "dimensions", [self.auth.company_id, validated_params.model_dump()]
+                ),
+                lambda: self.load(validated_params),
+                catalog_swr_policy,
+            )
+            return {**result, "freshness": freshness}
 
-                headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "x-api-key": self.auth.client_id,
-                    "x-proxy-company-id": self.auth.company_id,
-                    "Content-Type": "application/json",
-                }
+        except Exception as e:
+            logger.error("Error in get_dimensions: %s", str(e), exc_info=True)
+            raise
 
-                # URL 파라미터 구성
-                url = (
-                    f"https://analytics.adobe.io/api/{self.auth.company_id}/dimensions"
-                )
-                request_params = {"rsid": validated_params.rsid}
+    async def load(self, validated_params: GetDimensionsParams) -> dict:
+        """Adobe API 에서 차원 목록을 조회합니다."""
+        # URL 파라미터 구성
+        request_params = {"rsid": validated_params.rsid}
 
-                if validated_params.limit:
-                    request_params["limit"] = validated_params.limit
+        if validated_params.limit:
+            request_params["limit"] = validated_params.limit
 
-                if validated_params.page:
-                    request_params["page"] = validated_params.page
+        if validated_params.page:
+            request_params["page"] = validated_params.page
 
-                logger.error(
-                    f"url : { url }, headers : { headers }, params : { request_params }"
+        # API 요청
+        async with aiohttp.ClientSession() as session:
+            try:
+                data = await request_json(
+                    session, self.auth, "GET", "dimensions", params=request_params
                 )
-                async with session.get(
-                    url, headers=headers, params=request_params
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            "API request failed with status %d: %s",
-                            response.status,
-                            error_text,
-                        )
-                        raise Exception(f"API request failed: {error_text}")
-
-                    data = await response.json()
-                    result = [
-                        {
-                            "id": item["id"],
-                            "title": item["title"],
-                            "category": item.get("category", "unknown"),
-                        }
-                        for item in data
-                    ]
-
-                    # 응답 형식에 따라 적절히 처리
-                    if isinstance(result, dict):
-                        content = result.get("content", [])
-                        count = len(content)
-                    else:
-                        content = result
-                        count = len(result)
-
-                    logger.info("Successfully retrieved dimensions (count: %d)", count)
-                    return {"content": content}
-
-        except Exception as e:
-            logger.error("Error in get_dimensions: %s", str(e), exc_info=True)
-            raise
+            except StaleFallbackError as e:
+                # 최근 성공 응답(원본 목록)도 같은 형태로 변환해 전달
+                raise StaleFallbackError(
+                    str(e), self.transform(e.value), e.stored_at
+                ) from e
+
+        return self.transform(data)
+
+    @staticmethod
+    def transform(data: list) -> dict:
+        """API 응답 목록을 도구 결과 형태로 변환합니다."""
+        result = [
+            {
+                "id": item["id"],
+                "title": item["title"],
+                "category": item.get("category", "unknown"),
+            }
+            for item in data
+        ]
+
+        # 응답 형식에 따라 적절히 처리
+        if isinstance(result, dict):
+            content = result.get("content", [])
+            count = len(content)
+        else:
+            content = result
+            count = len(result)
+
+        logger.info("Successfully retrieved dimensions (count: %d)", count)
+        return {"content": content}
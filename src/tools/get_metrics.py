@@ -4,6 +4,9 @@ from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from mcp import Tool
+from utils.adobe_client import request_json
+from utils.cache import catalog_cache, catalog_swr_policy, get_or_revalidate, make_cache_key
+from utils.resilience import StaleFallbackError
 import os
 
 logger = logging.getLogger(__name__)
@@ -48,85 +51,84 @@ class GetMetricsTool(Tool):
                 validated_params.limit,
             )
 
-            all_metrics: List[Dict] = []
-            current_page = validated_params.page
-            total_count = 0
+            # 캐시가 만료됐으면 만료된 값을 먼저 반환하고 백그라운드에서 갱신
+            result, freshness = await get_or_revalidate(
+                catalog_cache,
+                make_cache_key(
+                    "metrics", [self.auth.company_id, validated_params.model_dump()]
+                ),
+                lambda: self.load(validated_params),
+                catalog_swr_policy,
+            )
+            return {**result, "freshness": freshness}
 
-            while True:
-                async with aiohttp.ClientSession() as session:
-                    access_token = await self.auth.get_access_token(session)
-
-                    headers = {
-                        "Authorization": f"Bearer {access_token}",
-                        "x-api-key": self.auth.client_id,
-                        "x-proxy-company-id": self.auth.company_id,
-                        "Content-Type": "application/json",
-                    }
+        except Exception as e:
+            logger.error("메트릭 조회 중 오류 발생: %s", str(e), exc_info=True)
+            raise
+
+    async def load(self, validated_params: GetMetricsParams) -> dict:
+        """Adobe API 에서 지표 목록을 조회합니다."""
+        all_metrics: List[Dict] = []
+        current_page = validated_params.page
+        total_count = 0
+        # 최근 성공 응답으로 대신한 페이지 중 가장 오래된 응답 시각
+        stale_at: Optional[float] = None
+        stale_error: Optional[StaleFallbackError] = None
 
-                    url = (
-                        f"https://analytics.adobe.io/api/{self.auth.company_id}/metrics"
+        async with aiohttp.ClientSession() as session:
+            while True:
+                request_params = {
+                    "rsid": validated_params.rsid,
+                    "limit": validated_params.limit,
+                    "page": current_page,
+                }
+
+                try:
+                    data = await request_json(
+                        session, self.auth, "GET", "metrics", params=request_params
                     )
-                    request_params = {
-                        "rsid": validated_params.rsid,
-                        "limit": validated_params.limit,
-                        "page": current_page,
+                except StaleFallbackError as e:
+                    # 최근 성공 응답(원본 페이지)을 다른 페이지와 같은 방식으로 변환
+                    data = e.value
+                    stale_error = e
+                    stale_at = e.stored_at if stale_at is None else min(stale_at, e.stored_at)
+                result = [
+                    {
+                        "id": item["id"],
+                        "title": item["title"],
+                        "category": item["category"],
                     }
-
-                    logger.error(
-                        f"url : { url }, headers : { headers }, params : { request_params }"
+                    for item in data
+                ]
+
+                if isinstance(result, dict):
+                    content = result.get("content", [])
+                    total_count = result.get("totalElements", len(content))
+                else:
+                    content = result
+                    total_count = len(result)
+
+                all_metrics.extend(content)
+
+                # 최대 결과 수 확인
+                if len(all_metrics) >= validated_params.max_results:
+                    logger.info(
+                        "최대 결과 수(%d) 도달", validated_params.max_results
                     )
-
-                    async with session.get(
-                        url, headers=headers, params=request_params
-                    ) as response:
-                        if response.status != 200:
-                            error_text = await response.text()
-                            logger.error(
-                                "API 요청 실패 - 상태: %d, 오류: %s",
-                                response.status,
-                                error_text,
-                            )
-                            raise Exception(f"API 요청 실패: {error_text}")
-
-                        data = await response.json()
-                        result = [
-                            {
-                                "id": item["id"],
-                                "title": item["title"],
-                                "category": item["category"],
-                            }
-                            for item in data
-                        ]
-
-                        if isinstance(result, dict):
-                            content = result.get("content", [])
-                            total_count = result.get("totalElements", len(content))
-                        else:
-                            content = result
-                            total_count = len(result)
-
-                        all_metrics.extend(content)
-
-                        # 최대 결과 수 확인
-                        if len(all_metrics) >= validated_params.max_results:
-                            logger.info(
-                                "최대 결과 수(%d) 도달", validated_params.max_results
-                            )
-                            break
-
-                        # 더 이상 결과가 없으면 종료
-                        if not content or len(content) < validated_params.limit:
-                            break
-
-                        current_page += 1
-
-            logger.info("메트릭 조회 완료 - 총 %d개 항목", len(all_metrics))
-            return {
-                "content": all_metrics[: validated_params.max_results],
-                "total_count": total_count,
-                "returned_count": len(all_metrics[: validated_params.max_results]),
-            }
-
-        except Exception as e:
-            logger.error("메트릭 조회 중 오류 발생: %s", str(e), exc_info=True)
-            raise
+                    break
+
+                # 더 이상 결과가 없으면 종료
+                if not content or len(content) < validated_params.limit:
+                    break
+
+                current_page += 1
+
+        logger.info("메트릭 조회 완료 - 총 %d개 항목", len(all_metrics))
+        result = {
+            "content": all_metrics[: validated_params.max_results],
+            "total_count": total_count,
+            "returned_count": len(all_metrics[: validated_params.max_results]),
+        }
+        if stale_error is not None:
+            raise StaleFallbackError(str(stale_error), result, stale_at) from stale_error
+        return result
@@ -4,7 +4,14 @@ from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from mcp import Tool
-import os
+from utils.adobe_client import request_json
+from utils.cache import catalog_cache, catalog_swr_policy, get_or_revalidate, make_cache_key
+from utils.realtime_buffer import (
+    GRANULARITY_MINUTES,
+    parse_minute,
+    realtime_buffer,
+    row_dimensions,
+)
 import datetime
 import pytz
 
@@ -31,6 +38,14 @@ class GetRealtimeReportParams(BaseModel):
     date_granularity: Optional[str] = Field(
         default="minute", description="날짜 단위 (minute, hour, day)"
     )
+    mode: Optional[str] = Field(
+        default="fetch",
+        description="fetch: Adobe 에서 최근 30분 조회 후 버퍼에 기록, history: 버퍼에서만 조회",
+    )
+    hours: Optional[float] = Field(default=1, description="history 모드 조회 기간 (시간)")
+    granularity: Optional[str] = Field(
+        default="minute", description="history 모드 집계 단위 (minute, 5minute, hour)"
+    )
 
 
 class GetRealtimeReportTool(Tool):
@@ -55,6 +70,23 @@ class GetRealtimeReportTool(Tool):
                 "description": "날짜 단위 (minute, hour, day)",
                 "default": "minute",
             },
+            "mode": {
+                "type": "string",
+                "enum": ["fetch", "history"],
+                "description": "fetch: Adobe 에서 최근 30분 조회 후 버퍼에 기록, history: 버퍼에서만 조회",
+                "default": "fetch",
+            },
+            "hours": {
+                "type": "number",
+                "description": "history 모드 조회 기간 (시간)",
+                "default": 1,
+            },
+            "granularity": {
+                "type": "string",
+                "enum": list(GRANULARITY_MINUTES.keys()),
+                "description": "history 모드 집계 단위 (minute, 5minute, hour)",
+                "default": "minute",
+            },
         },
         "required": ["rsid", "metrics"],
     }
@@ -63,87 +95,150 @@ class GetRealtimeReportTool(Tool):
         super().__init__()
         self.auth = auth
 
+    @staticmethod
+    def element_key(elements: Optional[List[str]]) -> str:
+        return ",".join(elements) if elements else "total"
+
+    async def suite_timezone(self, rsid: str) -> datetime.tzinfo:
+        """리포트 스위트 시간대. 실시간 리포트의 분 항목과 조회 기간은 이 시간대 기준입니다."""
+
+        async def load() -> dict:
+            async with aiohttp.ClientSession() as session:
+                return await request_json(
+                    session,
+                    self.auth,
+                    "GET",
+                    f"reportsuites/collections/suites/{rsid}",
+                    params={"expansion": "timezoneZoneinfo"},
+                )
+
+        suite, _ = await get_or_revalidate(
+            catalog_cache,
+            make_cache_key("report_suite_timezone", [self.auth.company_id, rsid]),
+            load,
+            catalog_swr_policy,
+        )
+        zone = suite.get("timezoneZoneinfo")
+        if not zone:
+            raise ValueError(f"리포트 스위트 시간대를 알 수 없습니다: {rsid}")
+        return pytz.timezone(zone)
+
+    def record(
+        self, validated_params: GetRealtimeReportParams, response: dict, tz: datetime.tzinfo
+    ) -> None:
+        """응답의 분 단위 값을 차원 항목별로 링 버퍼에 기록합니다.
+
+        항목끼리 더하지 않으므로 visitors 처럼 합산할 수 없는 지표도 항목별 값 그대로 보관합니다.
+        """
+        per_item: Dict[tuple, Dict[int, List[float]]] = {}
+        width = len(validated_params.metrics)
+        for row in response.get("rows", []):
+            item_ids, values = row_dimensions(row)
+            minute = parse_minute(item_ids[0], values[0], tz)
+            if minute is None:
+                continue
+            data = row.get("data", [])[:width]
+            per_item.setdefault(tuple(values[1:]), {})[minute] = [float(v or 0) for v in data]
+
+        element = self.element_key(validated_params.elements)
+        for item, per_minute in per_item.items():
+            for i, metric in enumerate(validated_params.metrics):
+                realtime_buffer.write(
+                    (validated_params.rsid, metric, element, item),
+                    {minute: values[i] for minute, values in per_minute.items() if i < len(values)},
+                )
+
+    def history(self, validated_params: GetRealtimeReportParams) -> dict:
+        """Adobe 를 호출하지 않고 링 버퍼에서 최근 기간을 조회합니다."""
+        if validated_params.granularity not in GRANULARITY_MINUTES:
+            raise ValueError(
+                f"지원하지 않는 granularity 입니다: {validated_params.granularity}"
+            )
+        element = self.element_key(validated_params.elements)
+
+        def query(key) -> List[dict]:
+            return realtime_buffer.query(
+                key, validated_params.hours, validated_params.granularity
+            )
+
+        if validated_params.elements:
+            # 차원 항목별 시계열: {지표: [{"values": [항목 값...], "points": [...]}]}
+            keys = realtime_buffer.keys(validated_params.rsid)
+            series = {
+                metric: [
+                    {"values": list(key[3]), "points": query(key)}
+                    for key in keys
+                    if key[1] == metric and key[2] == element
+                ]
+                for metric in validated_params.metrics
+            }
+        else:
+            series = {
+                metric: query((validated_params.rsid, metric, element, ()))
+                for metric in validated_params.metrics
+            }
+        return {
+            "rsid": validated_params.rsid,
+            "element": element,
+            "granularity": validated_params.granularity,
+            "hours": validated_params.hours,
+            "series": series,
+        }
+
     async def execute(self, params: dict) -> dict:
         """실시간 리포트 데이터를 가져옵니다."""
         try:
             # 파라미터 검증
             validated_params = GetRealtimeReportParams(**params)
 
+            if validated_params.mode == "history":
+                return self.history(validated_params)
+
             # 메트릭 ID 변환
             metrics = [REALTIME_METRICS[metric] for metric in validated_params.metrics]
 
-            # 현재 시간 기준으로 30분 범위 설정
-            now = datetime.datetime.now(pytz.UTC)
+            # 리포트 스위트 시간대의 현재 시간 기준으로 30분 범위 설정
+            tz = await self.suite_timezone(validated_params.rsid)
+            now = datetime.datetime.now(tz)
             start_time = now - datetime.timedelta(minutes=30)
             date_range = f"{start_time.strftime('%Y-%m-%dT%H:%M:%S')}/{now.strftime('%Y-%m-%dT%H:%M:%S')}"
 
+            # 요청 본문 구성
+            request_body = {
+                "rsid": validated_params.rsid,
+                "globalFilters": [{"type": "dateRange", "dateRange": date_range}],
+                "metricContainer": {
+                    "metrics": [
+                        {"columnId": str(i), "id": metric}
+                        for i, metric in enumerate(metrics)
+                    ]
+                },
+                "dimensions": [
+                    {"id": "variables/daterangeminute", "dimensionColumnId": "0"}
+                ]
+                + (
+                    [
+                        {"id": element, "dimensionColumnId": str(i + 1)}
+                        for i, element in enumerate(validated_params.elements)
+                    ]
+                    if validated_params.elements
+                    else []
+                ),
+                "settings": {
+                    "realTimeMinuteGranularity": 1,
+                    "dateGranularity": validated_params.date_granularity,
+                },
+            }
+
             # API 요청
             async with aiohttp.ClientSession() as session:
-                access_token = await self.auth.get_access_token(session)
-
-                headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "x-api-key": self.auth.client_id,
-                    "x-proxy-company-id": self.auth.company_id,
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                }
-
-                url = f"https://analytics.adobe.io/api/{self.auth.company_id}/reports/realtime"
-
-                # 요청 본문 구성
-                request_body = {
-                    "rsid": validated_params.rsid,
-                    "globalFilters": [{"type": "dateRange", "dateRange": date_range}],
-                    "metricContainer": {
-                        "metrics": [
-                            {"columnId": str(i), "id": metric}
-                            for i, metric in enumerate(metrics)
-                        ]
-                    },
-                    "dimensions": [
-                        {"id": "variables/daterangeminute", "dimensionColumnId": "0"}
-                    ]
-                    + (
-                        [
-                            {"id": element, "dimensionColumnId": str(i + 1)}
-                            for i, element in enumerate(validated_params.elements)
-                        ]
-                        if validated_params.elements
-                        else []
-                    ),
-                    "settings": {
-                        "realTimeMinuteGranularity": 10,
-                        "dateGranularity": validated_params.date_granularity,
-                    },
-                }
-
-                logger.error(
-                    f"url : { url }, headers : { headers }, params : { request_body }"
+                response = await request_json(
+                    session, self.auth, "POST", "reports/realtime", json_body=request_body
                 )
-
-                async with session.post(
-                    url, headers=headers, json=request_body
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        logger.error("API 요청 실패: %s", error_text)
-                        raise Exception(f"API request failed: {error_text}")
+            self.record(validated_params, response, tz)
+            return response
 
         except Exception as e:
             logger.error("실시간 리포트 조회 실패: %s", str(e))
             raise
 
-
-def get_realtime_report(limit: int = 20, page: int = 0) -> dict:
-    """실시간 리포트를 가져오는 함수"""
-    tool = GetRealtimeReportTool()
-    return tool.execute(GetRealtimeReportParams(limit=limit, page=page))
-
-
-if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(get_realtime_report())
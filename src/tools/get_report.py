@@ -1,14 +1,41 @@
+import asyncio
 import aiohttp
 import logging
 from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List
 from mcp import Tool
+from utils.adobe_client import request_json
+from utils.cache import (
+    describe_freshness,
+    get_or_revalidate,
+    make_cache_key,
+    report_cache,
+    report_swr_policy,
+)
+from utils.item_index import item_index
+from utils.page_sizer import page_sizer
+from utils.report_fusion import report_fuser
+import math
+import operator
 import os
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# 지표 임계값 필터를 로컬에서 적용할 때 업스트림 페이지 크기와 최대 스캔 행 수
+FILTER_SCAN_PAGE_SIZE = int(os.getenv("FILTER_SCAN_PAGE_SIZE", 5000))
+FILTER_MAX_SCAN_ROWS = int(os.getenv("FILTER_MAX_SCAN_ROWS", 200000))
+
+METRIC_FILTER_OPERATORS = {
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+    "eq": operator.eq,
+    "ne": operator.ne,
+}
+
 
 def parse_date_range(date_range: str) -> str:
     """날짜 범위를 ISO 형식으로 변환"""
@@ -29,7 +56,9 @@ def parse_date_range(date_range: str) -> str:
             end_date = start_date
         except ValueError:
             # 상대적 날짜인 경우
-            if date_range == "last_3_days":
+            if date_range == "yesterday":
+                start_date = now - timedelta(days=1)
+            elif date_range == "last_3_days":
                 start_date = now - timedelta(days=3)
             elif date_range == "last_7_days":
                 start_date = now - timedelta(days=7)
@@ -59,19 +88,190 @@ def parse_date_range(date_range: str) -> str:
     return f"{start_iso}/{end_iso}"
 
 
+def report_cache_key(request_body: dict) -> str:
+    """리포트 요청 본문의 캐시 키"""
+    return make_cache_key("report", request_body)
+
+
+def is_historical(request_body: dict) -> bool:
+    """날짜 범위가 오늘 0시 이전에 끝나는지 (더 이상 값이 바뀌지 않는 과거 기간인지) 확인합니다."""
+    for global_filter in request_body.get("globalFilters", []):
+        if global_filter.get("type") == "dateRange":
+            end = global_filter["dateRange"].split("/")[1]
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            return datetime.fromisoformat(end) <= today
+    return False
+
+
+def match_clause(values: List[str]) -> str:
+    """값 목록을 Adobe 검색 clause (정확히 일치, OR) 로 변환합니다."""
+    return " OR ".join(
+        "( MATCH '{}' )".format(value.replace("'", "\\'")) for value in values
+    )
+
+
+def item_value_search(rsid: str, dimension: str, values: List[str]) -> dict:
+    """차원 값 이름 목록을 리포트 search 로 변환합니다.
+
+    모든 값이 인덱스에 있으면 itemIds 로, 하나라도 없으면 이름 clause 로 필터합니다.
+    """
+    resolved, missing = item_index.resolve_many(rsid, dimension, values)
+    if not missing:
+        return {"itemIds": list(dict.fromkeys(resolved.values()))}
+    return {"clause": match_clause(values)}
+
+
+def build_search(rsid: str, validated_params: "GetReportParams") -> Optional[dict]:
+    """item_values / 검색 clause / itemId 포함·제외 목록을 리포트 search 하나로 합칩니다 (모두 AND)."""
+    clauses: List[str] = []
+    item_ids: Optional[List[str]] = None
+    if validated_params.item_values:
+        search = item_value_search(
+            rsid, validated_params.dimension, validated_params.item_values
+        )
+        if "itemIds" in search:
+            item_ids = search["itemIds"]
+        else:
+            clauses.append(search["clause"])
+    if validated_params.search_clause:
+        clauses.append(validated_params.search_clause)
+    if validated_params.include_item_ids:
+        include = list(dict.fromkeys(validated_params.include_item_ids))
+        item_ids = include if item_ids is None else [i for i in item_ids if i in include]
+        if not item_ids:
+            raise ValueError("item_values 와 include_item_ids 에 공통 항목이 없습니다.")
+
+    search: Dict[str, Any] = {}
+    if len(clauses) == 1:
+        search["clause"] = clauses[0]
+    elif clauses:
+        search["clause"] = " AND ".join(f"( {clause} )" for clause in clauses)
+    if item_ids is not None:
+        search["itemIds"] = item_ids
+    if validated_params.exclude_item_ids:
+        search["excludeItemIds"] = list(dict.fromkeys(validated_params.exclude_item_ids))
+    return search or None
+
+
+def metric_filter_checks(metrics: List[str], filters: List["MetricFilter"]) -> list:
+    """지표 임계값 필터를 (열 번호, 비교 함수, 기준값) 목록으로 변환합니다."""
+    checks = []
+    for metric_filter in filters:
+        if metric_filter.operator not in METRIC_FILTER_OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자입니다: {metric_filter.operator}")
+        if metric_filter.metric not in metrics:
+            raise ValueError(f"metrics 에 없는 지표로 필터할 수 없습니다: {metric_filter.metric}")
+        checks.append(
+            (
+                metrics.index(metric_filter.metric),
+                METRIC_FILTER_OPERATORS[metric_filter.operator],
+                metric_filter.value,
+            )
+        )
+    return checks
+
+
+def row_matches(row: dict, checks: list) -> bool:
+    """행이 모든 지표 임계값 필터를 만족하는지 확인합니다."""
+    data = row.get("data", [])
+    return all(
+        index < len(data) and data[index] is not None and compare(data[index], value)
+        for index, compare, value in checks
+    )
+
+
+def sorted_by_first_metric_desc(request_body: dict) -> bool:
+    """요청 행이 첫 번째 지표 내림차순(리포트 API 기본 정렬)으로 정렬되는지 확인합니다.
+
+    dimensionSort 나 지표의 sort 가 지정되어 있으면 past_sorted_cutoff 로 읽기를 멈출 수 없습니다.
+    """
+    if request_body.get("settings", {}).get("dimensionSort"):
+        return False
+    metrics = request_body.get("metricContainer", {}).get("metrics", [])
+    if not metrics or metrics[0].get("sort", "desc") != "desc":
+        return False
+    return not any(metric.get("sort") for metric in metrics[1:])
+
+
+def past_sorted_cutoff(row: dict, checks: list) -> bool:
+    """첫 번째 지표(내림차순 정렬 기준)의 gt / ge 필터를 벗어났는지. 이후 행은 모두 조건을 만족하지 않습니다."""
+    data = row.get("data", [])
+    return any(
+        index == 0
+        and compare in (operator.gt, operator.ge)
+        and data
+        and data[0] is not None
+        and not compare(data[0], value)
+        for index, compare, value in checks
+    )
+
+
+class MetricFilter(BaseModel):
+    """지표 임계값 필터 (예: visits >= 100)"""
+
+    metric: str = Field(..., description="지표 (metrics 에 포함되어야 함)")
+    operator: str = Field(..., description="gt, ge, lt, le, eq, ne 중 하나")
+    value: float = Field(..., description="기준값")
+
+
 class GetReportParams(BaseModel):
     """리포트 파라미터"""
 
     date_range: str = Field(
-        ..., description="날짜 범위 (예: last_3_days, this_week, last_month)"
+        ..., description="날짜 범위 (예: yesterday, last_3_days, this_week, last_month)"
     )
     metrics: List[str] = Field(..., description="지표 목록")
     dimension: Optional[str] = Field(
         default="daterangeday", description="차원 (기본값: daterangeday)"
     )
     rsid: Optional[str] = Field(default=None, description="리포트 스위트 ID")
-    limit: Optional[int] = Field(default=10, description="결과 제한")
-    page: Optional[int] = Field(default=0, description="페이지 번호")
+    limit: int = Field(default=10, ge=1, description="결과 제한")
+    page: int = Field(default=0, ge=0, description="페이지 번호")
+    adaptive: Optional[bool] = Field(
+        default=False,
+        description="업스트림 페이지 크기를 최근 응답 시간/크기에 맞춰 자동 조정",
+    )
+    item_values: Optional[List[str]] = Field(
+        default=None, description="차원 값 이름으로 행 필터 (예: [\"Paid Search\"])"
+    )
+    segments: Optional[List[str]] = Field(
+        default=None, description="세그먼트 ID 목록 (기본: 모두 적용)"
+    )
+    compare_segments: Optional[bool] = Field(
+        default=False,
+        description="세그먼트별로 따로 실행해 차원 항목 기준으로 나란히 비교",
+    )
+    search_clause: Optional[str] = Field(
+        default=None, description="차원 값 검색 clause (예: ( CONTAINS 'checkout' ))"
+    )
+    include_item_ids: Optional[List[str]] = Field(
+        default=None, description="포함할 차원 항목 itemId 목록"
+    )
+    exclude_item_ids: Optional[List[str]] = Field(
+        default=None, description="제외할 차원 항목 itemId 목록"
+    )
+    exclude_nones: Optional[bool] = Field(
+        default=False, description="값이 없는 (Unspecified) 행 제외"
+    )
+    metric_filters: Optional[List[MetricFilter]] = Field(
+        default=None, description="지표 임계값 필터 목록 (모두 만족하는 행만 반환)"
+    )
+
+
+def slice_report_page(result: dict, offset: int, limit: int, page: int) -> dict:
+    """큰 업스트림 페이지에서 호출자가 요청한 페이지만 잘라 페이지 정보를 다시 계산합니다."""
+    rows = result.get("rows", [])[offset : offset + limit]
+    total_elements = result.get("totalElements", len(rows))
+    total_pages = math.ceil(total_elements / limit) if limit else 0
+    return {
+        **result,
+        "rows": rows,
+        "number": page,
+        "numberOfElements": len(rows),
+        "totalPages": total_pages,
+        "firstPage": page == 0,
+        "lastPage": page >= total_pages - 1,
+    }
 
 
 class GetReportTool(Tool):
@@ -81,7 +281,7 @@ class GetReportTool(Tool):
         "properties": {
             "date_range": {
                 "type": "string",
-                "description": "날짜 범위 (예: last_3_days, this_week, last_month)",
+                "description": "날짜 범위 (예: yesterday, last_3_days, this_week, last_month)",
             },
             "metrics": {
                 "type": "array",
@@ -93,8 +293,63 @@ class GetReportTool(Tool):
                 "description": "차원 (기본값: daterangeday)",
             },
             "rsid": {"type": "string", "description": "리포트 스위트 ID"},
-            "limit": {"type": "integer", "description": "결과 제한", "default": 10},
-            "page": {"type": "integer", "description": "페이지 번호", "default": 0},
+            "limit": {"type": "integer", "minimum": 1, "description": "결과 제한", "default": 10},
+            "page": {"type": "integer", "minimum": 0, "description": "페이지 번호", "default": 0},
+            "adaptive": {
+                "type": "boolean",
+                "description": "업스트림 페이지 크기를 최근 응답 시간/크기에 맞춰 자동 조정",
+                "default": False,
+            },
+            "item_values": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "차원 값 이름으로 행 필터 (예: [\"Paid Search\"])",
+            },
+            "segments": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "세그먼트 ID 목록 (기본: 모두 적용)",
+            },
+            "compare_segments": {
+                "type": "boolean",
+                "description": "세그먼트별로 따로 실행해 차원 항목 기준으로 나란히 비교",
+                "default": False,
+            },
+            "search_clause": {
+                "type": "string",
+                "description": "차원 값 검색 clause (예: ( CONTAINS 'checkout' ))",
+            },
+            "include_item_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "포함할 차원 항목 itemId 목록",
+            },
+            "exclude_item_ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "제외할 차원 항목 itemId 목록",
+            },
+            "exclude_nones": {
+                "type": "boolean",
+                "description": "값이 없는 (Unspecified) 행 제외",
+                "default": False,
+            },
+            "metric_filters": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "metric": {"type": "string"},
+                        "operator": {
+                            "type": "string",
+                            "enum": list(METRIC_FILTER_OPERATORS),
+                        },
+                        "value": {"type": "number"},
+                    },
+                    "required": ["metric", "operator", "value"],
+                },
+                "description": "지표 임계값 필터 목록 (모두 만족하는 행만 반환)",
+            },
         },
         "required": ["date_range", "metrics"],
     }
@@ -103,6 +358,216 @@ class GetReportTool(Tool):
         super().__init__()
         self.auth = auth
 
+    def build_request_body(
+        self,
+        validated_params: GetReportParams,
+        rsid: str,
+        limit: Optional[int] = None,
+        page: Optional[int] = None,
+        segments: Optional[List[str]] = None,
+    ) -> dict:
+        """리포트 API 요청 본문을 구성합니다. limit / page / segments 를 주면 파라미터 값 대신 사용합니다."""
+        # 날짜 범위 파싱
+        iso_date_range = parse_date_range(validated_params.date_range)
+        if segments is None:
+            segments = validated_params.segments or []
+
+        request_body = {
+            "rsid": rsid,
+            "globalFilters": [{"type": "dateRange", "dateRange": iso_date_range}]
+            + [{"type": "segment", "segmentId": segment_id} for segment_id in segments],
+            "metricContainer": {
+                "metrics": [
+                    {"columnId": str(i), "id": f"metrics/{metric}"}
+                    for i, metric in enumerate(validated_params.metrics)
+                ]
+            },
+            "dimension": f"variables/{validated_params.dimension}",
+            "settings": {
+                "limit": validated_params.limit if limit is None else limit,
+                "page": validated_params.page if page is None else page,
+            },
+        }
+        search = build_search(rsid, validated_params)
+        if search:
+            request_body["search"] = search
+        if validated_params.exclude_nones:
+            request_body["settings"]["nonesBehavior"] = "exclude-nones"
+        return request_body
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        request_body: dict,
+        meta: Optional[dict] = None,
+    ) -> dict:
+        """구성된 요청 본문으로 리포트 API 를 호출합니다. 같은 요청은 캐시에서 반환합니다.
+
+        과거 기간 리포트는 stale-while-revalidate 로 제공하며, 응답의 freshness 에
+        캐시 상태(fresh / miss / stale / stale-if-error)와 경과 시간을 표시합니다.
+        """
+        key = report_cache_key(request_body)
+        if is_historical(request_body):
+            result, freshness = await get_or_revalidate(
+                report_cache,
+                key,
+                # 같은 키를 기다리는 모든 호출자가 공유하므로 특정 호출자의 세션을 쓰지 않음
+                lambda: self.load(request_body, meta),
+                report_swr_policy,
+            )
+            return {**result, "freshness": freshness}
+
+        entry = report_cache.get_entry(key)
+        if entry is not None:
+            return {**entry.value, "freshness": describe_freshness("fresh", entry)}
+
+        result = await report_fuser.submit(session, request_body, meta, self.post_report)
+        item_index.record_report(request_body, result)
+        report_cache.set(key, result)
+        return {**result, "freshness": describe_freshness("miss", None)}
+
+    async def load(self, request_body: dict, meta: Optional[dict] = None) -> dict:
+        """캐시를 거치지 않고 리포트를 조회합니다 (single-flight 로드 / 백그라운드 갱신 / 캐시 워머용).
+
+        여러 호출자가 공유하는 작업이므로 호출자 세션 대신 자체 세션을 사용합니다.
+        """
+        async with aiohttp.ClientSession() as session:
+            result = await report_fuser.submit(session, request_body, meta, self.post_report)
+        item_index.record_report(request_body, result)
+        return result
+
+    async def post_report(
+        self,
+        session: aiohttp.ClientSession,
+        request_body: dict,
+        meta: Optional[dict] = None,
+    ) -> dict:
+        """리포트 API 를 호출합니다. 동시 요청 병합(report_fuser)을 거쳐 호출됩니다."""
+        return await request_json(
+            session, self.auth, "POST", "reports", json_body=request_body, meta=meta
+        )
+
+    async def fetch_adaptive(
+        self,
+        session: aiohttp.ClientSession,
+        validated_params: GetReportParams,
+        rsid: str,
+    ) -> dict:
+        """호출자 페이지를 포함하는 더 큰 업스트림 페이지를 가져와 로컬에서 잘라 반환합니다.
+
+        업스트림 페이지는 리포트 캐시에 남으므로 이어지는 페이지 요청은 업스트림을 호출하지 않습니다.
+        """
+        limit, page = validated_params.limit, validated_params.page
+        key = (rsid, validated_params.dimension)
+        upstream_limit = page_sizer.choose(key, limit)
+
+        first_row = page * limit
+        upstream_page = first_row // upstream_limit
+        offset = first_row - upstream_page * upstream_limit
+
+        request_body = self.build_request_body(
+            validated_params, rsid, limit=upstream_limit, page=upstream_page
+        )
+        meta: Dict[str, Any] = {}
+        result = await self.fetch(session, request_body, meta=meta)
+        if meta:
+            page_sizer.observe(
+                key, len(result.get("rows", [])), meta["elapsed"], meta["bytes"]
+            )
+
+        return slice_report_page(result, offset, limit, page)
+
+    async def fetch_segment_comparison(
+        self,
+        session: aiohttp.ClientSession,
+        validated_params: GetReportParams,
+        rsid: str,
+    ) -> dict:
+        """세그먼트별 리포트를 같은 세션(토큰 / 커넥션 풀)으로 동시에 실행하고 항목 기준으로 합칩니다.
+
+        adaptive 이면 세그먼트마다 업스트림 페이지 크기를 자동 조정해 가져옵니다.
+        """
+        segment_ids = list(dict.fromkeys(validated_params.segments))
+
+        def fetch_segment(segment_id: str):
+            if validated_params.adaptive:
+                return self.fetch_adaptive(
+                    session, validated_params.model_copy(update={"segments": [segment_id]}), rsid
+                )
+            return self.fetch(
+                session, self.build_request_body(validated_params, rsid, segments=[segment_id])
+            )
+
+        results = await asyncio.gather(
+            *(fetch_segment(segment_id) for segment_id in segment_ids),
+            return_exceptions=True,
+        )
+        return merge_segment_reports(segment_ids, validated_params.metrics, results)
+
+    async def fetch_filtered(
+        self,
+        session: aiohttp.ClientSession,
+        validated_params: GetReportParams,
+        rsid: str,
+    ) -> dict:
+        """지표 임계값 필터를 업스트림 페이지를 차례로 읽으며 로컬에서 적용합니다.
+
+        Adobe 리포트 API 는 지표 값으로 행을 거를 수 없으므로, search 로 줄인 행을 스트리밍으로 검사하고
+        호출자 페이지를 채울 만큼만 보관합니다. 요청이 첫 번째 지표 내림차순으로 정렬될 때는
+        첫 번째 지표의 gt / ge 필터를 벗어나는 첫 행에서 읽기를 멈춥니다. summaryData 는 지표 필터
+        적용 전 합계입니다. 스캔 페이지는 크기 제한이 없는 리포트 캐시에 넣지 않습니다.
+        """
+        checks = metric_filter_checks(validated_params.metrics, validated_params.metric_filters)
+        limit, page = validated_params.limit, validated_params.page
+        needed = (page + 1) * limit
+
+        matched: List[dict] = []
+        scanned = upstream_pages = 0
+        complete = early_stop = False
+        result: dict = {}
+        while scanned < FILTER_MAX_SCAN_ROWS:
+            request_body = self.build_request_body(
+                validated_params, rsid, limit=FILTER_SCAN_PAGE_SIZE, page=upstream_pages
+            )
+            can_stop_early = sorted_by_first_metric_desc(request_body)
+            result = await report_fuser.submit(session, request_body, None, self.post_report)
+            upstream_pages += 1
+            rows = result.get("rows", [])
+            for row in rows:
+                scanned += 1
+                if row_matches(row, checks):
+                    matched.append(row)
+                    # 다음 페이지가 있는지 알 수 있도록 한 행 더 보관
+                    if len(matched) > needed:
+                        break
+                elif can_stop_early and past_sorted_cutoff(row, checks):
+                    early_stop = True
+                    break
+            if len(matched) > needed:
+                break
+            if early_stop or not rows or result.get("lastPage", len(rows) < FILTER_SCAN_PAGE_SIZE):
+                complete = True
+                break
+
+        page_rows = matched[page * limit : needed]
+        return {
+            **result,
+            "rows": page_rows,
+            "number": page,
+            "numberOfElements": len(page_rows),
+            "totalElements": len(matched) if complete else None,
+            "totalPages": math.ceil(len(matched) / limit) if complete and limit else None,
+            "firstPage": page == 0,
+            "lastPage": complete,
+            "filter": {
+                "scanned_rows": scanned,
+                "upstream_pages": upstream_pages,
+                "complete": complete,
+                "early_stop": early_stop,
+                "truncated": not complete and len(matched) <= needed,
+            },
+        }
+
     async def execute(self, params: dict) -> dict:
         """리포트를 실행합니다."""
         try:
@@ -114,57 +579,70 @@ class GetReportTool(Tool):
             if not rsid:
                 raise ValueError("리포트 스위트 ID가 설정되지 않았습니다.")
 
-            # 날짜 범위 파싱
-            iso_date_range = parse_date_range(validated_params.date_range)
-
-            # API 요청 파라미터 구성
-            request_body = {
-                "rsid": rsid,
-                "globalFilters": [{"type": "dateRange", "dateRange": iso_date_range}],
-                "metricContainer": {
-                    "metrics": [
-                        {"columnId": str(i), "id": f"metrics/{metric}"}
-                        for i, metric in enumerate(validated_params.metrics)
-                    ]
-                },
-                "dimension": f"variables/{validated_params.dimension}",
-                "settings": {
-                    "limit": validated_params.limit,
-                    "page": validated_params.page,
-                },
-            }
-
             # API 요청
             async with aiohttp.ClientSession() as session:
-                access_token = await self.auth.get_access_token(session)
-
-                headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "x-api-key": self.auth.client_id,
-                    "x-proxy-company-id": self.auth.company_id,
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                }
-
-                url = f"https://analytics.adobe.io/api/{self.auth.company_id}/reports"
-                logger.error(
-                    f"url : { url }, headers : { headers }, params : { request_body }"
-                )
+                if validated_params.compare_segments and validated_params.segments:
+                    if validated_params.metric_filters:
+                        raise ValueError("compare_segments 와 metric_filters 는 함께 사용할 수 없습니다.")
+                    return await self.fetch_segment_comparison(
+                        session, validated_params, rsid
+                    )
+                if validated_params.metric_filters:
+                    return await self.fetch_filtered(session, validated_params, rsid)
+                if validated_params.adaptive:
+                    return await self.fetch_adaptive(session, validated_params, rsid)
 
-                async with session.post(
-                    url, headers=headers, json=request_body
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(
-                            "API 요청 실패 - 상태: %d, 오류: %s",
-                            response.status,
-                            error_text,
-                        )
-                        raise Exception(f"API 요청 실패: {error_text}")
-
-                    return await response.json()
+                request_body = self.build_request_body(validated_params, rsid)
+                return await self.fetch(session, request_body)
 
         except Exception as e:
             logger.error("리포트 실행 중 오류 발생: %s", str(e))
             raise
+
+
+def merge_segment_reports(
+    segment_ids: List[str], metrics: List[str], results: List[Any]
+) -> dict:
+    """세그먼트별 리포트 응답을 차원 항목(itemId) 기준으로 나란히 합칩니다.
+
+    열 이름은 "<세그먼트 ID>:<지표>" 이며, 어떤 세그먼트에 없는 항목은 None 입니다.
+    실패한 세그먼트는 errors 에만 기록되고 다른 세그먼트의 결과에는 영향을 주지 않습니다.
+    """
+    rows: Dict[str, dict] = {}
+    totals: Dict[str, dict] = {}
+    freshness: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    value_columns = [f"{segment_id}:{metric}" for segment_id in segment_ids for metric in metrics]
+
+    for segment_id, result in zip(segment_ids, results):
+        if isinstance(result, BaseException):
+            logger.error("세그먼트 %s 리포트 조회 실패: %s", segment_id, str(result))
+            errors[segment_id] = str(result)
+            continue
+
+        for row in result.get("rows", []):
+            item_id = row.get("itemId")
+            merged = rows.get(item_id)
+            if merged is None:
+                # 첫 번째로 등장한 세그먼트의 순서를 따름
+                merged = rows[item_id] = {
+                    "itemId": item_id,
+                    "value": row.get("value"),
+                    **{column: None for column in value_columns},
+                }
+            for metric, value in zip(metrics, row.get("data", [])):
+                merged[f"{segment_id}:{metric}"] = value
+        totals[segment_id] = dict(
+            zip(metrics, result.get("summaryData", {}).get("totals", []))
+        )
+        freshness[segment_id] = result.get("freshness")
+
+    return {
+        "columns": ["itemId", "value"] + value_columns,
+        "rows": list(rows.values()),
+        "totals": totals,
+        "freshness": freshness,
+        "errors": errors,
+        "segment_count": len(segment_ids),
+        "failed_count": len(errors),
+    }
@@ -0,0 +1,182 @@
+import asyncio
+import aiohttp
+import logging
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import GetReportParams, GetReportTool
+from utils.adobe_client import request_json
+
+logger = logging.getLogger(__name__)
+
+# 이름 필터로 리포트 스위트를 찾을 때 한 번에 조회하는 개수
+SUITE_PAGE_SIZE = 1000
+
+
+class GetReportMultiSuiteParams(BaseModel):
+    """멀티 리포트 스위트 리포트 파라미터"""
+
+    date_range: str = Field(
+        ..., description="날짜 범위 (예: last_3_days, this_week, last_month)"
+    )
+    metrics: List[str] = Field(..., description="지표 목록")
+    dimension: Optional[str] = Field(
+        default="daterangeday", description="차원 (기본값: daterangeday)"
+    )
+    limit: int = Field(default=10, ge=1, description="결과 제한")
+    page: int = Field(default=0, ge=0, description="페이지 번호")
+    rsids: Optional[List[str]] = Field(default=None, description="리포트 스위트 ID 목록")
+    suite_name_filter: Optional[str] = Field(
+        default=None, description="리포트 스위트 이름 필터 (부분 일치, 대소문자 무시)"
+    )
+    max_suites: Optional[int] = Field(default=50, description="최대 리포트 스위트 수")
+
+
+class GetReportMultiSuiteTool(Tool):
+    name: str = "get_report_multi_suite"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "date_range": {
+                "type": "string",
+                "description": "날짜 범위 (예: last_3_days, this_week, last_month)",
+            },
+            "metrics": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "지표 목록",
+            },
+            "dimension": {
+                "type": "string",
+                "description": "차원 (기본값: daterangeday)",
+            },
+            "limit": {"type": "integer", "minimum": 1, "description": "결과 제한", "default": 10},
+            "page": {"type": "integer", "minimum": 0, "description": "페이지 번호", "default": 0},
+            "rsids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "리포트 스위트 ID 목록",
+            },
+            "suite_name_filter": {
+                "type": "string",
+                "description": "리포트 스위트 이름 필터 (부분 일치)",
+            },
+            "max_suites": {
+                "type": "integer",
+                "description": "최대 리포트 스위트 수",
+                "default": 50,
+            },
+        },
+        "required": ["date_range", "metrics"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def resolve_suites(
+        self, session: aiohttp.ClientSession, name_filter: str
+    ) -> List[str]:
+        """이름 필터와 일치하는 리포트 스위트 ID 목록을 조회합니다."""
+        keyword = name_filter.lower()
+        rsids: List[str] = []
+        page = 0
+        while True:
+            data = await request_json(
+                session,
+                self.auth,
+                "GET",
+                "reportsuites/collections/suites",
+                params={"limit": SUITE_PAGE_SIZE, "page": page, "expansion": "name"},
+            )
+            content = data.get("content", [])
+            rsids.extend(
+                suite["rsid"]
+                for suite in content
+                if keyword in (suite.get("name") or "").lower()
+                or keyword in suite["rsid"].lower()
+            )
+            if data.get("lastPage", True) or not content:
+                return rsids
+            page += 1
+
+    async def execute(self, params: dict) -> dict:
+        """여러 리포트 스위트에 같은 리포트를 동시에 실행하고 rsid 기준으로 합칩니다."""
+        try:
+            # 파라미터 검증
+            validated_params = GetReportMultiSuiteParams(**params)
+            if not validated_params.rsids and not validated_params.suite_name_filter:
+                raise ValueError("rsids 또는 suite_name_filter 중 하나는 필요합니다.")
+
+            report_params = GetReportParams(
+                **validated_params.model_dump(
+                    include={"date_range", "metrics", "dimension", "limit", "page"}
+                )
+            )
+            report_tool = GetReportTool(self.auth)
+
+            async with aiohttp.ClientSession() as session:
+                rsids = validated_params.rsids or await self.resolve_suites(
+                    session, validated_params.suite_name_filter
+                )
+                # 중복 제거 (순서 유지)
+                rsids = list(dict.fromkeys(rsids))[: validated_params.max_suites]
+                if not rsids:
+                    raise ValueError("조건에 맞는 리포트 스위트가 없습니다.")
+
+                # 업스트림 동시성 제한 안에서 스위트별 리포트를 동시에 실행
+                results = await asyncio.gather(
+                    *(
+                        report_tool.fetch(
+                            session, report_tool.build_request_body(report_params, rsid)
+                        )
+                        for rsid in rsids
+                    ),
+                    return_exceptions=True,
+                )
+
+            return merge_suite_reports(rsids, validated_params.metrics, results)
+
+        except Exception as e:
+            logger.error("멀티 스위트 리포트 실행 중 오류 발생: %s", str(e))
+            raise
+
+
+def merge_suite_reports(
+    rsids: List[str], metrics: List[str], results: List[Any]
+) -> dict:
+    """스위트별 리포트 응답을 rsid 를 키로 하는 하나의 테이블로 합칩니다.
+
+    실패한 스위트는 errors 에만 기록되고 다른 스위트의 결과에는 영향을 주지 않습니다.
+    """
+    table: List[dict] = []
+    totals: Dict[str, dict] = {}
+    errors: Dict[str, str] = {}
+
+    for rsid, result in zip(rsids, results):
+        if isinstance(result, BaseException):
+            logger.error("리포트 스위트 %s 조회 실패: %s", rsid, str(result))
+            errors[rsid] = str(result)
+            continue
+
+        for row in result.get("rows", []):
+            table.append(
+                {
+                    "rsid": rsid,
+                    "itemId": row.get("itemId"),
+                    "value": row.get("value"),
+                    **dict(zip(metrics, row.get("data", []))),
+                }
+            )
+        suite_totals = result.get("summaryData", {}).get("totals", [])
+        totals[rsid] = dict(zip(metrics, suite_totals))
+
+    return {
+        "columns": ["rsid", "itemId", "value"] + metrics,
+        "rows": table,
+        "totals": totals,
+        "errors": errors,
+        "suite_count": len(rsids),
+        "failed_count": len(errors),
+    }
@@ -4,6 +4,8 @@ from auth.adobe_auth import AdobeAuth
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 from mcp import Tool
+from utils.adobe_client import request_json
+from utils.cache import catalog_cache, catalog_swr_policy, get_or_revalidate, make_cache_key
 import os
 
 logger = logging.getLogger(__name__)
@@ -42,41 +44,36 @@ class GetReportSuitesTool(Tool):
             # 파라미터 검증
             validated_params = GetReportSuitesParams(**params)
 
-            # API 요청
-            async with aiohttp.ClientSession() as session:
-                access_token = await self.auth.get_access_token(session)
-
-                headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "x-api-key": self.auth.client_id,
-                    "x-proxy-company-id": self.auth.company_id,
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                }
-
-                url = f"https://analytics.adobe.io/api/{self.auth.company_id}/reportsuites/collections/suites"
-                logger.info(f"Request URL: {url}")
-                params = {
-                    "limit": validated_params.limit,
-                    "page": validated_params.page,
-                }
-                if validated_params.expansion:
-                    params["expansion"] = validated_params.expansion
-
-                logger.error(
-                    f"url : { url }, headers : { headers }, params : { params }"
-                )
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result
-                    else:
-                        error_text = await response.text()
-                        logger.error(
-                            f"API request failed with status {response.status}: {error_text}"
-                        )
-                        raise Exception(f"API request failed: {error_text}")
+            # 캐시가 만료됐으면 만료된 값을 먼저 반환하고 백그라운드에서 갱신
+            result, freshness = await get_or_revalidate(
+                catalog_cache,
+                make_cache_key(
+                    "report_suites", [self.auth.company_id, validated_params.model_dump()]
+                ),
+                lambda: self.load(validated_params),
+                catalog_swr_policy,
+            )
+            return {**result, "freshness": freshness}
 
         except Exception as e:
             logger.error(f"Error in get_report_suites: {str(e)}")
             raise
+
+    async def load(self, validated_params: GetReportSuitesParams) -> dict:
+        """Adobe API 에서 리포트 스위트 목록을 조회합니다."""
+        params = {
+            "limit": validated_params.limit,
+            "page": validated_params.page,
+        }
+        if validated_params.expansion:
+            params["expansion"] = validated_params.expansion
+
+        # API 요청
+        async with aiohttp.ClientSession() as session:
+            return await request_json(
+                session,
+                self.auth,
+                "GET",
+                "reportsuites/collections/suites",
+                params=params,
+            )
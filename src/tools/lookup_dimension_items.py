@@ -0,0 +1,123 @@
+import aiohttp
+import logging
+from auth.adobe_auth import AdobeAuth
+from pydantic import BaseModel, Field
+from typing import Dict, Any, Optional, List
+from mcp import Tool
+from tools.get_report import GetReportParams, GetReportTool, match_clause
+from utils.item_index import item_index
+
+logger = logging.getLogger(__name__)
+
+
+class LookupDimensionItemsParams(BaseModel):
+    """차원 항목 조회 파라미터"""
+
+    dimension: str = Field(..., description="차원 (예: lasttouchchannel)")
+    values: Optional[List[str]] = Field(default=None, description="itemId 를 찾을 값 목록")
+    search: Optional[str] = Field(default=None, description="값에 포함된 문자열로 검색")
+    rsid: Optional[str] = Field(default=None, description="리포트 스위트 ID")
+    discover: Optional[bool] = Field(
+        default=True, description="인덱스에 없으면 리포트를 조회해 인덱스를 채움"
+    )
+    date_range: Optional[str] = Field(
+        default="last_30_days", description="탐색 리포트 날짜 범위 (기본값: last_30_days)"
+    )
+    limit: Optional[int] = Field(default=20, description="search 결과 제한")
+
+
+class LookupDimensionItemsTool(Tool):
+    name: str = "lookup_dimension_items"
+    inputSchema: Dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "dimension": {"type": "string", "description": "차원 (예: lasttouchchannel)"},
+            "values": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "itemId 를 찾을 값 목록",
+            },
+            "search": {"type": "string", "description": "값에 포함된 문자열로 검색"},
+            "rsid": {"type": "string", "description": "리포트 스위트 ID"},
+            "discover": {
+                "type": "boolean",
+                "description": "인덱스에 없으면 리포트를 조회해 인덱스를 채움",
+                "default": True,
+            },
+            "date_range": {
+                "type": "string",
+                "description": "탐색 리포트 날짜 범위 (기본값: last_30_days)",
+                "default": "last_30_days",
+            },
+            "limit": {"type": "integer", "description": "search 결과 제한", "default": 20},
+        },
+        "required": ["dimension"],
+    }
+
+    def __init__(self, auth: AdobeAuth):
+        super().__init__()
+        self.auth = auth
+
+    async def discover(
+        self, validated_params: LookupDimensionItemsParams, rsid: str, clause: str, limit: int
+    ) -> None:
+        """검색 clause 로 차원 리포트를 한 번 조회합니다. 응답 행은 인덱스에 기록됩니다."""
+        report_params = GetReportParams(
+            date_range=validated_params.date_range,
+            metrics=["occurrences"],
+            dimension=validated_params.dimension,
+            rsid=rsid,
+            limit=limit,
+            search_clause=clause,
+        )
+        report_tool = GetReportTool(self.auth)
+        request_body = report_tool.build_request_body(report_params, rsid)
+        async with aiohttp.ClientSession() as session:
+            await report_tool.fetch(session, request_body)
+
+    async def execute(self, params: dict) -> dict:
+        """차원 값과 itemId 를 인덱스에서 조회합니다."""
+        try:
+            # 파라미터 검증
+            validated_params = LookupDimensionItemsParams(**params)
+            rsid = validated_params.rsid or self.auth.report_suite_id
+            if not rsid:
+                raise ValueError("리포트 스위트 ID가 설정되지 않았습니다.")
+            dimension = validated_params.dimension
+            result: Dict[str, Any] = {"rsid": rsid, "dimension": dimension}
+            discovered = False
+
+            if validated_params.values:
+                values = validated_params.values
+                resolved, missing = item_index.resolve_many(rsid, dimension, values)
+                if missing and validated_params.discover:
+                    await self.discover(
+                        validated_params, rsid, match_clause(missing), len(missing)
+                    )
+                    discovered = True
+                    found, missing = item_index.resolve_many(rsid, dimension, missing)
+                    resolved.update(found)
+                result["items"] = resolved
+                result["missing"] = missing
+
+            if validated_params.search:
+                matches = item_index.search(
+                    rsid, dimension, validated_params.search, validated_params.limit
+                )
+                if not matches and validated_params.discover:
+                    text = validated_params.search.replace("'", "\\'")
+                    await self.discover(
+                        validated_params, rsid, f"( CONTAINS '{text}' )", validated_params.limit
+                    )
+                    discovered = True
+                    matches = item_index.search(
+                        rsid, dimension, validated_params.search, validated_params.limit
+                    )
+                result["matches"] = matches
+
+            result["discovered"] = discovered
+            return result
+
+        except Exception as e:
+            logger.error("차원 항목 조회 실패: %s", str(e))
+            raise
@@ -0,0 +1,190 @@
+"""
+MCP 도구 호출 수용 제어 (admission control)
+
+무거운 도구(리포트 계열)는 도구별 동시 실행 수와 대기열 길이를 제한합니다.
+
+- 동시 실행 수가 가득 차면 대기열에서 ADMISSION_QUEUE_TIMEOUT 초까지 기다립니다.
+- 대기열도 가득 찼거나 대기 시간이 지나면 즉시 OverloadedError 를 발생시키며,
+  최근 처리 시간으로 계산한 retry_after(초) 를 함께 알려줍니다.
+- 카탈로그 조회처럼 가벼운 도구는 제한 대상에서 제외되어 리포트 대기열에 막히지 않습니다.
+  업스트림 호출도 리포트(UPSTREAM_CONCURRENCY)와 그 밖의 API(METADATA_CONCURRENCY)가
+  서로 다른 세마포어를 사용하므로 리포트 호출이 밀려도 카탈로그 호출은 기다리지 않습니다.
+
+도구별 설정은 ADMISSION_LIMITS 에 JSON 으로 덮어쓸 수 있습니다.
+예: {"get_report": {"concurrency": 16, "queue": 32}}
+"""
+
+import asyncio
+import functools
+import json
+import math
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", 8))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", 16))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 5))
+
+# 업스트림 리포트를 실행하는 무거운 도구
+HEAVY_TOOLS = (
+    "get_report",
+    "get_report_multi_suite",
+    "get_realtime_report",
+    "evaluate_calculated_metrics",
+    "lookup_dimension_items",
+    "ingest_data_feed",
+    "analyze_trend",
+    "export_report",
+)
+
+EWMA_ALPHA = 0.2
+
+
+class OverloadedError(Exception):
+    """동시 실행 수와 대기열이 가득 차 도구 호출을 거절한 경우"""
+
+    def __init__(self, tool: str, retry_after: float, reason: str):
+        super().__init__(
+            f"서버가 혼잡하여 {tool} 호출을 거절했습니다 ({reason}). "
+            f"retry_after={retry_after}초 후 다시 시도하세요."
+        )
+        self.tool = tool
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """동시 실행 수 + 제한된 FIFO 대기열"""
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time: Optional[float] = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+
+    def retry_after(self) -> float:
+        """대기열을 모두 처리하는 데 걸릴 예상 시간 (초)"""
+        service_time = self._service_time or 1.0
+        rounds = (len(self._waiters) + 1) / self.concurrency
+        return round(max(1.0, math.ceil(rounds) * service_time), 1)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected_full += 1
+            raise OverloadedError(self.name, self.retry_after(), "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            # release() 가 슬롯을 넘겨주면 완료됨 (in_flight 는 넘겨주는 쪽에서 유지)
+            # wait_for 는 (3.11) 슬롯을 받은 직후의 취소를 무시하므로 timeout 사용
+            async with asyncio.timeout(self.queue_timeout):
+                await asyncio.shield(waiter)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # 타임아웃과 동시에 슬롯을 받은 경우 그대로 실행
+                self.admitted += 1
+                return
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            self.rejected_timeout += 1
+            raise OverloadedError(self.name, self.retry_after(), "queue_timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+        self.admitted += 1
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        if elapsed is not None:
+            if self._service_time is None:
+                self._service_time = elapsed
+            else:
+                self._service_time += EWMA_ALPHA * (elapsed - self._service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # 슬롯을 다음 대기자에게 그대로 넘김
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "service_time": round(self._service_time, 3) if self._service_time else None,
+        }
+
+
+class AdmissionController:
+    """도구 이름별 AdmissionLimiter 모음"""
+
+    def __init__(self, overrides: Dict[str, dict]):
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+        for tool in set(HEAVY_TOOLS) | set(overrides):
+            config = overrides.get(tool, {})
+            self._limiters[tool] = AdmissionLimiter(
+                tool,
+                config.get("concurrency", ADMISSION_CONCURRENCY),
+                config.get("queue", ADMISSION_QUEUE_SIZE),
+                config.get("queue_timeout", ADMISSION_QUEUE_TIMEOUT),
+            )
+        self.exempt_calls: Dict[str, int] = {}
+
+    def limited(self, tool: str) -> Callable:
+        """도구 핸들러에 수용 제어를 적용하는 데코레이터. 제한 대상이 아니면 그대로 실행합니다."""
+
+        def decorator(fn: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                limiter = self._limiters.get(tool) if ADMISSION_ENABLED else None
+                if limiter is None:
+                    self.exempt_calls[tool] = self.exempt_calls.get(tool, 0) + 1
+                    return await fn(*args, **kwargs)
+
+                await limiter.acquire()
+                started = time.monotonic()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    limiter.release(time.monotonic() - started)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        return {
+            "enabled": ADMISSION_ENABLED,
+            "limited": {name: limiter.stats() for name, limiter in self._limiters.items()},
+            "exempt_calls": dict(self.exempt_calls),
+        }
+
+
+admission = AdmissionController(json.loads(os.getenv("ADMISSION_LIMITS", "{}")))
@@ -0,0 +1,313 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+from auth.adobe_auth import AdobeAuth
+from utils.compression import UPSTREAM_ACCEPT_ENCODING, upstream_transfer
+from utils.profiling import profile_phase
+from utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    StaleFallbackError,
+    UpstreamError,
+)
+
+logger = logging.getLogger(__name__)
+
+# 테스트용 mock 서버를 사용할 때 변경
+ANALYTICS_API_URL = os.getenv("ANALYTICS_API_URL", "https://analytics.adobe.io/api")
+
+# Adobe 리포트 API 로 동시에 보낼 수 있는 최대 요청 수 (프로세스 단위)
+UPSTREAM_CONCURRENCY = int(os.getenv("UPSTREAM_CONCURRENCY", 8))
+# 카탈로그 / 컴포넌트 등 리포트 이외 API 의 동시 요청 수. 리포트와 세마포어를 나눠
+# 느린 리포트가 쌓여도 카탈로그 조회가 그 뒤에서 기다리지 않도록 함
+METADATA_CONCURRENCY = int(os.getenv("METADATA_CONCURRENCY", 4))
+
+# 요청 제한 시간 (초). 메타데이터 엔드포인트는 더 짧게 설정
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", 60))
+METADATA_TIMEOUT = float(os.getenv("METADATA_TIMEOUT", 10))
+# 헤지 요청: 응답이 p95 를 넘으면 같은 GET 요청을 한 번 더 보내고 먼저 온 응답을 사용
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", 0.2))
+# 서킷 브레이커: 연속 실패 횟수 / 차단 유지 시간 (초)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+# 서킷이 열렸거나 요청이 실패했을 때 StaleFallbackError 로 함께 전달할 최근 성공 응답 수
+LAST_GOOD_MAX_ENTRIES = 256
+
+# 멱등 GET 으로 조회하는 메타데이터 엔드포인트 (헤지 요청 / 캐시 대체 대상)
+METADATA_ENDPOINTS = {
+    "metrics",
+    "dimensions",
+    "reportsuites/collections/suites",
+}
+
+_upstream_limiter: Optional[asyncio.Semaphore] = None
+_metadata_limiter: Optional[asyncio.Semaphore] = None
+# 현재 진행 중인 업스트림 요청 수 (캐시 워머 등 저우선순위 작업이 참고)
+_in_flight = 0
+
+_latencies: Dict[str, LatencyTracker] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+# (응답, 받은 시각)
+_last_good: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+
+
+def is_report_endpoint(path: str) -> bool:
+    """리포트 실행 엔드포인트 (reports, reports/realtime) 인지 확인합니다."""
+    return path == "reports" or path.startswith("reports/")
+
+
+def get_upstream_limiter(path: str = "reports") -> asyncio.Semaphore:
+    """경로에 맞는 Adobe API 동시 요청 수 세마포어를 반환합니다.
+
+    리포트 엔드포인트는 UPSTREAM_CONCURRENCY, 그 밖의 엔드포인트는 METADATA_CONCURRENCY 를 사용합니다.
+    """
+    global _upstream_limiter, _metadata_limiter
+    if is_report_endpoint(path):
+        if _upstream_limiter is None:
+            _upstream_limiter = asyncio.Semaphore(UPSTREAM_CONCURRENCY)
+        return _upstream_limiter
+    if _metadata_limiter is None:
+        _metadata_limiter = asyncio.Semaphore(METADATA_CONCURRENCY)
+    return _metadata_limiter
+
+
+def upstream_in_flight() -> int:
+    """현재 진행 중이거나 대기 중인 Adobe API 요청 수를 반환합니다."""
+    return _in_flight
+
+
+def endpoint_timeout(path: str) -> float:
+    """엔드포인트별 요청 제한 시간을 반환합니다."""
+    return METADATA_TIMEOUT if path in METADATA_ENDPOINTS else UPSTREAM_TIMEOUT
+
+
+def _breaker(path: str) -> CircuitBreaker:
+    if path not in _breakers:
+        _breakers[path] = CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+        )
+    return _breakers[path]
+
+
+def _latency(path: str) -> LatencyTracker:
+    return _latencies.setdefault(path, LatencyTracker())
+
+
+def upstream_health() -> Dict[str, dict]:
+    """엔드포인트별 응답 시간 분포와 서킷 브레이커 상태를 반환합니다."""
+    return {
+        path: {
+            "samples": len(tracker),
+            "p50": tracker.percentile(0.5),
+            "p95": tracker.percentile(0.95),
+            "circuit": _breakers[path].state if path in _breakers else "closed",
+        }
+        for path, tracker in _latencies.items()
+    }
+
+
+def build_headers(auth: AdobeAuth, access_token: str) -> Dict[str, str]:
+    """Adobe Analytics API 공통 요청 헤더를 구성합니다."""
+    return {
+        "Authorization": f"Bearer {access_token}",
+        "x-api-key": auth.client_id,
+        "x-proxy-company-id": auth.company_id,
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "Accept-Encoding": UPSTREAM_ACCEPT_ENCODING,
+    }
+
+
+def _clean_params(params: Optional[dict]) -> Optional[dict]:
+    """None 값을 제거하고 aiohttp 가 허용하지 않는 bool 값을 문자열로 바꿉니다."""
+    if params is None:
+        return None
+    return {
+        key: (str(value).lower() if isinstance(value, bool) else value)
+        for key, value in params.items()
+        if value is not None
+    }
+
+
+async def request_json(
+    session: aiohttp.ClientSession,
+    auth: AdobeAuth,
+    method: str,
+    path: str,
+    params: Optional[dict] = None,
+    json_body: Optional[dict] = None,
+    meta: Optional[dict] = None,
+) -> Any:
+    """업스트림 동시성 제한 안에서 Adobe Analytics API 를 호출하고 JSON 응답을 반환합니다.
+
+    메타데이터 GET 요청은 p95 를 넘으면 헤지 요청을 보냅니다. 엔드포인트 서킷이 열려 있거나
+    요청이 서버 측 오류(5xx, 429, 연결 오류)로 실패했을 때 최근 성공 응답이 있으면
+    그 응답과 받은 시각을 담은 StaleFallbackError 를 발생시킵니다. 4xx 요청 오류는 그대로 발생합니다.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP 세션
+        auth (AdobeAuth): 인증 정보
+        method (str): HTTP 메서드 (GET, POST)
+        path (str): company_id 이후의 API 경로 (예: "segments", "reports")
+        params (dict, optional): 쿼리 파라미터
+        json_body (dict, optional): 요청 본문
+        meta (dict, optional): 전달하면 응답 크기(bytes)와 소요 시간(elapsed, 초)을 기록
+    """
+    global _in_flight
+    request_params = _clean_params(params)
+    idempotent = method == "GET" and path in METADATA_ENDPOINTS
+    fallback_key = (
+        (auth.company_id, path, tuple(sorted((request_params or {}).items())))
+        if idempotent
+        else None
+    )
+
+    breaker = _breaker(path)
+    if not breaker.allow():
+        error = CircuitOpenError(f"API 요청 차단 (서킷 열림): {path}")
+        if fallback_key in _last_good:
+            value, stored_at = _last_good[fallback_key]
+            raise StaleFallbackError(str(error), value, stored_at) from error
+        raise error
+
+    _in_flight += 1
+    recorded = False
+    try:
+        attempt = functools.partial(
+            _request_json, session, auth, method, path, request_params, json_body, meta
+        )
+        result = await (_hedged(path, attempt) if idempotent else attempt())
+        breaker.record_success()
+        recorded = True
+    except Exception as e:
+        if isinstance(e, UpstreamError) and not e.retryable:
+            breaker.record_success()
+            recorded = True
+            raise
+        breaker.record_failure()
+        recorded = True
+        if fallback_key in _last_good:
+            value, stored_at = _last_good[fallback_key]
+            raise StaleFallbackError(str(e), value, stored_at) from e
+        raise
+    finally:
+        _in_flight -= 1
+        if not recorded:
+            breaker.release()
+
+    if fallback_key is not None:
+        _last_good[fallback_key] = (result, time.time())
+        _last_good.move_to_end(fallback_key)
+        while len(_last_good) > LAST_GOOD_MAX_ENTRIES:
+            _last_good.popitem(last=False)
+    return result
+
+
+async def _hedged(path: str, attempt) -> Any:
+    """응답이 최근 p95 보다 늦으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 사용합니다.
+
+    대기 시간은 첫 요청이 업스트림 세마포어를 얻은 뒤부터 잽니다 (큐 대기는 느린 응답이 아님).
+    세마포어가 가득 차 있으면 헤지 요청도 큐에서 기다리기만 하므로 보내지 않습니다.
+    """
+    tracker = _latency(path)
+    acquired = asyncio.Event()
+    primary = asyncio.create_task(attempt(acquired))
+    if len(tracker) < HEDGE_MIN_SAMPLES:
+        return await primary
+
+    delay = max(tracker.percentile(0.95), HEDGE_MIN_DELAY)
+    pending = {primary}
+    waiter = asyncio.create_task(acquired.wait())
+    try:
+        await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        if not primary.done():
+            await asyncio.wait(pending, timeout=delay)
+        if primary.done():
+            return primary.result()
+        if get_upstream_limiter(path).locked():
+            return await primary
+
+        logger.error("헤지 요청 전송 - %s (p95 %.2fs 초과)", path, delay)
+        pending.add(asyncio.create_task(attempt()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        waiter.cancel()
+        # 늦은 쪽 요청은 취소
+        for task in pending:
+            task.cancel()
+
+
+async def _request_json(
+    session: aiohttp.ClientSession,
+    auth: AdobeAuth,
+    method: str,
+    path: str,
+    request_params: Optional[dict],
+    json_body: Optional[dict],
+    meta: Optional[dict],
+    acquired: Optional[asyncio.Event] = None,
+) -> Any:
+    with profile_phase("upstream"):
+        async with get_upstream_limiter(path):
+            if acquired is not None:
+                acquired.set()
+            access_token = await auth.get_access_token(session)
+            url = f"{ANALYTICS_API_URL}/{auth.company_id}/{path}"
+            logger.error(f"url : { url }, params : { request_params }")
+
+            started = time.monotonic()
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    headers=build_headers(auth, access_token),
+                    params=request_params,
+                    json=json_body,
+                    timeout=aiohttp.ClientTimeout(total=endpoint_timeout(path)),
+                ) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error(
+                            "API 요청 실패 - 상태: %d, 오류: %s",
+                            response.status,
+                            error_text,
+                        )
+                        raise UpstreamError(response.status, f"API 요청 실패: {error_text}")
+
+                    body = await response.read()
+                    elapsed = time.monotonic() - started
+                    # content_length 는 압축된 전송 크기 (chunked 응답이면 None)
+                    upstream_transfer.record(
+                        len(body),
+                        response.content_length,
+                        response.headers.get("Content-Encoding"),
+                    )
+            except asyncio.TimeoutError:
+                # 시간 초과도 응답 시간 분포에 넣어야 p95 가 느려진 엔드포인트를 반영
+                _latency(path).record(time.monotonic() - started)
+                raise
+            _latency(path).record(elapsed)
+            if meta is not None:
+                meta["bytes"] = len(body)
+                meta["wire_bytes"] = response.content_length
+                meta["elapsed"] = elapsed
+            with profile_phase("decode"):
+                return json.loads(body)
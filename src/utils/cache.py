@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from utils.resilience import StaleFallbackError
+
+logger = logging.getLogger(__name__)
+
+# 리포트 캐시 설정 (.env 에서 변경 가능)
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", 300))
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", 1000))
+# 과거 기간 리포트 (오늘 이전에 끝나는 기간) 는 값이 거의 바뀌지 않으므로 더 오래 유지
+REPORT_HISTORICAL_TTL = float(os.getenv("REPORT_HISTORICAL_TTL", 6 * 60 * 60))
+REPORT_STALE_WHILE_REVALIDATE = float(os.getenv("REPORT_STALE_WHILE_REVALIDATE", 24 * 60 * 60))
+REPORT_STALE_IF_ERROR = float(os.getenv("REPORT_STALE_IF_ERROR", 24 * 60 * 60))
+
+# 차원 / 지표 / 리포트 스위트 목록 캐시 설정
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", 15 * 60))
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", 500))
+CATALOG_STALE_WHILE_REVALIDATE = float(os.getenv("CATALOG_STALE_WHILE_REVALIDATE", 60 * 60))
+CATALOG_STALE_IF_ERROR = float(os.getenv("CATALOG_STALE_IF_ERROR", 24 * 60 * 60))
+
+
+class CacheEntry:
+    """캐시 항목"""
+
+    __slots__ = ("value", "stored_at", "expires_at", "tag")
+
+    def __init__(self, value: Any, ttl: float, tag: Optional[str] = None):
+        self.value = value
+        self.stored_at = time.time()
+        self.expires_at = self.stored_at + ttl
+        # 항목을 채운 주체 (예: 캐시 워머 스펙 이름). 일반 요청이면 None
+        self.tag = tag
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class TTLCache:
+    """만료 시간과 최대 항목 수(LRU 제거)를 가진 프로세스 내 캐시"""
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # 태그별 히트 수 (캐시 워머가 채운 항목이 실제로 사용됐는지 확인용)
+        self.tag_hits: Dict[str, int] = {}
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expired:
+            self.misses += 1
+            return None
+        self.record_hit(key, entry)
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """만료 여부와 관계없이 항목을 반환합니다. 통계에는 반영하지 않습니다."""
+        return self._entries.get(key)
+
+    def record_hit(self, key: str, entry: CacheEntry) -> None:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if entry.tag:
+            self.tag_hits[entry.tag] = self.tag_hits.get(entry.tag, 0) + 1
+
+    def get(self, key: str) -> Any:
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[float] = None, tag: Optional[str] = None
+    ) -> None:
+        self._entries[key] = CacheEntry(
+            value, self.default_ttl if ttl is None else ttl, tag
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+def make_cache_key(prefix: str, payload: Any) -> str:
+    """요청 내용을 정렬된 JSON 으로 직렬화해 캐시 키를 만듭니다."""
+    serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return f"{prefix}:{hashlib.sha1(serialized.encode('utf-8')).hexdigest()}"
+
+
+class SWRPolicy:
+    """stale-while-revalidate 정책
+
+    - ttl: 이 시간 동안은 캐시 값을 그대로 반환 (fresh)
+    - stale_while_revalidate: ttl 이후 이 시간 동안은 만료된 값을 바로 반환하고 백그라운드에서 갱신
+    - stale_if_error: 갱신이 실패하면 ttl 이후 이 시간까지 만료된 값을 대신 반환
+    """
+
+    def __init__(self, ttl: float, stale_while_revalidate: float, stale_if_error: float):
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+
+
+# 키별로 진행 중인 갱신 작업 (같은 키는 한 번만 업스트림 호출)
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+
+def _single_flight(key: str, loader: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(loader())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+        task.add_done_callback(_log_refresh_error)
+    return task
+
+
+def describe_freshness(status: str, entry: Optional[CacheEntry], revalidating: bool = False) -> dict:
+    return {
+        "status": status,
+        "age_seconds": round(time.time() - entry.stored_at, 1) if entry else 0.0,
+        "revalidating": revalidating,
+    }
+
+
+async def get_or_revalidate(
+    cache: TTLCache,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    policy: SWRPolicy,
+) -> Tuple[Any, dict]:
+    """stale-while-revalidate 정책으로 캐시 값을 반환합니다.
+
+    loader 는 백그라운드 갱신에도 사용되므로 호출자의 HTTP 세션에 의존하지 않아야 합니다.
+
+    Returns:
+        (값, freshness) - freshness.status 는 fresh / miss / stale / stale-if-error
+    """
+    entry = cache.peek(key)
+    now = time.time()
+
+    if entry is not None and now < entry.expires_at:
+        cache.record_hit(key, entry)
+        return entry.value, describe_freshness("fresh", entry)
+
+    async def refresh() -> Any:
+        value = await loader()
+        cache.set(key, value, ttl=policy.ttl)
+        return value
+
+    if entry is not None and now < entry.expires_at + policy.stale_while_revalidate:
+        # 만료된 값을 바로 반환하고 갱신은 백그라운드에서 한 번만 실행
+        _single_flight(key, refresh)
+        cache.record_hit(key, entry)
+        return entry.value, describe_freshness("stale", entry, revalidating=True)
+
+    cache.misses += 1
+    try:
+        value = await asyncio.shield(_single_flight(key, refresh))
+        return value, describe_freshness("miss", None)
+    except Exception as e:
+        if entry is not None and now < entry.expires_at + policy.stale_if_error:
+            logger.error("갱신 실패 - 만료된 캐시 반환: %s (%s)", key, str(e))
+            cache.record_hit(key, entry)
+            return entry.value, describe_freshness("stale-if-error", entry)
+        if isinstance(e, StaleFallbackError) and now < e.stored_at + policy.ttl + policy.stale_if_error:
+            # 업스트림이 돌려준 최근 성공 응답. 캐시에는 넣지 않고 실제 나이와 함께 반환
+            logger.error("갱신 실패 - 최근 업스트림 응답 반환: %s (%s)", key, str(e))
+            return e.value, {
+                "status": "stale-if-error",
+                "age_seconds": round(now - e.stored_at, 1),
+                "revalidating": False,
+            }
+        raise
+
+
+def _log_refresh_error(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("캐시 갱신 실패: %s", str(task.exception()))
+
+
+# get_report 결과 캐시
+report_cache = TTLCache(REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_TTL)
+report_swr_policy = SWRPolicy(
+    REPORT_HISTORICAL_TTL, REPORT_STALE_WHILE_REVALIDATE, REPORT_STALE_IF_ERROR
+)
+
+# get_dimensions / get_metrics / get_report_suites 결과 캐시
+catalog_cache = TTLCache(CATALOG_CACHE_MAX_ENTRIES, CATALOG_CACHE_TTL)
+catalog_swr_policy = SWRPolicy(
+    CATALOG_CACHE_TTL, CATALOG_STALE_WHILE_REVALIDATE, CATALOG_STALE_IF_ERROR
+)
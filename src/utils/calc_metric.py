@@ -0,0 +1,138 @@
+"""
+계산된 지표 정의(definition.formula)를 NumPy 벡터 연산 함수로 컴파일합니다.
+
+Adobe 계산된 지표 정의 예:
+
+    {
+        "func": "calc-metric",
+        "formula": {
+            "func": "divide",
+            "col1": {"func": "metric", "name": "metrics/orders"},
+            "col2": {"func": "metric", "name": "metrics/visits"}
+        }
+    }
+
+지원하는 함수: metric, number, add, subtract, multiply, divide, negate, abs, sqrt, pow.
+세그먼트 필터 등 리포트 API 에서만 계산할 수 있는 함수와, 세그먼트(filters) 나 어트리뷰션 설정이
+붙은 지표, 정의 전체에 걸린 filters 는 ValueError 를 발생시킵니다.
+"""
+
+from typing import Callable, Dict, List
+
+import numpy as np
+
+Columns = Dict[str, np.ndarray]
+CompiledFormula = Callable[[Columns], np.ndarray]
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """0 으로 나누면 Adobe 와 같이 0 을 반환합니다."""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=np.float64),
+        np.asarray(denominator, dtype=np.float64),
+    )
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _safe_power(base: np.ndarray, exponent: np.ndarray) -> np.ndarray:
+    """음수의 분수 거듭제곱, 0 의 음수 거듭제곱, 오버플로처럼 유한하지 않은 결과는 0 을 반환합니다."""
+    with np.errstate(all="ignore"):
+        result = np.power(
+            np.asarray(base, dtype=np.float64), np.asarray(exponent, dtype=np.float64)
+        )
+    return np.where(np.isfinite(result), result, 0.0)
+
+
+_BINARY = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": _safe_divide,
+    "pow": _safe_power,
+}
+
+_UNARY = {
+    "negate": np.negative,
+    "abs": np.abs,
+    "sqrt": lambda values: np.sqrt(np.maximum(values, 0)),
+}
+
+
+# metric 노드에서 값 계산에 영향을 주지 않는 키. 그 밖의 키(filters, 어트리뷰션 설정 등)는
+# 리포트 API 에서만 계산할 수 있으므로 지원하지 않습니다.
+_PLAIN_METRIC_KEYS = {"func", "name", "description", "label", "id"}
+
+
+def metric_name(name: str) -> str:
+    """"metrics/orders" -> "orders" (get_report 에 전달하는 형식)"""
+    return name.split("/")[-1]
+
+
+class CalculatedMetricFormula:
+    """컴파일된 계산된 지표 수식"""
+
+    def __init__(self, definition: dict):
+        if definition.get("filters"):
+            raise ValueError("세그먼트 필터가 걸린 계산된 지표는 로컬에서 계산할 수 없습니다.")
+        formula = definition.get("formula", definition)
+        self.base_metrics: List[str] = []
+        self._fn = self._compile(formula)
+
+    def _compile(self, node) -> CompiledFormula:
+        if isinstance(node, (int, float)):
+            value = float(node)
+            return lambda columns: np.float64(value)
+
+        func = node.get("func")
+        if func == "metric":
+            extra = sorted(k for k, v in node.items() if k not in _PLAIN_METRIC_KEYS and v)
+            if extra:
+                raise ValueError(
+                    f"세그먼트/어트리뷰션 설정이 있는 지표는 로컬에서 계산할 수 없습니다: "
+                    f"{node.get('name')} ({', '.join(extra)})"
+                )
+            name = metric_name(node["name"])
+            if name not in self.base_metrics:
+                self.base_metrics.append(name)
+            return lambda columns: columns[name]
+
+        if func == "number":
+            value = float(node["val"])
+            return lambda columns: np.float64(value)
+
+        if func in _BINARY:
+            op = _BINARY[func]
+            left, right = self._compile(node["col1"]), self._compile(node["col2"])
+            return lambda columns: op(left(columns), right(columns))
+
+        if func in _UNARY:
+            op = _UNARY[func]
+            operand = self._compile(node.get("col") or node.get("col1"))
+            return lambda columns: op(operand(columns))
+
+        raise ValueError(f"로컬에서 계산할 수 없는 함수입니다: {func}")
+
+    def evaluate(self, columns: Columns) -> np.ndarray:
+        """기본 지표 열(같은 길이의 배열)로 계산된 지표 값을 한 번에 계산합니다."""
+        result = np.asarray(self._fn(columns), dtype=np.float64)
+        length = len(next(iter(columns.values()))) if columns else 1
+        return np.broadcast_to(result, (length,)) if result.ndim == 0 else result
+
+
+def report_columns(report: dict, metrics: List[str]) -> Columns:
+    """get_report 응답의 rows[].data 를 지표별 배열로 변환합니다."""
+    rows = report.get("rows", [])
+    data = np.array([row.get("data", []) for row in rows], dtype=np.float64)
+    data = data.reshape(len(rows), len(metrics))
+    return {metric: data[:, i] for i, metric in enumerate(metrics)}
+
+
+def total_columns(report: dict, metrics: List[str]) -> Columns:
+    """get_report 응답의 summaryData.totals 를 길이 1 배열로 변환합니다."""
+    totals = report.get("summaryData", {}).get("totals", [])
+    return {
+        metric: np.array([totals[i] if i < len(totals) else 0], dtype=np.float64)
+        for i, metric in enumerate(metrics)
+    }
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+from auth.adobe_auth import AdobeAuth
+from utils.adobe_client import request_json
+
+logger = logging.getLogger(__name__)
+
+# 증분 동기화 / 전체 동기화 시 사용하는 페이지 크기
+SYNC_PAGE_SIZE = 500
+# 보관할 증분 동기화 스냅샷 수 (가장 오래 사용하지 않은 스냅샷부터 제거)
+COMPONENT_SNAPSHOT_MAX_ENTRIES = int(os.getenv("COMPONENT_SNAPSHOT_MAX_ENTRIES", 32))
+# 증분 동기화는 삭제된 컴포넌트를 알 수 없으므로 이 간격(초)이 지나면 전체 동기화로 다시 만듦
+COMPONENT_FULL_SYNC_INTERVAL = float(os.getenv("COMPONENT_FULL_SYNC_INTERVAL", 3600))
+
+# 서버 측 expansion 으로 요청해야 하는 필드
+EXPANDABLE_FIELDS = {
+    "reportSuiteName",
+    "ownerFullName",
+    "modified",
+    "created",
+    "tags",
+    "compatibility",
+    "definition",
+    "definitionLastModified",
+    "publishingStatus",
+    "categories",
+    "shares",
+    "usageSummary",
+}
+
+
+class ComponentSpec:
+    """컴포넌트 종류별 API 경로와 필터 파라미터 이름"""
+
+    def __init__(self, kind: str, path: str, rsid_param: str, multi_rsid: bool):
+        self.kind = kind
+        self.path = path
+        self.rsid_param = rsid_param
+        self.multi_rsid = multi_rsid
+
+
+SEGMENTS = ComponentSpec("segments", "segments", "rsids", multi_rsid=True)
+CALCULATED_METRICS = ComponentSpec(
+    "calculated_metrics", "calculatedmetrics", "toBeUsedInRsid", multi_rsid=False
+)
+
+
+class ComponentSnapshot:
+    """증분 동기화를 위해 보관하는 컴포넌트 목록 (id -> item)
+
+    증분 동기화는 수정일 기준으로 변경된 항목만 합치므로 삭제된 컴포넌트는 남아 있습니다.
+    삭제는 COMPONENT_FULL_SYNC_INTERVAL 마다 (또는 full_sync 요청 시) 하는 전체 동기화에서 반영됩니다.
+    """
+
+    def __init__(self):
+        self.items: Dict[str, dict] = {}
+        self.last_modified: Optional[str] = None
+        self.full_synced_at = time.monotonic()
+
+    def needs_full_sync(self) -> bool:
+        return (
+            self.last_modified is None
+            or time.monotonic() - self.full_synced_at >= COMPONENT_FULL_SYNC_INTERVAL
+        )
+
+    def merge(self, items: List[dict]) -> None:
+        for item in items:
+            self.items[item["id"]] = item
+            modified = item.get("modified")
+            if modified and (self.last_modified is None or modified > self.last_modified):
+                self.last_modified = modified
+
+
+# (종류, company_id, 서버 측 필터, expansion) -> 스냅샷
+_snapshots: "OrderedDict[Tuple, ComponentSnapshot]" = OrderedDict()
+
+
+def build_filter_params(spec: ComponentSpec, params) -> dict:
+    """rsid / owner / name 필터를 API 쿼리 파라미터로 변환합니다."""
+    filters: Dict[str, Any] = {"name": params.name, "ownerId": params.owner_id}
+    rsids = params.rsids or ([params.rsid] if params.rsid else None)
+    if rsids:
+        if not spec.multi_rsid and len(rsids) > 1:
+            raise ValueError(f"{spec.kind} 는 rsid 필터를 하나만 지원합니다.")
+        filters[spec.rsid_param] = ",".join(rsids)
+    return filters
+
+
+def build_expansion(fields: Optional[List[str]], extra: Tuple[str, ...] = ()) -> Optional[str]:
+    """요청된 필드 중 expansion 이 필요한 필드를 모아 expansion 파라미터를 만듭니다."""
+    expansion = [field for field in (fields or []) if field in EXPANDABLE_FIELDS]
+    expansion.extend(field for field in extra if field not in expansion)
+    return ",".join(expansion) or None
+
+
+def project(items: List[dict], fields: Optional[List[str]]) -> List[dict]:
+    """요청된 필드만 남깁니다. id 는 항상 포함합니다."""
+    if not fields:
+        return items
+    keep = ["id"] + [field for field in fields if field != "id"]
+    return [{field: item.get(field) for field in keep} for item in items]
+
+
+async def fetch_pages(
+    session: aiohttp.ClientSession,
+    auth: AdobeAuth,
+    spec: ComponentSpec,
+    query: dict,
+    limit: int,
+    start_page: int,
+    max_pages: Optional[int],
+) -> Tuple[List[dict], int]:
+    """첫 페이지로 전체 페이지 수를 확인한 뒤 나머지 페이지를 동시에 가져옵니다."""
+    first = await request_json(
+        session, auth, "GET", spec.path, params={**query, "limit": limit, "page": start_page}
+    )
+    content = list(first.get("content", []))
+    total_count = first.get("totalElements", len(content))
+    total_pages = first.get("totalPages", 1)
+
+    last_page = total_pages if max_pages is None else min(total_pages, start_page + max_pages)
+    if start_page + 1 < last_page:
+        pages = await asyncio.gather(
+            *(
+                request_json(
+                    session, auth, "GET", spec.path, params={**query, "limit": limit, "page": page}
+                )
+                for page in range(start_page + 1, last_page)
+            )
+        )
+        for data in pages:
+            content.extend(data.get("content", []))
+
+    return content, total_count
+
+
+async def fetch_modified_since(
+    session: aiohttp.ClientSession,
+    auth: AdobeAuth,
+    spec: ComponentSpec,
+    query: dict,
+    since: str,
+) -> List[dict]:
+    """수정일 내림차순으로 페이지를 읽다가 마지막 동기화 시점보다 오래된 항목에서 멈춥니다."""
+    changed: List[dict] = []
+    page = 0
+    while True:
+        data = await request_json(
+            session,
+            auth,
+            "GET",
+            spec.path,
+            params={
+                **query,
+                "limit": SYNC_PAGE_SIZE,
+                "page": page,
+                "sortProperty": "modified_date",
+                "sortDirection": "DESC",
+            },
+        )
+        content = data.get("content", [])
+        for item in content:
+            if (item.get("modified") or "") < since:
+                return changed
+            changed.append(item)
+
+        if data.get("lastPage", True) or not content:
+            return changed
+        page += 1
+
+
+async def fetch_components(auth: AdobeAuth, spec: ComponentSpec, params) -> dict:
+    """세그먼트 / 계산된 지표 목록을 필터, 페이지, 필드 선택을 적용해 조회합니다.
+
+    Args:
+        auth (AdobeAuth): 인증 정보
+        spec (ComponentSpec): 컴포넌트 종류
+        params: 검증된 파라미터 (GetSegmentsParams, GetCalculatedMetricsParams)
+    """
+    filters = build_filter_params(spec, params)
+
+    async with aiohttp.ClientSession() as session:
+        if not params.sync:
+            query = {**filters, "expansion": build_expansion(params.fields)}
+            max_results = params.max_results or params.limit
+            content, total_count = await fetch_pages(
+                session,
+                auth,
+                spec,
+                query,
+                limit=params.limit,
+                start_page=params.page,
+                max_pages=math.ceil(max_results / params.limit),
+            )
+            content = project(content[:max_results], params.fields)
+            return {
+                "content": content,
+                "total_count": total_count,
+                "returned_count": len(content),
+            }
+
+        # 증분 동기화: 마지막 동기화 이후 수정된 항목만 다시 가져옴
+        # 스냅샷 항목은 요청한 expansion 필드만 담고 있으므로 expansion 도 키에 포함
+        expansion = build_expansion(params.fields, extra=("modified",))
+        key = (
+            spec.kind,
+            auth.company_id,
+            tuple(sorted((k, v) for k, v in filters.items() if v)),
+            expansion,
+        )
+        query = {**filters, "expansion": expansion}
+        snapshot = _snapshots.get(key)
+
+        if snapshot is None or params.full_sync or snapshot.needs_full_sync():
+            snapshot = ComponentSnapshot()
+            items, _ = await fetch_pages(
+                session, auth, spec, query, limit=SYNC_PAGE_SIZE, start_page=0, max_pages=None
+            )
+            mode = "full"
+        else:
+            items = await fetch_modified_since(
+                session, auth, spec, query, snapshot.last_modified
+            )
+            mode = "incremental"
+
+        snapshot.merge(items)
+        _snapshots[key] = snapshot
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > COMPONENT_SNAPSHOT_MAX_ENTRIES:
+            _snapshots.popitem(last=False)
+        logger.info(
+            "%s 동기화 완료 - 모드: %s, 변경: %d, 전체: %d",
+            spec.kind,
+            mode,
+            len(items),
+            len(snapshot.items),
+        )
+
+    content = list(snapshot.items.values())
+    if params.max_results:
+        content = content[: params.max_results]
+    content = project(content, params.fields)
+    return {
+        "content": content,
+        "total_count": len(snapshot.items),
+        "returned_count": len(content),
+        "sync": {
+            "mode": mode,
+            "changed_count": len(items),
+            "last_modified": snapshot.last_modified,
+        },
+    }
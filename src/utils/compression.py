@@ -0,0 +1,208 @@
+"""
+업스트림 / MCP 응답 압축
+
+- 업스트림: Adobe API 요청에 Accept-Encoding 을 명시합니다. brotli 패키지가 설치된 경우에만
+  br 을 요청합니다 (aiohttp 가 br 을 해제하려면 brotli 가 필요).
+- MCP: MCP_COMPRESSION=true 이고 클라이언트가 gzip 을 허용하면 HTTP 응답을 gzip 으로
+  압축합니다. 일반 응답은 MCP_COMPRESSION_MIN_SIZE 보다 작으면 압축하지 않습니다.
+  SSE 스트림은 이벤트마다 바로 내보내며, MCP_COMPRESSION_MIN_SIZE 보다 작은 이벤트는
+  압축하지 않은 deflate stored 블록으로, 큰 이벤트는 Z_FULL_FLUSH 로 압축해 씁니다.
+"""
+
+import os
+import struct
+import zlib
+from typing import Dict, Optional
+
+try:
+    import brotli  # noqa: F401
+
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+UPSTREAM_ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+MCP_COMPRESSION = os.getenv("MCP_COMPRESSION", "false").lower() == "true"
+MCP_COMPRESSION_MIN_SIZE = int(os.getenv("MCP_COMPRESSION_MIN_SIZE", 1024))
+MCP_COMPRESSION_LEVEL = int(os.getenv("MCP_COMPRESSION_LEVEL", 6))
+
+
+class TransferStats:
+    """압축 전 크기와 실제 전송 크기 누적값"""
+
+    def __init__(self):
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.count = 0
+        self.encodings: Dict[str, int] = {}
+
+    def record(self, raw: int, wire: Optional[int], encoding: Optional[str]) -> None:
+        self.count += 1
+        self.raw_bytes += raw
+        # 전송 크기를 알 수 없으면 (chunked) 압축 전 크기로 계산
+        self.wire_bytes += raw if wire is None else wire
+        key = encoding or "identity"
+        self.encodings[key] = self.encodings.get(key, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "raw_bytes": self.raw_bytes,
+            "wire_bytes": self.wire_bytes,
+            "ratio": round(self.wire_bytes / self.raw_bytes, 4) if self.raw_bytes else None,
+            "encodings": dict(self.encodings),
+        }
+
+
+upstream_transfer = TransferStats()
+mcp_transfer = TransferStats()
+
+
+def compression_stats() -> dict:
+    return {
+        "upstream": upstream_transfer.snapshot(),
+        "mcp": mcp_transfer.snapshot(),
+        "mcp_enabled": MCP_COMPRESSION,
+    }
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Accept-Encoding 헤더가 gzip 을 허용하는지 (q=0 은 거부, * 는 gzip 이 따로 없을 때만)"""
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def _accepts_gzip(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            return accepts_gzip(value.decode("latin-1"))
+    return False
+
+
+# 고정 gzip 헤더 (mtime 없음, OS unknown)
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+class GzipEventStream:
+    """SSE 이벤트를 하나씩 gzip 스트림으로 변환합니다.
+
+    작은 이벤트는 압축 CPU 를 쓰지 않도록 stored 블록으로 쓰고, 큰 이벤트는 압축한 뒤
+    Z_FULL_FLUSH 로 내보냅니다. full flush 는 압축 사전을 초기화하므로 압축 블록이 사이에
+    끼운 stored 블록을 잘못 참조하지 않습니다.
+    """
+
+    def __init__(self, minimum_size: int, level: int):
+        self.minimum_size = minimum_size
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self._crc = 0
+        self._size = 0
+        self._started = False
+
+    def write(self, data: bytes, final: bool) -> bytes:
+        out = b""
+        if not self._started:
+            self._started = True
+            out += GZIP_HEADER
+        if data:
+            self._crc = zlib.crc32(data, self._crc)
+            self._size += len(data)
+            if len(data) < self.minimum_size:
+                for i in range(0, len(data), 0xFFFF):
+                    chunk = data[i : i + 0xFFFF]
+                    out += b"\x00" + struct.pack("<HH", len(chunk), len(chunk) ^ 0xFFFF) + chunk
+            else:
+                out += self._compressor.compress(data)
+                out += self._compressor.flush(zlib.Z_FULL_FLUSH)
+        if final:
+            out += self._compressor.flush(zlib.Z_FINISH)
+            out += struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF)
+        return out
+
+
+class CompressionMiddleware:
+    """SSE 스트림과 큰 HTTP 응답을 gzip 으로 압축하는 ASGI 미들웨어"""
+
+    def __init__(self, app, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _accepts_gzip(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        event_stream = None
+        decided = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, event_stream, decided
+
+            if message["type"] == "http.response.start":
+                # 첫 본문을 보고 압축 여부를 결정할 때까지 헤더 전송을 미룸
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if not decided:
+                decided = True
+                headers = [
+                    (k, v) for k, v in start_message["headers"] if k != b"content-length"
+                ]
+                header_map = dict(start_message["headers"])
+                streaming = header_map.get(b"content-type", b"").startswith(
+                    b"text/event-stream"
+                )
+                if b"content-encoding" not in header_map and (
+                    streaming or more_body or len(body) >= self.minimum_size
+                ):
+                    if streaming:
+                        event_stream = GzipEventStream(self.minimum_size, self.level)
+                    else:
+                        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+                    headers.append((b"content-encoding", b"gzip"))
+                    headers.append((b"vary", b"Accept-Encoding"))
+                    start_message = {**start_message, "headers": headers}
+                await send(start_message)
+
+            if event_stream is not None:
+                data = event_stream.write(body, final=not more_body)
+                mcp_transfer.record(len(body), len(data), "gzip")
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            if compressor is None:
+                mcp_transfer.record(len(body), len(body), None)
+                await send(message)
+                return
+
+            data = compressor.compress(body)
+            data += compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+            mcp_transfer.record(len(body), len(data), "gzip")
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,307 @@
+"""
+데이터 피드 고유값 스케치 저장소
+
+Adobe 데이터 피드 파일(hit_data.tsv[.gz] + column_headers.tsv)을 스트리밍으로 읽어
+(rsid, 일) 파티션마다 HyperLogLog 스케치를 만듭니다.
+
+- ("visitors",): 고유 방문자 (post_visid_high + post_visid_low)
+- ("pages",): 고유 페이지 (post_pagename)
+- ("visitors", <컬럼>, <값>): 지정한 차원 컬럼 값별 고유 방문자
+
+스케치는 FEED_SKETCH_DIR/<rsid>/<YYYY-MM-DD>.npz 로 저장되며, 기간 조회는
+일별 스케치를 병합하므로 원본 히트 데이터를 다시 읽지 않습니다.
+
+같은 (rsid, 일) 을 동시에 ingest 해도 결과가 유실되지 않도록, 저장은 파일 잠금 아래에서
+디스크의 최신 스케치를 다시 읽어 병합한 뒤 씁니다 (다른 워커 프로세스 포함).
+"""
+
+import csv
+import fcntl
+import gzip
+import json
+import os
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.hll import HyperLogLog, hash_values
+
+FEED_SKETCH_DIR = os.getenv("FEED_SKETCH_DIR", "./feed_sketches")
+# 데이터 피드 파일을 읽을 수 있는 디렉터리
+DATA_FEED_DIR = os.getenv("DATA_FEED_DIR", "./data_feeds")
+FEED_SKETCH_PRECISION = int(os.getenv("FEED_SKETCH_PRECISION", 12))
+# 하루 / 컬럼당 값별 스케치 최대 수 (초과하는 값은 집계하지 않음)
+FEED_SKETCH_MAX_VALUES = int(os.getenv("FEED_SKETCH_MAX_VALUES", 1000))
+# 메모리에 유지하는 일별 파티션 수
+FEED_SKETCH_CACHE_DAYS = int(os.getenv("FEED_SKETCH_CACHE_DAYS", 400))
+# 한 번에 해시하는 행 수
+INGEST_BATCH_ROWS = 50000
+
+SketchKey = Tuple[str, ...]
+DaySketches = Dict[SketchKey, HyperLogLog]
+
+
+def sketch_key(
+    metric: str, column: Optional[str] = None, value: Optional[str] = None
+) -> SketchKey:
+    return (metric,) if column is None else (metric, column, value)
+
+
+def cap_value_sketches(sketches: DaySketches, new: DaySketches) -> Tuple[DaySketches, int]:
+    """new 를 sketches 에 병합합니다. 컬럼별 값 스케치가 FEED_SKETCH_MAX_VALUES 를 넘는 값은 버립니다."""
+    value_counts: Dict[str, int] = defaultdict(int)
+    for key in sketches:
+        if len(key) == 3:
+            value_counts[key[1]] += 1
+    skipped = 0
+    for key, sketch in new.items():
+        if key in sketches:
+            sketches[key].merge(sketch)
+            continue
+        if len(key) == 3:
+            if value_counts[key[1]] >= FEED_SKETCH_MAX_VALUES:
+                skipped += 1
+                continue
+            value_counts[key[1]] += 1
+        sketches[key] = sketch
+    return sketches, skipped
+
+
+def resolve_feed_path(path: str) -> str:
+    """DATA_FEED_DIR 밖의 파일은 읽지 않습니다."""
+    base = os.path.realpath(DATA_FEED_DIR)
+    full = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, full]) != base:
+        raise ValueError(f"DATA_FEED_DIR 밖의 경로입니다: {path}")
+    if not os.path.isfile(full):
+        raise ValueError(f"파일을 찾을 수 없습니다: {path}")
+    return full
+
+
+def _open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, "r", encoding="utf-8", errors="replace", newline="")
+
+
+def read_column_headers(path: str) -> List[str]:
+    with _open_text(path) as f:
+        return f.readline().rstrip("\r\n").split("\t")
+
+
+def iter_hits(hit_data_path: str, headers: List[str]) -> Iterator[dict]:
+    """제외 히트(exclude_hit != 0)를 건너뛰고 히트를 하나씩 반환합니다."""
+    with _open_text(hit_data_path) as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        for row in reader:
+            hit = dict(zip(headers, row))
+            if hit.get("exclude_hit", "0") not in ("", "0"):
+                continue
+            yield hit
+
+
+class FeedSketchStore:
+    """(rsid, 일) 파티션별 스케치 저장소"""
+
+    def __init__(self, directory: str, precision: int):
+        self.directory = directory
+        self.precision = precision
+        # (rsid, 일) -> (파일 mtime, 스케치)
+        self._days: "OrderedDict[tuple, Tuple[int, DaySketches]]" = OrderedDict()
+
+    def _path(self, rsid: str, day: str) -> str:
+        return os.path.join(self.directory, rsid, f"{day}.npz")
+
+    @contextmanager
+    def _day_lock(self, rsid: str, day: str):
+        """(rsid, 일) 파티션 잠금. 스레드와 다른 워커 프로세스 모두에 대해 배타적입니다."""
+        path = self._path(rsid, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read(path: str) -> DaySketches:
+        with np.load(path) as data:
+            names = json.loads(str(data["keys"]))
+            registers = data["registers"]
+            precision = int(data["precision"])
+        return {
+            tuple(name): HyperLogLog(precision, registers[i].copy())
+            for i, name in enumerate(names)
+        }
+
+    def load_day(self, rsid: str, day: str) -> Optional[DaySketches]:
+        """일별 스케치를 읽습니다. 다른 프로세스가 파일을 바꾸면 다시 읽습니다."""
+        key = (rsid, day)
+        path = self._path(rsid, day)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._days.pop(key, None)
+            return None
+        cached = self._days.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, self._read(path))
+            self._days[key] = cached
+            while len(self._days) > FEED_SKETCH_CACHE_DAYS:
+                self._days.popitem(last=False)
+        self._days.move_to_end(key)
+        return cached[1]
+
+    def save_day(self, rsid: str, day: str, sketches: DaySketches) -> None:
+        path = self._path(rsid, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        names = list(sketches)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            keys=np.array(json.dumps([list(name) for name in names], ensure_ascii=False)),
+            registers=np.stack([sketches[name].registers for name in names]),
+            precision=np.array(self.precision),
+        )
+        os.replace(tmp_path, path)
+        self._days[(rsid, day)] = (os.stat(path).st_mtime_ns, sketches)
+
+    def merge_day(self, rsid: str, day: str, new: DaySketches) -> int:
+        """새 스케치를 디스크의 최신 스케치와 병합해 저장하고, 버린 값 스케치 수를 반환합니다."""
+        with self._day_lock(rsid, day):
+            path = self._path(rsid, day)
+            current = self._read(path) if os.path.exists(path) else {}
+            merged, skipped = cap_value_sketches(current, new)
+            self.save_day(rsid, day, merged)
+        return skipped
+
+    def days(self, rsid: str) -> List[str]:
+        directory = os.path.join(self.directory, rsid)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npz"))
+
+    def ingest(
+        self,
+        rsid: str,
+        hit_data_path: str,
+        column_headers_path: str,
+        dimensions: List[str],
+    ) -> dict:
+        """데이터 피드 파일 하나를 읽어 일별 스케치에 반영하고 저장합니다 (동기 함수)."""
+        headers = read_column_headers(column_headers_path)
+        missing = [c for c in ["date_time", *dimensions] if c not in headers]
+        if missing:
+            raise ValueError(f"데이터 피드에 없는 컬럼입니다: {missing}")
+
+        # 이번 파일에서 만든 일별 스케치 (저장할 때 디스크의 스케치와 병합)
+        touched: Dict[str, DaySketches] = defaultdict(dict)
+        # 일 -> 스케치 키 -> 값 목록 (배치 단위로 해시)
+        pending: Dict[str, Dict[SketchKey, List[str]]] = defaultdict(lambda: defaultdict(list))
+        rows = 0
+        skipped_values = 0
+
+        def flush() -> None:
+            nonlocal skipped_values
+            for day, batches in pending.items():
+                sketches = touched[day]
+                batch_sketches: DaySketches = {}
+                for name, values in batches.items():
+                    sketch = HyperLogLog(self.precision)
+                    sketch.add_hashes(hash_values(values))
+                    batch_sketches[name] = sketch
+                _, skipped = cap_value_sketches(sketches, batch_sketches)
+                skipped_values += skipped
+            pending.clear()
+
+        for hit in iter_hits(hit_data_path, headers):
+            day = hit["date_time"][:10]
+            visitor = f"{hit.get('post_visid_high', '')}:{hit.get('post_visid_low', '')}"
+            batch = pending[day]
+            batch[sketch_key("visitors")].append(visitor)
+            page = hit.get("post_pagename")
+            if page:
+                batch[sketch_key("pages")].append(page)
+            for column in dimensions:
+                value = hit.get(column)
+                if value:
+                    batch[sketch_key("visitors", column, value)].append(visitor)
+            rows += 1
+            if rows % INGEST_BATCH_ROWS == 0:
+                flush()
+        flush()
+
+        for day, sketches in touched.items():
+            skipped_values += self.merge_day(rsid, day, sketches)
+
+        return {
+            "rsid": rsid,
+            "rows": rows,
+            "days": sorted(touched),
+            "sketches": sum(len(s) for s in touched.values()),
+            "skipped_values": skipped_values,
+        }
+
+    def distinct_count(
+        self,
+        rsid: str,
+        start: date,
+        end: date,
+        metric: str,
+        column: Optional[str] = None,
+        values: Optional[List[str]] = None,
+    ) -> dict:
+        """[start, end) 기간의 일별 스케치를 병합해 고유값 개수를 추정합니다.
+
+        parse_date_range 와 같이 end 는 포함하지 않습니다. start 와 end 가 같으면 그 하루를 조회합니다.
+        """
+        covered: List[str] = []
+        missing: List[str] = []
+        merged: Dict[str, HyperLogLog] = {}
+        if end <= start:
+            end = start + timedelta(days=1)
+
+        day = start
+        while day < end:
+            name = day.isoformat()
+            sketches = self.load_day(rsid, name)
+            if sketches is None:
+                missing.append(name)
+            else:
+                covered.append(name)
+                for key, sketch in sketches.items():
+                    if key[0] != metric:
+                        continue
+                    if column is None:
+                        if len(key) != 1:
+                            continue
+                        label = metric
+                    else:
+                        if len(key) != 3 or key[1] != column:
+                            continue
+                        if values is not None and key[2] not in values:
+                            continue
+                        label = key[2]
+                    if label in merged:
+                        merged[label].merge(sketch)
+                    else:
+                        merged[label] = sketch.copy()
+            day += timedelta(days=1)
+
+        relative_error = 1.04 / np.sqrt(1 << self.precision)
+        return {
+            "rsid": rsid,
+            "metric": metric,
+            "dimension": column,
+            "counts": {label: sketch.count() for label, sketch in merged.items()},
+            "relative_error": round(float(relative_error), 4),
+            "days_covered": len(covered),
+            "missing_days": missing,
+        }
+
+
+feed_sketches = FeedSketchStore(FEED_SKETCH_DIR, FEED_SKETCH_PRECISION)
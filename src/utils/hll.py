@@ -0,0 +1,96 @@
+"""
+HyperLogLog 고유값 개수 추정 스케치
+
+- 레지스터 수 m = 2^precision, 상대 표준 오차는 약 1.04 / sqrt(m)
+  (precision 12: 4KB, 약 1.6% / precision 14: 16KB, 약 0.8%)
+- 같은 precision 의 스케치는 레지스터별 최대값으로 병합할 수 있어서
+  일별 스케치를 합치면 임의 기간의 고유값 개수를 바로 구할 수 있습니다.
+- 해시는 프로세스와 무관하게 같은 값을 내도록 blake2b 64비트를 사용합니다.
+"""
+
+import hashlib
+from typing import Iterable
+
+import numpy as np
+
+MIN_PRECISION = 11
+MAX_PRECISION = 16
+
+
+def hash_values(values: Iterable[str]) -> np.ndarray:
+    """문자열 값을 64비트 해시 배열로 변환합니다."""
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(str(v).encode(), digest_size=8).digest(), "little")
+            for v in values
+        ),
+        dtype=np.uint64,
+    )
+
+
+def _alpha(m: int) -> float:
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
+
+
+class HyperLogLog:
+    """NumPy 레지스터 배열 기반 HyperLogLog"""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = 12, registers: np.ndarray = None):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(
+                f"precision 은 {MIN_PRECISION}~{MAX_PRECISION} 사이여야 합니다: {precision}"
+            )
+        self.precision = precision
+        self.registers = (
+            registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+        )
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """64비트 해시 배열을 한 번에 반영합니다."""
+        if not len(hashes):
+            return
+        p = self.precision
+        remaining_bits = 64 - p
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        # remaining_bits <= 53 이므로 float64 변환 시 log2 값이 정확함
+        nonzero = rest > 0
+        rank = np.full(len(hashes), remaining_bits + 1, dtype=np.uint8)
+        rank[nonzero] = (
+            remaining_bits - np.floor(np.log2(rest[nonzero].astype(np.float64)))
+        ).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, values: Iterable[str]) -> None:
+        self.add_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """자기 자신에 other 를 병합합니다."""
+        if other.precision != self.precision:
+            raise ValueError("precision 이 다른 스케치는 병합할 수 없습니다.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        return HyperLogLog(self.precision, self.registers.copy())
+
+    def count(self) -> int:
+        m = len(self.registers)
+        estimate = _alpha(m) * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # 작은 값 구간은 linear counting 으로 보정
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
@@ -0,0 +1,181 @@
+"""
+(rsid, dimension) 별 차원 값 -> itemId 인덱스
+
+get_report 응답의 rows[].value / rows[].itemId 를 기록해 두고, 이름으로 필터하거나
+조회할 때 별도의 탐색 리포트 없이 itemId 를 찾습니다.
+
+- 값 비교는 대소문자/앞뒤 공백을 무시합니다.
+- 전체 항목 수는 ITEM_INDEX_MAX_ITEMS 로 제한되며, 가장 오래 사용하지 않은 차원의
+  가장 오래된 항목부터 제거합니다.
+- ITEM_INDEX_PATH 를 지정하면 서버 종료 시 JSON 으로 저장하고 시작 시 다시 읽습니다.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ITEM_INDEX_MAX_ITEMS = int(os.getenv("ITEM_INDEX_MAX_ITEMS", 200000))
+ITEM_INDEX_PATH = os.getenv("ITEM_INDEX_PATH")
+
+DimensionKey = Tuple[str, str]
+
+
+def normalize_value(value: str) -> str:
+    return str(value).strip().casefold()
+
+
+def short_dimension(dimension: str) -> str:
+    """"variables/lasttouchchannel" -> "lasttouchchannel" """
+    return dimension.split("/")[-1]
+
+
+class DimensionItemIndex:
+    """LRU 로 크기가 제한된 차원 값 -> itemId 인덱스"""
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._dims: "OrderedDict[DimensionKey, OrderedDict[str, Tuple[str, str]]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _evict(self) -> None:
+        while self._size > self.max_items and self._dims:
+            key, items = next(iter(self._dims.items()))
+            items.popitem(last=False)
+            self._size -= 1
+            self.evictions += 1
+            if not items:
+                del self._dims[key]
+
+    def add(self, rsid: str, dimension: str, pairs: Iterable[Tuple[str, str]]) -> int:
+        """(value, itemId) 목록을 기록하고 새로 추가된 항목 수를 반환합니다."""
+        key = (rsid, short_dimension(dimension))
+        items = self._dims.get(key)
+        if items is None:
+            items = self._dims[key] = OrderedDict()
+        self._dims.move_to_end(key)
+
+        added = 0
+        for value, item_id in pairs:
+            if value is None or item_id is None:
+                continue
+            norm = normalize_value(value)
+            if norm not in items:
+                added += 1
+            items[norm] = (str(item_id), str(value))
+            items.move_to_end(norm)
+        self._size += added
+        self._evict()
+        return added
+
+    def record_report(self, request_body: dict, result: dict) -> None:
+        """리포트 응답의 행을 인덱스에 기록합니다. 날짜 차원은 제외합니다."""
+        dimension = short_dimension(request_body.get("dimension", ""))
+        if not dimension or dimension.startswith("daterange"):
+            return
+        self.add(
+            request_body.get("rsid", ""),
+            dimension,
+            ((row.get("value"), row.get("itemId")) for row in result.get("rows", [])),
+        )
+
+    def resolve(self, rsid: str, dimension: str, value: str) -> Optional[str]:
+        """값과 정확히 일치하는 itemId 를 반환합니다. 없으면 None."""
+        key = (rsid, short_dimension(dimension))
+        items = self._dims.get(key)
+        entry = items.get(normalize_value(value)) if items is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._dims.move_to_end(key)
+        items.move_to_end(normalize_value(value))
+        return entry[0]
+
+    def resolve_many(
+        self, rsid: str, dimension: str, values: List[str]
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """값 목록을 ({값: itemId}, 찾지 못한 값 목록) 으로 나눕니다."""
+        resolved: Dict[str, str] = {}
+        missing: List[str] = []
+        for value in values:
+            item_id = self.resolve(rsid, dimension, value)
+            if item_id is None:
+                missing.append(value)
+            else:
+                resolved[value] = item_id
+        return resolved, missing
+
+    def search(self, rsid: str, dimension: str, text: str, limit: int = 20) -> List[dict]:
+        """값에 text 가 포함된 항목을 반환합니다."""
+        items = self._dims.get((rsid, short_dimension(dimension)), {})
+        needle = normalize_value(text)
+        matches = []
+        for norm, (item_id, value) in items.items():
+            if needle in norm:
+                matches.append({"value": value, "itemId": item_id})
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def stats(self) -> dict:
+        return {
+            "dimensions": len(self._dims),
+            "items": self._size,
+            "max_items": self.max_items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def save(self, path: str) -> None:
+        data = [
+            {"rsid": rsid, "dimension": dimension, "items": list(items.values())}
+            for (rsid, dimension), items in self._dims.items()
+        ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        with open(path) as f:
+            data = json.load(f)
+        for entry in data:
+            self.add(
+                entry["rsid"],
+                entry["dimension"],
+                ((value, item_id) for item_id, value in entry["items"]),
+            )
+
+
+def load_item_index() -> DimensionItemIndex:
+    index = DimensionItemIndex(ITEM_INDEX_MAX_ITEMS)
+    if ITEM_INDEX_PATH and os.path.exists(ITEM_INDEX_PATH):
+        try:
+            index.load(ITEM_INDEX_PATH)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("차원 항목 인덱스 로드 실패: %s", str(e))
+    return index
+
+
+def save_item_index() -> None:
+    """ITEM_INDEX_PATH 가 설정된 경우 인덱스를 저장합니다 (서버 종료 시 호출)."""
+    if not ITEM_INDEX_PATH:
+        return
+    try:
+        item_index.save(ITEM_INDEX_PATH)
+    except OSError as e:
+        logger.error("차원 항목 인덱스 저장 실패: %s", str(e))
+
+
+item_index = load_item_index()
@@ -0,0 +1,112 @@
+"""
+멀티 프로세스 모드의 SSE 메시지 라우팅
+
+워커들은 같은 리스닝 소켓에서 연결을 받으므로 SSE 스트림과 그 세션의 POST 메시지가 서로 다른
+워커에 도착할 수 있습니다. 워커마다 고유한 lane 번호를 메시지 경로(/messages/<lane>/)에 넣고,
+다른 lane 의 메시지를 받은 워커는 해당 워커의 내부 포트(WORKER_BASE_PORT + lane)로 전달합니다.
+"""
+
+import logging
+import re
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_PATH_PREFIX = "/messages/"
+_LANE_PATH = re.compile(r"^/messages/(\d+)/")
+
+# 전달하지 않는 hop-by-hop 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "content-length",
+    "host",
+    "upgrade",
+}
+
+
+def lane_message_path(lane: Optional[int]) -> str:
+    """워커 lane 의 SSE 메시지 경로 (단일 프로세스 모드는 기본 경로)"""
+    if lane is None:
+        return MESSAGE_PATH_PREFIX
+    return f"{MESSAGE_PATH_PREFIX}{lane}/"
+
+
+def message_lane(path: str) -> Optional[int]:
+    """메시지 경로에서 lane 번호를 읽습니다. lane 경로가 아니면 None"""
+    match = _LANE_PATH.match(path)
+    return int(match.group(1)) if match else None
+
+
+class LaneRouter:
+    """다른 워커 lane 의 SSE 메시지 POST 를 해당 워커의 내부 포트로 전달하는 ASGI 미들웨어"""
+
+    def __init__(self, app, lane: int, base_port: int):
+        self.app = app
+        self.lane = lane
+        self.base_port = base_port
+        self._client: Optional[aiohttp.ClientSession] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            lane = message_lane(scope["path"])
+            if lane is not None and lane != self.lane:
+                await self._forward(lane, scope, receive, send)
+                return
+        elif scope["type"] == "lifespan":
+            await self._run_lifespan(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    async def _run_lifespan(self, scope, receive, send):
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self._client is not None:
+                await self._client.close()
+                self._client = None
+
+    async def _read_body(self, receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                return body
+
+    async def _forward(self, lane: int, scope, receive, send) -> None:
+        if self._client is None:
+            # 응답 본문을 해제하지 않고 Content-Encoding 과 함께 그대로 전달
+            self._client = aiohttp.ClientSession(auto_decompress=False)
+        url = f"http://127.0.0.1:{self.base_port + lane}{scope['path']}"
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+        headers = {
+            k.decode("latin-1"): v.decode("latin-1")
+            for k, v in scope["headers"]
+            if k.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS
+        }
+        body = await self._read_body(receive)
+
+        try:
+            async with self._client.request(
+                scope["method"], url, headers=headers, data=body, allow_redirects=False
+            ) as upstream:
+                status = upstream.status
+                response_headers = [
+                    (k.encode("latin-1"), v.encode("latin-1"))
+                    for k, v in upstream.headers.items()
+                    if k.lower() not in HOP_BY_HOP_HEADERS
+                ]
+                content = await upstream.read()
+        except aiohttp.ClientError as e:
+            # 세션을 가진 워커가 이미 종료된 경우
+            logger.error("SSE 메시지 전달 실패 - lane: %d, %s", lane, str(e))
+            status, response_headers, content = 404, [], b"Could not find session"
+
+        response_headers.append((b"content-length", str(len(content)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": content})
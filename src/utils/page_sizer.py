@@ -0,0 +1,114 @@
+import os
+from typing import Dict, Optional, Tuple
+
+# 업스트림 페이지 하나의 목표 응답 시간 (초)
+ADAPTIVE_TARGET_LATENCY = float(os.getenv("ADAPTIVE_TARGET_LATENCY", 2.0))
+# 업스트림 페이지 하나의 최대 응답 크기 (bytes)
+ADAPTIVE_MAX_BYTES = int(os.getenv("ADAPTIVE_MAX_BYTES", 4 * 1024 * 1024))
+# 관측값이 없을 때 요청 limit 에 곱하는 배수
+ADAPTIVE_INITIAL_FACTOR = int(os.getenv("ADAPTIVE_INITIAL_FACTOR", 8))
+# Adobe 리포트 API 의 settings.limit 최대값
+MAX_UPSTREAM_LIMIT = 50000
+# 지수 이동 평균 가중치
+EWMA_ALPHA = 0.3
+
+
+class PageStats:
+    """(rsid, dimension) 별 응답 시간 모델 elapsed = overhead + seconds_per_row * rows 와 행당 크기
+
+    요청마다 고정으로 드는 시간(인증, 큐 대기, 리포트 준비)을 행당 시간에 섞으면 작은 페이지에서
+    행당 시간이 크게 잡혀 페이지를 키우지 못하므로, 지수 가중 최소제곱으로 절편과 기울기를 함께 추정합니다.
+    관측한 행 수가 모두 같아 기울기를 구할 수 없으면 절편 없이 elapsed / rows 를 사용합니다.
+    """
+
+    __slots__ = ("rows", "elapsed", "rows_sq", "rows_elapsed", "bytes_per_row", "samples")
+
+    def __init__(self):
+        # 행 수 / 응답 시간 / 행 수 제곱 / 행 수 x 응답 시간 의 지수 이동 평균
+        self.rows: Optional[float] = None
+        self.elapsed: Optional[float] = None
+        self.rows_sq: Optional[float] = None
+        self.rows_elapsed: Optional[float] = None
+        self.bytes_per_row: Optional[float] = None
+        self.samples = 0
+
+    def observe(self, rows: int, elapsed: float, size: int) -> None:
+        rows = max(rows, 1)
+        self.rows = _ewma(self.rows, rows)
+        self.elapsed = _ewma(self.elapsed, elapsed)
+        self.rows_sq = _ewma(self.rows_sq, rows * rows)
+        self.rows_elapsed = _ewma(self.rows_elapsed, rows * elapsed)
+        self.bytes_per_row = _ewma(self.bytes_per_row, size / rows)
+        self.samples += 1
+
+    def latency_model(self) -> Optional[Tuple[float, float]]:
+        """(overhead 초, 행당 초). 관측값이 없으면 None"""
+        if not self.samples:
+            return None
+        variance = self.rows_sq - self.rows * self.rows
+        if variance > 1e-9 * self.rows_sq:
+            slope = (self.rows_elapsed - self.rows * self.elapsed) / variance
+            overhead = self.elapsed - slope * self.rows
+            if slope > 0 and overhead >= 0:
+                return overhead, slope
+        return 0.0, self.elapsed / self.rows
+
+
+def _ewma(previous: Optional[float], value: float) -> float:
+    if previous is None:
+        return value
+    return previous + EWMA_ALPHA * (value - previous)
+
+
+class AdaptivePageSizer:
+    """최근 응답 시간과 행당 크기를 보고 업스트림 settings.limit 을 정합니다.
+
+    업스트림 limit 은 항상 호출자 limit 의 2의 거듭제곱 배수로 정해지므로
+    호출자가 요청한 페이지는 하나의 업스트림 페이지 안에 들어가고,
+    같은 업스트림 페이지는 리포트 캐시에서 재사용됩니다.
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], PageStats] = {}
+
+    def choose(self, key: Tuple[str, str], limit: int) -> int:
+        """호출자 limit 에 대한 업스트림 limit 을 반환합니다."""
+        stats = self._stats.get(key)
+        if stats is None or not stats.samples:
+            target_rows = limit * ADAPTIVE_INITIAL_FACTOR
+        else:
+            target_rows = MAX_UPSTREAM_LIMIT
+            overhead, seconds_per_row = stats.latency_model()
+            # 고정 시간만으로 목표를 넘으면 페이지를 키워 요청 수를 줄이는 편이 낫다
+            if seconds_per_row and overhead < ADAPTIVE_TARGET_LATENCY:
+                target_rows = min(
+                    target_rows, (ADAPTIVE_TARGET_LATENCY - overhead) / seconds_per_row
+                )
+            if stats.bytes_per_row:
+                target_rows = min(target_rows, ADAPTIVE_MAX_BYTES / stats.bytes_per_row)
+
+        upstream_limit = limit
+        while (
+            upstream_limit * 2 <= target_rows
+            and upstream_limit * 2 <= MAX_UPSTREAM_LIMIT
+        ):
+            upstream_limit *= 2
+        return upstream_limit
+
+    def observe(self, key: Tuple[str, str], rows: int, elapsed: float, size: int) -> None:
+        self._stats.setdefault(key, PageStats()).observe(rows, elapsed, size)
+
+    def snapshot(self) -> Dict[str, dict]:
+        snapshot = {}
+        for (rsid, dimension), stats in self._stats.items():
+            overhead, seconds_per_row = stats.latency_model() or (None, None)
+            snapshot[f"{rsid}/{dimension}"] = {
+                "overhead_seconds": overhead,
+                "seconds_per_row": seconds_per_row,
+                "bytes_per_row": stats.bytes_per_row,
+                "samples": stats.samples,
+            }
+        return snapshot
+
+
+page_sizer = AdaptivePageSizer()
@@ -0,0 +1,347 @@
+"""
+실행 중인 도구 호출의 CPU / 메모리 프로파일링
+
+관리자가 configure_profiling 도구로 "다음 N 번의 호출" 또는 "도구 이름 / 파라미터가
+일치하는 호출" 을 지정하면, 해당 호출에 대해서만 다음을 수집합니다.
+
+- CPU: 별도 스레드가 PROFILING_SAMPLE_INTERVAL 마다 이벤트 루프 스레드의 스택을 샘플링
+  (이벤트 루프가 select 에서 대기 중인 샘플은 idle 로 따로 집계)
+- 메모리: tracemalloc 으로 단계별 메모리 증감 / 최대치, 단계별 상위 할당 위치
+
+단계(phase):
+- validation: 호출 시작부터 첫 업스트림 요청 전까지
+- upstream: Adobe API 요청 / 응답 수신 (utils.adobe_client)
+- decode: 응답 JSON 파싱
+- processing: 업스트림 응답 이후 도구 내부 처리
+- serialization: MCP 응답 JSON 직렬화
+
+결과는 PROFILE_DIR 에 요약 JSON(<이름>.json) 과 flamegraph 용 collapsed stack
+(<이름>.folded) 으로 저장됩니다. 동시에 실행 중인 다른 호출의 스택이 섞일 수 있으며,
+요약의 concurrent_calls 로 확인할 수 있습니다. json.loads 처럼 GIL 을 잡고 실행되는 C 코드
+구간은 샘플이 거의 잡히지 않으므로 wall_ms 와 함께 보아야 합니다.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pydantic_core
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILING_SAMPLE_INTERVAL = float(os.getenv("PROFILING_SAMPLE_INTERVAL", 0.005))
+# tracemalloc 이 저장하는 스택 깊이
+PROFILING_TRACEMALLOC_FRAMES = int(os.getenv("PROFILING_TRACEMALLOC_FRAMES", 1))
+# 요약에 포함하는 상위 항목 수
+TOP_N = 15
+MAX_STACK_DEPTH = 64
+
+_current_call: contextvars.ContextVar[Optional["ProfiledCall"]] = contextvars.ContextVar(
+    "profiled_call", default=None
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+def _is_idle(frame) -> bool:
+    """이벤트 루프가 I/O 를 기다리는 중인지 (selector.select)"""
+    code = frame.f_code
+    return code.co_name in ("select", "poll", "control") and "selectors" in code.co_filename
+
+
+class ProfiledCall:
+    """프로파일링 중인 도구 호출 하나"""
+
+    def __init__(self, tool: str, params: Any, loop_thread_id: int, concurrent: int):
+        self.tool = tool
+        self.params = params
+        self.loop_thread_id = loop_thread_id
+        self.concurrent_calls = concurrent
+        self.phase = "validation"
+        self.started = time.perf_counter()
+        self._phase_started = self.started
+        self.wall: Dict[str, float] = defaultdict(float)
+        self.samples: Dict[str, Counter] = defaultdict(Counter)
+        self.idle_samples: Counter = Counter()
+        self.memory: Dict[str, dict] = defaultdict(lambda: {"delta": 0, "peak": 0})
+        self._memory_at_switch = tracemalloc.get_traced_memory()[0]
+        self._snapshots: Dict[str, list] = {}
+        self._switching = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+    # ------------------------------------------------------------------
+    # 단계 전환
+    # ------------------------------------------------------------------
+
+    def switch(self, phase: str) -> str:
+        """현재 단계를 phase 로 바꾸고 이전 단계를 반환합니다. 시간 / 메모리는 배타적으로 집계됩니다."""
+        now = time.perf_counter()
+        self._switching = True
+        current, peak = tracemalloc.get_traced_memory()
+        previous = self.phase
+        self.wall[previous] += now - self._phase_started
+        memory = self.memory[previous]
+        memory["delta"] += current - self._memory_at_switch
+        memory["peak"] = max(memory["peak"], peak - self._memory_at_switch)
+
+        # 단계별 상위 할당 위치: 각 단계의 첫 진입 / 이탈 시점 스냅샷 비교
+        if previous in self._snapshots and len(self._snapshots[previous]) == 1:
+            self._snapshots[previous].append(self._snapshot())
+        if phase not in self._snapshots:
+            self._snapshots[phase] = [self._snapshot()]
+
+        self.phase = phase
+        # 스냅샷에 걸린 시간 / 메모리는 어느 단계에도 넣지 않음
+        self._phase_started = time.perf_counter()
+        self._memory_at_switch = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self._switching = False
+        return previous
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot()
+
+    # ------------------------------------------------------------------
+    # CPU 샘플링
+    # ------------------------------------------------------------------
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(PROFILING_SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None or self._switching:
+                continue
+            if _is_idle(frame):
+                self.idle_samples[self.phase] += 1
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[self.phase][tuple(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._snapshots["validation"] = [self._snapshot()]
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.switch("done")
+        self._stop.set()
+        self._thread.join()
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+
+    def _top_allocations(self, phase: str) -> List[dict]:
+        snapshots = self._snapshots.get(phase, [])
+        if len(snapshots) < 2:
+            return []
+        stats = [
+            s
+            for s in snapshots[1].compare_to(snapshots[0], "lineno")
+            if s.size_diff > 0 and s.traceback[0].filename not in (tracemalloc.__file__, __file__)
+        ]
+        return [
+            {
+                "location": f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                "size_kb": round(s.size_diff / 1024, 1),
+                "count": s.count_diff,
+            }
+            for s in stats[:TOP_N]
+        ]
+
+    @staticmethod
+    def _top_frames(samples: Counter) -> List[dict]:
+        self_counts: Counter = Counter()
+        inclusive_counts: Counter = Counter()
+        for stack, count in samples.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                inclusive_counts[label] += count
+        total = sum(samples.values()) or 1
+        return [
+            {
+                "frame": label,
+                "self_pct": round(count / total * 100, 1),
+                "inclusive_pct": round(inclusive_counts[label] / total * 100, 1),
+            }
+            for label, count in self_counts.most_common(TOP_N)
+        ]
+
+    def summary(self) -> dict:
+        phases = {}
+        for phase in self.wall:
+            if phase == "done":
+                continue
+            samples = self.samples.get(phase, Counter())
+            phases[phase] = {
+                "wall_ms": round(self.wall[phase] * 1000, 2),
+                "cpu_samples": sum(samples.values()),
+                "idle_samples": self.idle_samples.get(phase, 0),
+                "memory_delta_kb": round(self.memory[phase]["delta"] / 1024, 1),
+                "memory_peak_kb": round(self.memory[phase]["peak"] / 1024, 1),
+                "top_frames": self._top_frames(samples),
+                "top_allocations": self._top_allocations(phase),
+            }
+        return {
+            "tool": self.tool,
+            "params": self.params,
+            "wall_ms": round(sum(self.wall.values()) * 1000, 2),
+            "sample_interval_ms": PROFILING_SAMPLE_INTERVAL * 1000,
+            "concurrent_calls": self.concurrent_calls,
+            "phases": phases,
+        }
+
+    def folded(self) -> str:
+        """phase 를 루트 프레임으로 하는 collapsed stack (flamegraph.pl / speedscope 입력)"""
+        lines = []
+        for phase, samples in self.samples.items():
+            for stack, count in samples.items():
+                lines.append(f"{phase};{';'.join(stack)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class Profiler:
+    """프로파일링 대상 호출 선택 규칙과 결과 파일 관리"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.remaining = 0
+        self.tool: Optional[str] = None
+        self.match: Dict[str, Any] = {}
+        self.active = 0
+        self.written: List[str] = []
+        self._sequence = 0
+        self._started_tracemalloc = False
+
+    def arm(self, count: int, tool: Optional[str] = None, match: Optional[dict] = None) -> None:
+        self.remaining = max(0, count)
+        self.tool = tool
+        self.match = match or {}
+
+    def disarm(self) -> None:
+        self.remaining = 0
+        self.tool = None
+        self.match = {}
+        self._maybe_stop_tracemalloc()
+
+    def status(self) -> dict:
+        return {
+            "remaining": self.remaining,
+            "tool": self.tool,
+            "match": self.match,
+            "active": self.active,
+            "directory": os.path.abspath(self.directory),
+            "recent_profiles": self.written[-10:],
+        }
+
+    def _matches(self, tool: str, params: Any) -> bool:
+        if self.remaining <= 0:
+            return False
+        if self.tool and tool != self.tool:
+            return False
+        params = params if isinstance(params, dict) else {}
+        for key, expected in self.match.items():
+            actual = params.get(key)
+            if isinstance(actual, list):
+                if expected not in actual and expected != actual:
+                    return False
+            elif str(actual) != str(expected):
+                return False
+        return True
+
+    def _maybe_stop_tracemalloc(self) -> None:
+        if self._started_tracemalloc and not self.active and self.remaining <= 0:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _write(self, call: ProfiledCall) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{call.tool}-{self._sequence}"
+        base = os.path.join(self.directory, name)
+        with open(f"{base}.json", "w") as f:
+            json.dump(call.summary(), f, ensure_ascii=False, indent=2, default=str)
+        with open(f"{base}.folded", "w") as f:
+            f.write(call.folded())
+        self.written.append(f"{base}.json")
+        return f"{base}.json"
+
+    def profiled(self, tool: str) -> Callable:
+        """도구 핸들러 데코레이터. 선택 규칙에 맞는 호출만 프로파일링합니다."""
+
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                params = kwargs.get("params", args[0] if args else None)
+                if not self._matches(tool, params):
+                    return await fn(*args, **kwargs)
+
+                self.remaining -= 1
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+                    self._started_tracemalloc = True
+                self.active += 1
+                call = ProfiledCall(
+                    tool,
+                    dict(params) if isinstance(params, dict) else params,
+                    threading.get_ident(),
+                    self.active,
+                )
+                token = _current_call.set(call)
+                call.start()
+                try:
+                    result = await fn(*args, **kwargs)
+                    # FastMCP 가 응답을 만들 때와 같은 방식으로 직렬화 시간을 측정
+                    call.switch("serialization")
+                    pydantic_core.to_json(result, fallback=str, indent=2)
+                    return result
+                finally:
+                    call.stop()
+                    _current_call.reset(token)
+                    self.active -= 1
+                    try:
+                        path = self._write(call)
+                        logger.error("프로파일 저장: %s", path)
+                    except OSError as e:
+                        logger.error("프로파일 저장 실패: %s", str(e))
+                    self._maybe_stop_tracemalloc()
+
+            return wrapper
+
+        return decorator
+
+
+@contextmanager
+def profile_phase(phase: str):
+    """프로파일링 중인 호출이면 블록 동안 단계를 phase 로 표시합니다. 아니면 아무 일도 하지 않습니다."""
+    call = _current_call.get()
+    # 헤징 등으로 같은 단계가 겹쳐 실행되면 바깥쪽 블록만 전환
+    if call is None or call.phase == phase:
+        yield
+        return
+    previous = call.switch(phase)
+    try:
+        yield
+    finally:
+        # 첫 업스트림 요청 이후의 처리는 validation 이 아닌 processing 으로 집계
+        call.switch("processing" if previous == "validation" else previous)
+
+
+profiler = Profiler(PROFILE_DIR)
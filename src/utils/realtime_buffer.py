@@ -0,0 +1,188 @@
+"""
+실시간 리포트 분 단위 링 버퍼
+
+(rsid, metric, 차원 목록, 차원 항목) 시계열마다 분 단위 슬롯 배열을 유지합니다.
+차원 없이 조회한 전체 값은 차원 목록 "total", 차원 항목 () 으로 기록합니다.
+지표를 항목끼리 더하지 않으므로 visitors 처럼 합산할 수 없는 지표도 항목별로 그대로 보관됩니다.
+슬롯 위치는 epoch 분 % 용량 이며, 슬롯에 기록된 분(stamp)과 조회하려는 분이
+다르면 비어 있는 것으로 간주합니다. 같은 분이 여러 응답에 걸쳐 다시 오면
+마지막 응답 값으로 덮어씁니다 (실시간 리포트는 진행 중인 분의 값이 계속 늘어남).
+
+메모리 사용량은 REALTIME_BUFFER_MAX_BYTES 로 제한되며, 초과하면 가장 오래
+사용하지 않은 시계열부터 제거합니다.
+"""
+
+import datetime
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pytz
+
+# 시계열 하나가 보관하는 분 수 (기본 24시간)
+REALTIME_BUFFER_MINUTES = int(os.getenv("REALTIME_BUFFER_MINUTES", 24 * 60))
+# 전체 링 버퍼 메모리 상한 (bytes)
+REALTIME_BUFFER_MAX_BYTES = int(os.getenv("REALTIME_BUFFER_MAX_BYTES", 32 * 1024 * 1024))
+
+# 조회 단위별 분 수
+GRANULARITY_MINUTES = {"minute": 1, "5minute": 5, "hour": 60}
+
+# (rsid, metric, 차원 목록, 차원 항목 값들)
+SeriesKey = Tuple[str, str, str, Tuple[str, ...]]
+
+
+class MinuteSeries:
+    """분 단위 값 / 기록된 분을 담는 고정 크기 배열 한 쌍"""
+
+    __slots__ = ("values", "stamps")
+
+    def __init__(self, capacity: int):
+        self.values = np.zeros(capacity, dtype=np.float64)
+        # 슬롯에 기록된 epoch 분. -1 이면 비어 있음
+        self.stamps = np.full(capacity, -1, dtype=np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.stamps.nbytes
+
+    def write(self, minutes: np.ndarray, values: np.ndarray) -> None:
+        slots = minutes % len(self.stamps)
+        # 링을 한 바퀴 넘는 오래된 분이 최신 분을 덮어쓰지 않도록 함
+        newer = minutes >= self.stamps[slots]
+        self.values[slots[newer]] = values[newer]
+        self.stamps[slots[newer]] = minutes[newer]
+
+    def read(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, end) 분 범위의 값과 채워짐 여부를 반환합니다."""
+        minutes = np.arange(start, end, dtype=np.int64)
+        slots = minutes % len(self.stamps)
+        filled = self.stamps[slots] == minutes
+        return np.where(filled, self.values[slots], 0.0), filled
+
+
+class RealtimeRingBuffer:
+    """(rsid, metric, 차원 목록, 차원 항목) 별 분 단위 링 버퍼"""
+
+    def __init__(self, minutes: int, max_bytes: int):
+        self.capacity = max(minutes, 60)
+        series_bytes = MinuteSeries(1).nbytes * self.capacity
+        self.max_series = max(1, max_bytes // series_bytes)
+        self.max_bytes = max_bytes
+        self._series: "OrderedDict[SeriesKey, MinuteSeries]" = OrderedDict()
+        self.evictions = 0
+        self.points_written = 0
+
+    def _get(self, key: SeriesKey, create: bool) -> Optional[MinuteSeries]:
+        series = self._series.get(key)
+        if series is not None:
+            self._series.move_to_end(key)
+            return series
+        if not create:
+            return None
+        while len(self._series) >= self.max_series:
+            self._series.popitem(last=False)
+            self.evictions += 1
+        series = self._series[key] = MinuteSeries(self.capacity)
+        return series
+
+    def write(self, key: SeriesKey, points: Dict[int, float]) -> None:
+        """{epoch 분: 값} 을 기록합니다. 이미 있는 분은 덮어씁니다."""
+        if not points:
+            return
+        minutes = np.fromiter(points.keys(), dtype=np.int64, count=len(points))
+        values = np.fromiter(points.values(), dtype=np.float64, count=len(points))
+        self._get(key, create=True).write(minutes, values)
+        self.points_written += len(points)
+
+    def query(
+        self, key: SeriesKey, hours: float, granularity: str, now: Optional[float] = None
+    ) -> List[dict]:
+        """최근 hours 시간을 granularity 단위로 합산해 반환합니다."""
+        step = GRANULARITY_MINUTES[granularity]
+        now_minute = int((now if now is not None else time.time()) // 60)
+        # 마지막 구간이 현재 분을 포함하도록 구간 경계를 step 에 맞춤
+        end = (now_minute // step + 1) * step
+        span = min(int(hours * 60), self.capacity)
+        start = end - max(step, (span + step - 1) // step * step)
+
+        series = self._get(key, create=False)
+        if series is None:
+            return []
+        values, filled = series.read(start, end)
+        sums = values.reshape(-1, step).sum(axis=1)
+        counts = filled.reshape(-1, step).sum(axis=1)
+
+        points = []
+        for i in np.nonzero(counts)[0]:
+            bucket = start + int(i) * step
+            points.append(
+                {
+                    "time": datetime.datetime.fromtimestamp(
+                        bucket * 60, datetime.timezone.utc
+                    ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "value": float(sums[i]),
+                    "minutes": int(counts[i]),
+                }
+            )
+        return points
+
+    def keys(self, rsid: Optional[str] = None) -> Iterable[SeriesKey]:
+        return [key for key in self._series if rsid is None or key[0] == rsid]
+
+    def stats(self) -> dict:
+        series_bytes = sum(series.nbytes for series in self._series.values())
+        return {
+            "series": len(self._series),
+            "max_series": self.max_series,
+            "minutes_per_series": self.capacity,
+            "bytes": series_bytes,
+            "max_bytes": self.max_bytes,
+            "points_written": self.points_written,
+            "evictions": self.evictions,
+        }
+
+
+def row_dimensions(row: dict) -> Tuple[List[str], List[str]]:
+    """실시간 리포트 행의 차원별 itemId / value 목록. 첫 번째는 daterangeminute 입니다."""
+    if "itemIds" in row:
+        item_ids = [str(item_id) for item_id in row.get("itemIds") or []]
+        values = [str(value) for value in row.get("values") or []]
+        return item_ids, values + [""] * (len(item_ids) - len(values))
+    return [str(row.get("itemId", ""))], [str(row.get("value", ""))]
+
+
+def parse_minute(item_id: str, value: str, tz: datetime.tzinfo = pytz.UTC) -> Optional[int]:
+    """daterangeminute 항목의 itemId / value 에서 epoch 분을 구합니다.
+
+    daterangeminute itemId 형식은 "1YYMMDDHHmm" (1YY = 연도 - 1900, MM 은 0 부터 시작) 이며
+    리포트 스위트 시간대(tz, pytz 시간대)의 현지 시각입니다.
+    """
+    moment = None
+    try:
+        if len(item_id) == 11 and item_id.isdigit():
+            moment = datetime.datetime(
+                1900 + int(item_id[0:3]),
+                int(item_id[3:5]) + 1,
+                int(item_id[5:7]),
+                int(item_id[7:9]),
+                int(item_id[9:11]),
+            )
+    except ValueError:
+        pass
+
+    if moment is None:
+        for fmt in ("%H:%M %Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M"):
+            try:
+                moment = datetime.datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+
+    return int(tz.localize(moment).timestamp() // 60)
+
+
+realtime_buffer = RealtimeRingBuffer(REALTIME_BUFFER_MINUTES, REALTIME_BUFFER_MAX_BYTES)
@@ -0,0 +1,176 @@
+"""
+리포트 행을 로컬 파일(CSV / NDJSON / Parquet)로 내보내는 writer
+
+행은 페이지 단위로 받아 바로 파일에 쓰고 메모리에 쌓지 않습니다.
+쓰는 동안에는 호출마다 다른 "<파일>.<임의값>.part" 에 기록하고, 완료되면 최종 이름으로 연결합니다.
+이미 있는 파일은 덮어쓰지 않습니다.
+Parquet 는 pyarrow 가 설치된 경우에만 사용할 수 있습니다.
+"""
+
+import csv
+import json
+import os
+import re
+import uuid
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "./exports")
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "parquet": "parquet"}
+PREVIEW_ROWS = 5
+
+
+def export_path(file_name: str, export_format: str) -> str:
+    """EXPORT_DIR 안의 내보내기 파일 경로. 파일 이름에는 경로 구분자를 쓸 수 없습니다."""
+    if not re.fullmatch(r"[\w.\-]+", file_name) or file_name.startswith("."):
+        raise ValueError(f"사용할 수 없는 파일 이름입니다: {file_name}")
+    extension = EXTENSIONS[export_format]
+    if not file_name.endswith(f".{extension}"):
+        file_name = f"{file_name}.{extension}"
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    return os.path.join(os.path.realpath(EXPORT_DIR), file_name)
+
+
+class ReportWriter:
+    """리포트 행(itemId, value, data[])을 열 단위 레코드로 기록하는 writer 기본 클래스"""
+
+    def __init__(self, path: str, dimension: str, metrics: List[str]):
+        self.path = path
+        # 같은 이름으로 동시에 내보내도 임시 파일이 겹치지 않도록 호출마다 다른 이름 사용
+        self.part_path = f"{path}.{uuid.uuid4().hex[:12]}.part"
+        self.dimension = dimension
+        self.metrics = metrics
+        self.columns = ["itemId", dimension] + metrics
+        self.row_count = 0
+        self.preview: List[Dict[str, Any]] = []
+
+    def schema(self) -> List[dict]:
+        return [
+            {"name": "itemId", "type": "string"},
+            {"name": self.dimension, "type": "string"},
+        ] + [{"name": metric, "type": "number"} for metric in self.metrics]
+
+    def record(self, row: dict) -> Dict[str, Any]:
+        data = row.get("data", [])
+        record = {"itemId": row.get("itemId"), self.dimension: row.get("value")}
+        for i, metric in enumerate(self.metrics):
+            record[metric] = data[i] if i < len(data) else None
+        return record
+
+    def write_rows(self, rows: List[dict]) -> None:
+        """한 페이지의 행을 기록합니다 (이벤트 루프 밖의 스레드에서 호출)."""
+        records = [self.record(row) for row in rows]
+        if len(self.preview) < PREVIEW_ROWS:
+            self.preview.extend(records[: PREVIEW_ROWS - len(self.preview)])
+        self._write(records)
+        self.row_count += len(records)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+    def commit(self, unique: bool = False) -> int:
+        """파일을 닫고 최종 이름으로 연결한 뒤 파일 크기를 반환합니다.
+
+        최종 이름은 os.link 로 원자적으로 차지하므로 이미 있는 파일을 덮어쓰지 않습니다.
+        같은 이름이 있으면 unique 일 때 "-1", "-2" ... 를 붙이고, 아니면 ValueError 를 발생시킵니다.
+        """
+        self._close()
+        base, extension = os.path.splitext(self.path)
+        candidate, suffix = self.path, 0
+        try:
+            while True:
+                try:
+                    os.link(self.part_path, candidate)
+                    break
+                except FileExistsError:
+                    if not unique:
+                        raise ValueError(f"이미 있는 파일입니다: {os.path.basename(candidate)}")
+                    suffix += 1
+                    candidate = f"{base}-{suffix}{extension}"
+        finally:
+            os.remove(self.part_path)
+        self.path = candidate
+        return os.path.getsize(self.path)
+
+    def abort(self) -> None:
+        """실패한 내보내기의 임시 파일을 지웁니다."""
+        try:
+            self._close()
+        finally:
+            if os.path.exists(self.part_path):
+                os.remove(self.part_path)
+
+
+class CsvReportWriter(ReportWriter):
+    def __init__(self, path: str, dimension: str, metrics: List[str]):
+        super().__init__(path, dimension, metrics)
+        self._file = open(self.part_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+        self._writer.writeheader()
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(records)
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class NdjsonReportWriter(ReportWriter):
+    def __init__(self, path: str, dimension: str, metrics: List[str]):
+        super().__init__(path, dimension, metrics)
+        self._file = open(self.part_path, "w", encoding="utf-8")
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.writelines(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ParquetReportWriter(ReportWriter):
+    """페이지마다 row group 하나를 기록합니다."""
+
+    def __init__(self, path: str, dimension: str, metrics: List[str]):
+        super().__init__(path, dimension, metrics)
+        self._schema = pa.schema(
+            [pa.field("itemId", pa.string()), pa.field(dimension, pa.string())]
+            + [pa.field(metric, pa.float64()) for metric in metrics]
+        )
+        self._writer: Optional[pq.ParquetWriter] = pq.ParquetWriter(self.part_path, self._schema)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        if records:
+            self._writer.write_table(pa.Table.from_pylist(records, schema=self._schema))
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def open_report_writer(
+    export_format: str, path: str, dimension: str, metrics: List[str]
+) -> ReportWriter:
+    """형식에 맞는 writer 를 엽니다."""
+    if export_format == "csv":
+        return CsvReportWriter(path, dimension, metrics)
+    if export_format == "ndjson":
+        return NdjsonReportWriter(path, dimension, metrics)
+    if export_format == "parquet":
+        if not HAS_PYARROW:
+            raise ValueError("parquet 형식을 사용하려면 pyarrow 를 설치해야 합니다.")
+        return ParquetReportWriter(path, dimension, metrics)
+    raise ValueError(f"지원하지 않는 형식입니다: {export_format} (csv, ndjson, parquet)")
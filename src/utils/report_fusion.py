@@ -0,0 +1,264 @@
+"""
+지표 목록만 다른 동시 리포트 요청 병합 (request fusion)
+
+같은 rsid / 기간 / 차원 / 필터 / 정렬 지표로 지표 목록만 다른 요청이 동시에 들어오면,
+지표 합집합을 metricContainer 에 담은 업스트림 요청 하나로 실행하고
+응답을 호출자별 지표 순서(columnId)로 다시 나눠 돌려줍니다.
+
+- 같은 모양의 요청이 실행 중이 아니면 기다리지 않고 바로 실행합니다. 실행 중일 때 들어온
+  요청만 REPORT_FUSION_WINDOW 초 동안 모아서 병합합니다 (혼자인 요청에 지연 없음).
+- 병합된 요청이 실패하면 각 요청을 원래 본문으로 따로 다시 실행해 요청별 결과/오류를 돌려줍니다.
+
+- 행 정렬은 첫 번째 지표 기준이므로 첫 번째 지표가 같은 요청끼리만 병합합니다.
+- metricFilters 처럼 columnId 를 참조하는 설정이 있는 요청은 병합하지 않습니다.
+- 한 요청의 지표 수가 REPORT_FUSION_MAX_METRICS 를 넘으면 새 배치를 시작합니다.
+- 혼자인 요청은 원래 요청 본문 그대로 호출자 세션으로 실행합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+REPORT_FUSION_ENABLED = os.getenv("REPORT_FUSION_ENABLED", "true").lower() == "true"
+# 첫 요청 이후 같은 모양의 요청을 기다리는 시간 (초)
+REPORT_FUSION_WINDOW = float(os.getenv("REPORT_FUSION_WINDOW", 0.01))
+# 병합된 요청 하나에 담을 최대 지표 수
+REPORT_FUSION_MAX_METRICS = int(os.getenv("REPORT_FUSION_MAX_METRICS", 30))
+
+Sender = Callable[[aiohttp.ClientSession, dict, Optional[dict]], Awaitable[dict]]
+
+
+def _metric_key(metric: dict) -> str:
+    """columnId 를 뺀 지표 정의 (같은 지표인지 비교용)"""
+    return json.dumps({k: v for k, v in metric.items() if k != "columnId"}, sort_keys=True)
+
+
+def fusion_key(request_body: dict) -> Optional[str]:
+    """지표 목록을 제외한 요청 모양. 병합할 수 없는 요청이면 None 입니다."""
+    container = request_body.get("metricContainer", {})
+    metrics = container.get("metrics", [])
+    if not metrics or set(container) - {"metrics"}:
+        return None
+    shape = {k: v for k, v in request_body.items() if k != "metricContainer"}
+    shape["sortMetric"] = _metric_key(metrics[0])
+    return json.dumps(shape, sort_keys=True)
+
+
+def split_report(result: dict, width: int, indices: List[int], column_ids: List[str]) -> dict:
+    """병합된 응답(지표 width 개)에서 한 호출자의 지표 열만 골라 호출자의 columnId 순서로 만듭니다."""
+    union_ids = result.get("columns", {}).get("columnIds") or [str(i) for i in range(width)]
+    id_map = {union_ids[i]: column_id for i, column_id in zip(indices, column_ids)}
+
+    def pick(values: Any) -> Any:
+        if isinstance(values, list) and len(values) == width:
+            return [values[i] for i in indices]
+        return values
+
+    columns = dict(result.get("columns", {}))
+    columns["columnIds"] = list(column_ids)
+    if "columnErrors" in columns:
+        columns["columnErrors"] = [
+            {**error, "columnId": id_map[error["columnId"]]}
+            for error in columns["columnErrors"]
+            if error.get("columnId") in id_map
+        ]
+
+    return {
+        **result,
+        "columns": columns,
+        "rows": [{**row, "data": pick(row.get("data", []))} for row in result.get("rows", [])],
+        "summaryData": {
+            name: pick(values) for name, values in result.get("summaryData", {}).items()
+        },
+    }
+
+
+class _Member:
+    def __init__(self, session, request_body: dict, meta: Optional[dict]):
+        self.session = session
+        self.request_body = request_body
+        self.meta = meta
+        self.metrics = request_body["metricContainer"]["metrics"]
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class _Batch:
+    def __init__(self):
+        self.members: List[_Member] = []
+        self.metric_index: Dict[str, int] = {}
+        self.metrics: List[dict] = []
+        self.flushed = False
+
+    def would_fit(self, metrics: List[dict]) -> bool:
+        new = {_metric_key(m) for m in metrics} - set(self.metric_index)
+        return len(self.metrics) + len(new) <= REPORT_FUSION_MAX_METRICS
+
+    def add(self, member: _Member) -> None:
+        self.members.append(member)
+        for metric in member.metrics:
+            key = _metric_key(metric)
+            if key not in self.metric_index:
+                self.metric_index[key] = len(self.metrics)
+                self.metrics.append(metric)
+
+
+class ReportFuser:
+    """배치 창 동안 같은 모양의 리포트 요청을 모아 업스트림 요청 하나로 실행"""
+
+    def __init__(self, window: float, enabled: bool):
+        self.window = window
+        self.enabled = enabled and window > 0
+        self._pending: Dict[str, _Batch] = {}
+        # 모양별로 업스트림에서 실행 중인 요청/배치 수
+        self._inflight: Dict[str, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.upstream_requests = 0
+        self.fused_batches = 0
+        self.fused_requests = 0
+
+    async def submit(
+        self,
+        session: aiohttp.ClientSession,
+        request_body: dict,
+        meta: Optional[dict],
+        send: Sender,
+    ) -> dict:
+        """리포트 요청을 배치에 넣고 (병합되었다면 나눠진) 응답을 기다립니다."""
+        self.requests += 1
+        key = fusion_key(request_body) if self.enabled else None
+        if key is None:
+            self.upstream_requests += 1
+            return await send(session, request_body, meta)
+
+        batch = self._pending.get(key)
+        if batch is None and not self._inflight.get(key):
+            # 같은 모양의 요청이 없으면 배치 창을 기다리지 않고 바로 실행
+            self.upstream_requests += 1
+            self._enter(key)
+            try:
+                return await send(session, request_body, meta)
+            finally:
+                self._leave(key)
+
+        if batch is not None and not batch.would_fit(request_body["metricContainer"]["metrics"]):
+            # 가득 찬 배치는 바로 실행하고 새 배치를 시작
+            self._flush(key, batch, send)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _Batch()
+            asyncio.get_running_loop().call_later(self.window, self._flush, key, batch, send)
+
+        member = _Member(session, request_body, meta)
+        batch.add(member)
+        return await member.future
+
+    def _flush(self, key: str, batch: _Batch, send: Sender) -> None:
+        # 가득 차서 먼저 실행된 배치에 타이머가 늦게 도착한 경우
+        if batch.flushed:
+            return
+        batch.flushed = True
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        self.upstream_requests += 1
+        self._enter(key)
+        task = asyncio.get_running_loop().create_task(self._run(key, batch, send))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _enter(self, key: str) -> None:
+        self._inflight[key] = self._inflight.get(key, 0) + 1
+
+    def _leave(self, key: str) -> None:
+        self._inflight[key] -= 1
+        if not self._inflight[key]:
+            del self._inflight[key]
+
+    async def _run_alone(self, member: _Member, send: Sender) -> None:
+        """한 호출자의 원래 요청 본문을 호출자 세션으로 실행합니다."""
+        try:
+            result = await send(member.session, member.request_body, member.meta)
+        except Exception as e:
+            if not member.future.done():
+                member.future.set_exception(e)
+        else:
+            if not member.future.done():
+                member.future.set_result(result)
+
+    async def _run(self, key: str, batch: _Batch, send: Sender) -> None:
+        members = batch.members
+        try:
+            if len(members) == 1:
+                await self._run_alone(members[0], send)
+                return
+
+            self.fused_batches += 1
+            self.fused_requests += len(members)
+            first = members[0].request_body
+            fused_body = {
+                **first,
+                "metricContainer": {
+                    "metrics": [
+                        {**metric, "columnId": str(i)} for i, metric in enumerate(batch.metrics)
+                    ]
+                },
+            }
+            meta: Dict[str, Any] = {}
+            try:
+                # 호출자 중 누가 먼저 끝나도 요청이 끊기지 않도록 배치 전용 세션 사용
+                async with aiohttp.ClientSession() as session:
+                    result = await send(session, fused_body, meta)
+            except Exception as e:
+                # 한 호출자의 지표 때문에 다른 호출자까지 실패하지 않도록 각자 다시 실행
+                logger.error(
+                    "병합 리포트 요청 실패 (%d개 요청), 개별 요청으로 다시 실행합니다: %s",
+                    len(members),
+                    str(e),
+                )
+                retry = [member for member in members if not member.future.done()]
+                self.upstream_requests += len(retry)
+                await asyncio.gather(*(self._run_alone(member, send) for member in retry))
+                return
+
+            for member in members:
+                if member.future.done():
+                    continue
+                try:
+                    indices = [batch.metric_index[_metric_key(m)] for m in member.metrics]
+                    column_ids = [m["columnId"] for m in member.metrics]
+                    split = split_report(result, len(batch.metrics), indices, column_ids)
+                except Exception as e:
+                    member.future.set_exception(e)
+                    continue
+                if member.meta is not None:
+                    member.meta.update(meta)
+                member.future.set_result(split)
+        finally:
+            self._leave(key)
+            # 취소 등으로 중단되어도 기다리는 호출자가 남지 않도록 정리
+            for member in members:
+                if not member.future.done():
+                    member.future.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "window": self.window,
+            "requests": self.requests,
+            "upstream_requests": self.upstream_requests,
+            "fused_batches": self.fused_batches,
+            "fused_requests": self.fused_requests,
+            "saved_upstream_requests": self.requests - self.upstream_requests,
+            "reduction": round(1 - self.upstream_requests / self.requests, 3)
+            if self.requests
+            else 0.0,
+        }
+
+
+report_fuser = ReportFuser(REPORT_FUSION_WINDOW, REPORT_FUSION_ENABLED)
@@ -0,0 +1,232 @@
+"""
+리포트 캐시 워머
+
+REPORT_WARMER_CONFIG 에 지정한 JSON 파일의 get_report 스펙을 cron 일정에 맞춰 미리 실행하고
+결과를 리포트 캐시에 저장합니다. 설정 예:
+
+    {
+        "specs": [
+            {
+                "name": "daily-visits",
+                "schedule": "30 7 * * 1-5",
+                "ttl": 10800,
+                "params": {"date_range": "yesterday", "metrics": ["visits"]}
+            }
+        ]
+    }
+
+실제 사용자 요청이 진행 중이면 (REPORT_WARMER_MAX_IN_FLIGHT 초과) 끝날 때까지 기다렸다가
+스펙을 하나씩 순서대로 실행하므로 실시간 트래픽보다 낮은 우선순위로 동작합니다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from auth.adobe_auth import AdobeAuth
+from tools.get_report import GetReportParams, GetReportTool, report_cache_key
+from utils.adobe_client import upstream_in_flight
+from utils.cache import report_cache
+
+logger = logging.getLogger(__name__)
+
+REPORT_WARMER_CONFIG = os.getenv("REPORT_WARMER_CONFIG")
+# 진행 중인 업스트림 요청이 이 값보다 많으면 워머가 대기
+REPORT_WARMER_MAX_IN_FLIGHT = int(os.getenv("REPORT_WARMER_MAX_IN_FLIGHT", 1))
+# 워머가 채운 캐시 항목의 기본 유지 시간 (초)
+REPORT_WARMER_TTL = float(os.getenv("REPORT_WARMER_TTL", 3 * 60 * 60))
+
+
+class CronSchedule:
+    """5 필드 cron 표현식 (분 시 일 월 요일). *, */n, a-b, a,b 형식을 지원합니다.
+
+    표준 cron 과 같이 일과 요일이 모두 "*" 로 시작하지 않으면 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    # 요일 7 은 일요일(0)과 같음
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"잘못된 cron 표현식: {expression}")
+        self.expression = expression
+        self.fields: List[Set[int]] = [
+            self._parse_field(part, low, high)
+            for part, (low, high) in zip(parts, self.RANGES)
+        ]
+        if 7 in self.fields[4]:
+            self.fields[4].add(0)
+        # 제한된 일 / 요일 필드 ("*" 또는 "*/n" 이 아닌 경우)
+        self.day_restricted = not parts[2].startswith("*")
+        self.weekday_restricted = not parts[4].startswith("*")
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        values: Set[int] = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/")
+                step = int(step_str)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-"))
+            else:
+                start = end = int(part)
+            if start < low or end > high:
+                raise ValueError(f"cron 값 범위 초과: {field}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, dt: datetime) -> bool:
+        minute, hour, day, month, weekday = self.fields
+        # datetime.weekday(): 월요일=0 / cron: 일요일=0
+        day_match = dt.day in day
+        weekday_match = (dt.weekday() + 1) % 7 in weekday
+        if self.day_restricted and self.weekday_restricted:
+            date_match = day_match or weekday_match
+        else:
+            date_match = day_match and weekday_match
+        return dt.minute in minute and dt.hour in hour and dt.month in month and date_match
+
+
+class WarmSpec:
+    """워머가 주기적으로 실행하는 get_report 스펙"""
+
+    def __init__(self, name: str, schedule: str, params: dict, ttl: Optional[float] = None):
+        self.name = name
+        self.schedule = CronSchedule(schedule)
+        self.params = params
+        self.ttl = ttl or REPORT_WARMER_TTL
+        self.runs = 0
+        self.errors = 0
+        self.last_run: Optional[str] = None
+        self.last_error: Optional[str] = None
+        # 마지막으로 확인한 분. 이전 확인 이후 지나간 분도 빠짐없이 확인
+        self._last_checked: Optional[datetime] = None
+
+    def due(self, now: datetime) -> bool:
+        """마지막 확인 이후 ~ 현재 분 사이에 실행할 분이 있었는지 확인합니다.
+
+        이전 워밍 실행이 길어져 지나간 분도 확인하므로 그동안 돌아온 일정은 건너뛰지 않고
+        한 번 실행됩니다 (최대 하루 전까지).
+        """
+        current = now.replace(second=0, microsecond=0)
+        if self._last_checked is not None and current <= self._last_checked:
+            return False
+        if self._last_checked is None:
+            minute = current
+        else:
+            minute = max(
+                self._last_checked + timedelta(minutes=1), current - timedelta(days=1)
+            )
+        self._last_checked = current
+        while minute <= current:
+            if self.schedule.matches(minute):
+                return True
+            minute += timedelta(minutes=1)
+        return False
+
+
+class ReportWarmer:
+    """cron 일정에 따라 리포트 캐시를 미리 채우는 백그라운드 작업"""
+
+    def __init__(self, specs: List[WarmSpec], poll_interval: float = 20.0):
+        self.specs = specs
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, path: str) -> "ReportWarmer":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        specs = [
+            WarmSpec(
+                name=spec["name"],
+                schedule=spec["schedule"],
+                params=spec["params"],
+                ttl=spec.get("ttl"),
+            )
+            for spec in config.get("specs", [])
+        ]
+        return cls(specs)
+
+    def start(self) -> None:
+        if self._task is None and self.specs:
+            self._task = asyncio.create_task(self._run())
+            logger.error("리포트 캐시 워머 시작 - 스펙 %d개", len(self.specs))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now()
+            due = [spec for spec in self.specs if spec.due(now)]
+            for spec in due:
+                await self._wait_for_idle()
+                await self.warm(spec)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _wait_for_idle(self) -> None:
+        """실시간 요청이 업스트림을 사용 중이면 양보합니다."""
+        while upstream_in_flight() > REPORT_WARMER_MAX_IN_FLIGHT:
+            await asyncio.sleep(1.0)
+
+    async def warm(self, spec: WarmSpec) -> None:
+        """스펙 하나를 실행해 리포트 캐시에 저장합니다."""
+        try:
+            auth = AdobeAuth()
+            tool = GetReportTool(auth)
+            validated_params = GetReportParams(**spec.params)
+            rsid = validated_params.rsid or auth.report_suite_id
+            request_body = tool.build_request_body(validated_params, rsid)
+
+            result = await tool.load(request_body)
+            report_cache.set(
+                report_cache_key(request_body), result, ttl=spec.ttl, tag=spec.name
+            )
+            spec.runs += 1
+            spec.last_run = datetime.now().isoformat(timespec="seconds")
+        except Exception as e:
+            spec.errors += 1
+            spec.last_error = str(e)
+            logger.error("캐시 워밍 실패 - 스펙: %s, 오류: %s", spec.name, str(e))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """스펙별 실행 횟수와 워밍된 캐시의 실제 사용률을 반환합니다."""
+        result = []
+        for spec in self.specs:
+            hits = report_cache.tag_hits.get(spec.name, 0)
+            result.append(
+                {
+                    "name": spec.name,
+                    "schedule": spec.schedule.expression,
+                    "runs": spec.runs,
+                    "errors": spec.errors,
+                    "warm_hits": hits,
+                    # 0 이면 워밍한 결과가 한 번도 사용되지 않은 스펙 (정리 대상)
+                    "hits_per_run": round(hits / spec.runs, 2) if spec.runs else None,
+                    "last_run": spec.last_run,
+                    "last_error": spec.last_error,
+                }
+            )
+        return result
+
+
+def load_report_warmer() -> Optional[ReportWarmer]:
+    """REPORT_WARMER_CONFIG 가 설정된 경우 워머를 생성합니다."""
+    if not REPORT_WARMER_CONFIG:
+        return None
+    return ReportWarmer.from_config(REPORT_WARMER_CONFIG)
@@ -0,0 +1,101 @@
+import time
+from collections import deque
+from typing import Deque, Optional
+
+
+class UpstreamError(Exception):
+    """Adobe API 가 200 이 아닌 상태 코드를 반환한 경우"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        """서버 측 문제(5xx, 429)인지 여부. 4xx 요청 오류는 서킷 브레이커에 반영하지 않습니다."""
+        return self.status >= 500 or self.status == 429
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 요청을 보내지 않은 경우"""
+
+
+class StaleFallbackError(Exception):
+    """요청이 실패했지만 최근 성공 응답이 남아 있는 경우
+
+    value 는 stored_at 시각에 받은 응답입니다. 호출자는 응답이 오래됐다는 것을 알고
+    (예: stale-if-error 로 표시하고 캐시에 다시 넣지 않고) 사용할 수 있습니다.
+    """
+
+    def __init__(self, message: str, value, stored_at: float):
+        super().__init__(message)
+        self.value = value
+        self.stored_at = stored_at
+
+
+class LatencyTracker:
+    """엔드포인트별 최근 응답 시간 분포"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed: float) -> None:
+        self._samples.append(elapsed)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """연속 실패가 임계치를 넘으면 일정 시간 요청을 차단하는 서킷 브레이커
+
+    - closed: 정상
+    - open: reset_timeout 동안 모든 요청을 즉시 실패
+    - half_open: reset_timeout 이후 시험 요청 하나만 허용, 성공하면 closed
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """시험 요청이 결과 없이 취소된 경우 다음 시험 요청을 허용합니다."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
@@ -0,0 +1,176 @@
+"""
+일별 지표 시계열 이상치 / 추세 분석 (NumPy 벡터 연산)
+
+모든 지표를 (일 x 지표) 행렬 하나로 처리합니다.
+
+1. 요일 보정: 지표별 요일 평균 / 전체 평균 으로 요일 계수를 구하고 값을 나눕니다.
+2. 이동 기준선: 직전 window 일(현재 일 제외)의 평균 / 표준편차
+3. z-score = (보정값 - 기준선 평균) / 기준선 표준편차, |z| >= threshold 이면 표시
+
+응답에 없는 날은 NaN 행으로 두고 기준선 / 이상치 / 요약 통계에서 제외합니다.
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 기준선을 계산하기 위한 최소 과거 일 수 (window 가 더 작으면 window)
+MIN_BASELINE_DAYS = 7
+
+
+def parse_day(row: dict) -> Optional[date]:
+    """daterangeday 행의 날짜. itemId 형식은 "1YYMMDD" (1YY = 연도 - 1900, MM 은 0 부터 시작)."""
+    item_id = str(row.get("itemId", ""))
+    try:
+        if len(item_id) == 7 and item_id.isdigit():
+            return date(1900 + int(item_id[0:3]), int(item_id[3:5]) + 1, int(item_id[5:7]))
+        return date.fromisoformat(str(row.get("value", ""))[:10])
+    except ValueError:
+        return None
+
+
+def day_of_week_factors(values: np.ndarray, weekdays: np.ndarray) -> np.ndarray:
+    """(7 x 지표) 요일 계수. 값이 없는 요일이나 평균이 0 인 지표는 1 입니다."""
+    overall = values.mean(axis=0)
+    factors = np.ones((7, values.shape[1]))
+    for weekday in range(7):
+        mask = weekdays == weekday
+        if mask.any():
+            factors[weekday] = np.divide(
+                values[mask].mean(axis=0),
+                overall,
+                out=np.ones(values.shape[1]),
+                where=overall != 0,
+            )
+    factors[factors == 0] = 1.0
+    return factors
+
+
+def rolling_baseline(values: np.ndarray, window: int):
+    """직전 window 일(현재 일 제외)의 평균 / 표준편차 / 표본 수를 한 번에 계산합니다.
+
+    NaN 인 날은 표본에서 제외합니다. 누적합 대신 창마다 평균을 뺀 뒤 제곱하므로
+    값이 크고 변동이 작은 지표에서도 분산이 상쇄 오차로 무너지지 않습니다.
+    """
+    n, width = values.shape
+    padded = np.vstack([np.full((window, width), np.nan), values])
+    # windows[i] = values[i - window : i] (지표 x window)
+    windows = sliding_window_view(padded, window, axis=0)[:n]
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=2).astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=2) / counts
+        centered = np.where(valid, windows - mean[:, :, None], 0.0)
+        variance = (centered * centered).sum(axis=2) / (counts - 1)
+    std = np.sqrt(np.clip(variance, 0, None))
+    return mean, std, counts
+
+
+def linear_trend(values: np.ndarray, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """지표별 일당 기울기 (최소제곱). x 는 각 행의 일 위치 (기본값: 0, 1, 2, ...)"""
+    x = np.arange(values.shape[0], dtype=np.float64) if x is None else x.astype(np.float64)
+    x = x - x.mean() if len(x) else x
+    denominator = (x * x).sum()
+    if not denominator:
+        return np.zeros(values.shape[1])
+    return (x[:, None] * (values - values.mean(axis=0))).sum(axis=0) / denominator
+
+
+def analyze_series(
+    days: List[date],
+    values: np.ndarray,
+    metrics: List[str],
+    window: int = 14,
+    threshold: float = 3.0,
+    seasonal: bool = True,
+) -> dict:
+    """(일 x 지표) 행렬에서 이상치와 요약 통계를 계산합니다. NaN 행(빠진 날)은 제외합니다."""
+    weekdays = np.array([d.weekday() for d in days])
+    present = ~np.isnan(values).any(axis=1)
+    observed = values[present]
+    seasonal = bool(seasonal and int(present.sum()) >= 14)
+    factors = (
+        day_of_week_factors(observed, weekdays[present])
+        if seasonal
+        else np.ones((7, values.shape[1]))
+    )
+    day_factors = factors[weekdays]
+    adjusted = values / day_factors
+
+    mean, std, counts = rolling_baseline(adjusted, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (adjusted - mean) / std
+    evaluable = (counts >= min(window, MIN_BASELINE_DAYS)) & (std > 0) & present[:, None]
+    flagged = evaluable & (np.abs(z) >= threshold)
+
+    expected = mean * day_factors
+    anomalies = []
+    for d, m in zip(*np.nonzero(flagged)):
+        anomalies.append(
+            {
+                "date": days[d].isoformat(),
+                "metric": metrics[m],
+                "value": float(values[d, m]),
+                "expected": round(float(expected[d, m]), 2),
+                "z_score": round(float(z[d, m]), 2),
+                "direction": "up" if z[d, m] > 0 else "down",
+            }
+        )
+    anomalies.sort(key=lambda a: -abs(a["z_score"]))
+
+    slopes = linear_trend(observed, np.nonzero(present)[0])
+    column_means = observed.mean(axis=0)
+    half = len(observed) // 2
+    summary = {}
+    for i, metric in enumerate(metrics):
+        series = observed[:, i]
+        first_half = series[:half].mean() if half else 0.0
+        second_half = series[half:].mean() if half else 0.0
+        summary[metric] = {
+            "total": float(series.sum()),
+            "mean": round(float(column_means[i]), 2),
+            "std": round(float(series.std()), 2),
+            "min": float(series.min()),
+            "max": float(series.max()),
+            "slope_per_day": round(float(slopes[i]), 4),
+            "slope_pct_of_mean": round(float(slopes[i] / column_means[i] * 100), 2)
+            if column_means[i]
+            else None,
+            "half_over_half_pct": round(float((second_half - first_half) / first_half * 100), 2)
+            if first_half
+            else None,
+            "anomaly_count": int(flagged[:, i].sum()),
+            "day_of_week_factors": {
+                name: round(float(factors[w, i]), 3)
+                for w, name in enumerate(["mon", "tue", "wed", "thu", "fri", "sat", "sun"])
+            },
+        }
+
+    return {
+        "start": days[0].isoformat(),
+        "end": days[-1].isoformat(),
+        "days": int(present.sum()),
+        "excluded_days": [d.isoformat() for d, ok in zip(days, present) if not ok],
+        "window": window,
+        "threshold": threshold,
+        "seasonal": seasonal,
+        "anomalies": anomalies,
+        "summary": summary,
+    }
+
+
+def fill_missing_days(days: List[date], values: np.ndarray):
+    """응답에 빠진 날짜를 NaN 으로 채워 연속된 일별 시계열로 만듭니다 (0 으로 채우면 이상치로 잡힘)."""
+    if not days:
+        return days, values
+    order = np.argsort(np.array([d.toordinal() for d in days]))
+    days = [days[i] for i in order]
+    values = values[order]
+    full = [days[0] + timedelta(days=i) for i in range((days[-1] - days[0]).days + 1)]
+    filled = np.full((len(full), values.shape[1]), np.nan)
+    index = np.array([(d - days[0]).days for d in days])
+    filled[index] = values
+    return full, filled
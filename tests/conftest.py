@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 서버 코드는 src 를 기준으로 import 합니다 (예: from utils.cache import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, AdmissionLimiter, OverloadedError
+
+
+def assert_idle(limiter):
+    stats = limiter.stats()
+    assert stats["in_flight"] == 0
+    assert stats["waiting"] == 0
+
+
+def test_released_slot_is_handed_to_waiters_in_fifo_order():
+    async def scenario():
+        limiter = AdmissionLimiter("t", concurrency=1, queue_size=3, queue_timeout=1)
+        order = []
+
+        async def call(name):
+            await limiter.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            limiter.release(0.01)
+
+        await limiter.acquire()
+        tasks = [asyncio.create_task(call(name)) for name in ("b", "c", "d")]
+        await asyncio.sleep(0)
+        assert limiter.stats()["waiting"] == 3
+        # 슬롯을 넘겨주므로 in_flight 는 동시 실행 수를 넘지 않음
+        assert limiter.in_flight == 1
+        limiter.release(0.01)
+        await asyncio.gather(*tasks)
+        return limiter, order
+
+    limiter, order = asyncio.run(scenario())
+    assert order == ["b", "c", "d"]
+    assert limiter.stats()["admitted"] == 4
+    assert_idle(limiter)
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        limiter = AdmissionLimiter("t", concurrency=1, queue_size=1, queue_timeout=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as info:
+            await limiter.acquire()
+        limiter.release()
+        await waiter
+        limiter.release()
+        return limiter, info.value
+
+    limiter, error = asyncio.run(scenario())
+    assert error.reason == "queue_full"
+    assert error.retry_after >= 1
+    assert limiter.rejected_full == 1
+    assert_idle(limiter)
+
+
+def test_queue_timeout_rejects_and_leaves_queue():
+    async def scenario():
+        limiter = AdmissionLimiter("t", concurrency=1, queue_size=2, queue_timeout=0.02)
+        await limiter.acquire()
+        with pytest.raises(OverloadedError) as info:
+            await limiter.acquire()
+        assert limiter.stats()["waiting"] == 0
+        limiter.release()
+        return limiter, info.value
+
+    limiter, error = asyncio.run(scenario())
+    assert error.reason == "queue_timeout"
+    assert limiter.rejected_timeout == 1
+    assert_idle(limiter)
+
+
+def test_cancel_while_queued_removes_waiter():
+    async def scenario():
+        limiter = AdmissionLimiter("t", concurrency=1, queue_size=2, queue_timeout=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats()["waiting"] == 0
+        limiter.release()
+        return limiter
+
+    assert_idle(asyncio.run(scenario()))
+
+
+def test_cancel_after_hand_off_passes_slot_on():
+    async def scenario():
+        limiter = AdmissionLimiter("t", concurrency=1, queue_size=2, queue_timeout=1)
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        next_waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        # 슬롯을 넘겨받았지만 실행되기 전에 취소됨 - 다음 대기자에게 넘어가야 함
+        limiter.release()
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        await next_waiter
+        assert limiter.in_flight == 1
+        limiter.release()
+        return limiter
+
+    assert_idle(asyncio.run(scenario()))
+
+
+def test_limited_decorator_releases_on_error():
+    controller = AdmissionController({"tool": {"concurrency": 1, "queue": 1}})
+
+    @controller.limited("tool")
+    async def failing():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(failing())
+    stats = controller.stats()["limited"]["tool"]
+    assert (stats["in_flight"], stats["waiting"], stats["admitted"]) == (0, 0, 1)
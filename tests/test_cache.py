@@ -0,0 +1,157 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import adobe_client
+from tools import get_dimensions, get_metrics
+from utils.cache import SWRPolicy, TTLCache, get_or_revalidate
+from utils.resilience import StaleFallbackError, UpstreamError
+
+POLICY = SWRPolicy(ttl=60, stale_while_revalidate=60, stale_if_error=600)
+
+
+def age_entry(cache, key, seconds):
+    entry = cache.peek(key)
+    entry.stored_at -= seconds
+    entry.expires_at -= seconds
+
+
+def fetch(cache, loader, key="k", policy=POLICY):
+    async def main():
+        result = await get_or_revalidate(cache, key, loader, policy)
+        # 백그라운드 갱신이 끝날 때까지 대기
+        await asyncio.sleep(0.01)
+        return result
+
+    return asyncio.run(main())
+
+
+def loader_returning(value):
+    async def load():
+        return value
+
+    return load
+
+
+def failing_loader(error):
+    async def load():
+        raise error
+
+    return load
+
+
+def test_miss_then_fresh():
+    cache = TTLCache(10, 60)
+    assert fetch(cache, loader_returning(1))[1]["status"] == "miss"
+    value, freshness = fetch(cache, loader_returning(2))
+    assert (value, freshness["status"]) == (1, "fresh")
+
+
+def test_stale_returns_old_value_and_revalidates():
+    cache = TTLCache(10, 60)
+    fetch(cache, loader_returning(1))
+    age_entry(cache, "k", 90)
+    value, freshness = fetch(cache, loader_returning(2))
+    assert (value, freshness["status"], freshness["revalidating"]) == (1, "stale", True)
+    assert cache.peek("k").value == 2
+
+
+def test_stale_if_error_uses_cached_age():
+    cache = TTLCache(10, 60)
+    fetch(cache, loader_returning(1))
+    age_entry(cache, "k", 300)
+    value, freshness = fetch(cache, failing_loader(RuntimeError("down")))
+    assert (value, freshness["status"]) == (1, "stale-if-error")
+    assert freshness["age_seconds"] >= 300
+
+
+def test_error_without_entry_is_raised():
+    with pytest.raises(RuntimeError):
+        fetch(TTLCache(10, 60), failing_loader(RuntimeError("down")))
+
+
+def test_upstream_fallback_is_not_cached():
+    cache = TTLCache(10, 60)
+    error = StaleFallbackError("down", {"v": 1}, time.time() - 120)
+    value, freshness = fetch(cache, failing_loader(error))
+    assert value == {"v": 1}
+    assert freshness["status"] == "stale-if-error"
+    assert freshness["age_seconds"] >= 120
+    assert cache.peek("k") is None
+
+
+def test_too_old_upstream_fallback_is_raised():
+    error = StaleFallbackError("down", {"v": 1}, time.time() - 3600)
+    with pytest.raises(StaleFallbackError):
+        fetch(TTLCache(10, 60), failing_loader(error))
+
+
+@pytest.fixture
+def metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(adobe_client, "_last_good", adobe_client.OrderedDict())
+    monkeypatch.setattr(adobe_client, "_breakers", {})
+    monkeypatch.setattr(adobe_client, "_latencies", {})
+    outcomes = []
+
+    async def fake_request(*args):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(adobe_client, "_request_json", fake_request)
+    auth = SimpleNamespace(company_id="c")
+
+    def call():
+        return asyncio.run(
+            adobe_client.request_json(None, auth, "GET", "metrics", params={"rsid": "rs"})
+        )
+
+    return outcomes, call
+
+
+def test_request_json_raises_stale_fallback_on_server_error(metrics_endpoint):
+    outcomes, call = metrics_endpoint
+    outcomes.extend([["m1"], UpstreamError(503, "unavailable")])
+    assert call() == ["m1"]
+    with pytest.raises(StaleFallbackError) as info:
+        call()
+    assert info.value.value == ["m1"]
+
+
+def test_request_json_does_not_fall_back_on_client_error(metrics_endpoint):
+    outcomes, call = metrics_endpoint
+    outcomes.extend([["m1"], UpstreamError(404, "not found")])
+    call()
+    with pytest.raises(UpstreamError):
+        call()
+
+
+CATALOG_PAGE = [{"id": "metrics/visits", "title": "Visits", "category": "Traffic"}]
+
+
+@pytest.mark.parametrize(
+    "module, tool_class",
+    [(get_metrics, get_metrics.GetMetricsTool), (get_dimensions, get_dimensions.GetDimensionsTool)],
+)
+def test_catalog_tool_serves_transformed_fallback_on_outage(
+    metrics_endpoint, monkeypatch, module, tool_class
+):
+    outcomes, _ = metrics_endpoint
+    outcomes.extend([CATALOG_PAGE, UpstreamError(503, "unavailable")])
+    tool = tool_class(SimpleNamespace(company_id="c"))
+
+    monkeypatch.setattr(module, "catalog_cache", TTLCache(10, 60))
+    fresh = asyncio.run(tool.execute({"rsid": "rs"}))
+    # 캐시에서 밀려난 뒤 업스트림 장애 - 최근 성공 응답을 같은 형태로 반환
+    monkeypatch.setattr(module, "catalog_cache", TTLCache(10, 60))
+    stale = asyncio.run(tool.execute({"rsid": "rs"}))
+
+    assert fresh["freshness"]["status"] == "miss"
+    assert stale["freshness"]["status"] == "stale-if-error"
+    assert stale["content"] == fresh["content"] == CATALOG_PAGE
+    assert {k: v for k, v in stale.items() if k != "freshness"} == {
+        k: v for k, v in fresh.items() if k != "freshness"
+    }
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from tools.evaluate_calculated_metrics import EvaluateCalculatedMetricsParams
+from utils.calc_metric import CalculatedMetricFormula, report_columns, total_columns
+
+
+def metric(name, **extra):
+    return {"func": "metric", "name": f"metrics/{name}", **extra}
+
+
+def test_compile_collects_base_metrics_once():
+    formula = CalculatedMetricFormula(
+        {
+            "formula": {
+                "func": "divide",
+                "col1": {"func": "add", "col1": metric("orders"), "col2": metric("orders")},
+                "col2": metric("visits"),
+            }
+        }
+    )
+    assert formula.base_metrics == ["orders", "visits"]
+
+
+def test_evaluate_divides_with_zero_guard():
+    formula = CalculatedMetricFormula(
+        {"formula": {"func": "divide", "col1": metric("orders"), "col2": metric("visits")}}
+    )
+    result = formula.evaluate({"orders": np.array([1.0, 2.0]), "visits": np.array([4.0, 0.0])})
+    assert result.tolist() == [0.25, 0.0]
+
+
+def test_constant_formula_broadcasts():
+    formula = CalculatedMetricFormula({"formula": {"func": "number", "val": 3}})
+    assert formula.base_metrics == []
+    assert formula.evaluate({"visits": np.array([1.0, 2.0])}).tolist() == [3.0, 3.0]
+
+
+def test_pow_returns_zero_for_non_finite_results():
+    formula = CalculatedMetricFormula(
+        {"formula": {"func": "pow", "col1": metric("a"), "col2": metric("b")}}
+    )
+    result = formula.evaluate(
+        {"a": np.array([2.0, -8.0, 0.0, 10.0]), "b": np.array([3.0, 0.5, -1.0, 400.0])}
+    )
+    assert result.tolist() == [8.0, 0.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    "definition",
+    [
+        {"formula": metric("visits", filters=["s300000000_abc"])},
+        {"formula": metric("revenue", **{"allocation-model": {"func": "allocation-linear"}})},
+        {"filters": [{"func": "segment-ref", "id": "s1"}], "formula": metric("visits")},
+        {"formula": {"func": "segment", "col": metric("visits")}},
+    ],
+)
+def test_unsupported_definitions_raise(definition):
+    with pytest.raises(ValueError):
+        CalculatedMetricFormula(definition)
+
+
+def test_report_and_total_columns():
+    report = {
+        "rows": [{"data": [1, 2]}, {"data": [3, 4]}],
+        "summaryData": {"totals": [4, 6]},
+    }
+    columns = report_columns(report, ["a", "b"])
+    assert columns["b"].tolist() == [2.0, 4.0]
+    assert total_columns(report, ["a", "b"])["a"].tolist() == [4.0]
+
+
+@pytest.mark.parametrize("field, value", [("limit", 0), ("limit", None), ("page", -1)])
+def test_params_use_report_limit_and_page_bounds(field, value):
+    with pytest.raises(ValidationError) as info:
+        EvaluateCalculatedMetricsParams(
+            calculated_metric_ids=["cm1"], date_range="yesterday", **{field: value}
+        )
+    assert field in str(info.value)
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from tools.get_segments import GetSegmentsParams
+from utils import component_sync
+from tools.get_calculated_metrics import GetCalculatedMetricsParams
+from utils.component_sync import (
+    CALCULATED_METRICS,
+    SEGMENTS,
+    build_expansion,
+    build_filter_params,
+    fetch_components,
+    project,
+)
+
+
+def test_build_expansion_keeps_only_expandable_fields():
+    assert build_expansion(["name", "definition", "tags"]) == "definition,tags"
+    assert build_expansion(["name"], extra=("modified",)) == "modified"
+    assert build_expansion(None) is None
+
+
+def test_project_always_keeps_id():
+    items = [{"id": "s1", "name": "a", "definition": {}}]
+    assert project(items, ["name"]) == [{"id": "s1", "name": "a"}]
+    assert project(items, None) is items
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": None}, {"max_results": 0}])
+def test_invalid_page_size_is_rejected(params):
+    with pytest.raises(ValidationError):
+        GetSegmentsParams(**params)
+
+
+@pytest.fixture
+def fake_upstream(monkeypatch):
+    monkeypatch.setattr(component_sync, "_snapshots", component_sync.OrderedDict())
+    calls = []
+
+    async def fake_request(session, auth, method, path, params=None):
+        calls.append(params)
+        item = {"id": "s1", "name": "a", "modified": "2024-01-01"}
+        if params.get("expansion") and "definition" in params["expansion"]:
+            item["definition"] = {"func": "segment"}
+        return {"content": [item], "totalElements": 1, "totalPages": 1, "lastPage": True}
+
+    monkeypatch.setattr(component_sync, "request_json", fake_request)
+    return calls
+
+
+def sync(fields):
+    params = GetSegmentsParams(sync=True, fields=fields)
+    return asyncio.run(fetch_components(SimpleNamespace(company_id="c"), SEGMENTS, params))
+
+
+def test_snapshot_is_keyed_by_expansion(fake_upstream):
+    assert sync(["name"])["sync"]["mode"] == "full"
+    # definition 을 요청하면 definition 없이 만든 스냅샷을 재사용하지 않음
+    result = sync(["name", "definition"])
+    assert result["sync"]["mode"] == "full"
+    assert result["content"][0]["definition"] == {"func": "segment"}
+    assert sync(["name"])["sync"]["mode"] == "incremental"
+
+
+def test_snapshot_count_is_bounded(fake_upstream, monkeypatch):
+    monkeypatch.setattr(component_sync, "COMPONENT_SNAPSHOT_MAX_ENTRIES", 2)
+    for fields in (["tags"], ["shares"], ["categories"]):
+        sync(fields)
+    assert len(component_sync._snapshots) == 2
+
+
+def test_single_rsid_is_used_as_filter():
+    assert build_filter_params(SEGMENTS, GetSegmentsParams(rsid="rs1"))["rsids"] == "rs1"
+    params = GetCalculatedMetricsParams(rsid="rs1")
+    assert build_filter_params(CALCULATED_METRICS, params)["toBeUsedInRsid"] == "rs1"
+    # rsids 가 있으면 rsids 를 사용
+    params = GetSegmentsParams(rsid="rs1", rsids=["rs2", "rs3"])
+    assert build_filter_params(SEGMENTS, params)["rsids"] == "rs2,rs3"
+    assert "rsids" not in build_filter_params(SEGMENTS, GetSegmentsParams())
+
+
+def test_full_sync_interval_drops_deleted_components(fake_upstream, monkeypatch):
+    sync(["name"])
+
+    async def s1_deleted(session, auth, method, path, params=None):
+        item = {"id": "s2", "name": "b", "modified": "2024-02-01"}
+        return {"content": [item], "totalElements": 1, "totalPages": 1, "lastPage": True}
+
+    monkeypatch.setattr(component_sync, "request_json", s1_deleted)
+    # 증분 동기화는 삭제를 알 수 없음
+    result = sync(["name"])
+    assert result["sync"]["mode"] == "incremental"
+    assert {item["id"] for item in result["content"]} == {"s1", "s2"}
+
+    monkeypatch.setattr(component_sync, "COMPONENT_FULL_SYNC_INTERVAL", 0)
+    result = sync(["name"])
+    assert result["sync"]["mode"] == "full"
+    assert [item["id"] for item in result["content"]] == ["s2"]
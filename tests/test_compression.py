@@ -0,0 +1,97 @@
+import asyncio
+import gzip
+import os
+import zlib
+
+import pytest
+
+from utils.compression import CompressionMiddleware, GzipEventStream, accepts_gzip
+
+
+def test_event_stream_round_trip_with_mixed_event_sizes():
+    events = [
+        b"event: endpoint\r\ndata: /messages/?session_id=abc\r\n\r\n",
+        b"data: " + b'{"rows": [1, 2, 3]}' * 400 + b"\r\n\r\n",
+        b": ping\r\n\r\n",
+        os.urandom(70000),
+        b"data: " + b"x" * 2048 + b"\r\n\r\n",
+        b"data: done\r\n\r\n",
+    ]
+    stream = GzipEventStream(minimum_size=1024, level=6)
+    chunks = [stream.write(event, final=False) for event in events]
+    chunks.append(stream.write(b"", final=True))
+
+    # 이벤트마다 바로 해제할 수 있어야 함 (스트리밍 중 버퍼링 없음)
+    decoder = zlib.decompressobj(31)
+    for event, chunk in zip(events, chunks):
+        assert decoder.decompress(chunk) == event
+    assert gzip.decompress(b"".join(chunks)) == b"".join(events)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("GZIP;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, *", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("br, deflate", False),
+        ("gzip;q=abc", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_honours_quality_values(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+def run_middleware(body, accept_encoding="gzip", content_type=b"application/json"):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=1024)(scope, receive, send))
+    return dict(sent[0]["headers"]), sent[1]["body"]
+
+
+def test_small_body_passes_through_uncompressed():
+    body = b'{"ok": true}'
+    headers, sent = run_middleware(body)
+    assert b"content-encoding" not in headers
+    assert headers[b"content-length"] == str(len(body)).encode()
+    assert sent == body
+
+
+def test_large_body_is_gzipped():
+    body = b'{"rows": [' + b"1, " * 2000 + b"1]}"
+    headers, sent = run_middleware(body)
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert gzip.decompress(sent) == body
+
+
+def test_refused_gzip_is_not_compressed():
+    body = b"x" * 4096
+    headers, sent = run_middleware(body, accept_encoding="gzip;q=0")
+    assert b"content-encoding" not in headers
+    assert sent == body
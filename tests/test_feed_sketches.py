@@ -0,0 +1,79 @@
+import threading
+from datetime import date
+
+import pytest
+
+from utils import feed_sketches
+from utils.feed_sketches import FeedSketchStore, sketch_key
+
+HEADERS = ["date_time", "post_visid_high", "post_visid_low", "post_pagename", "exclude_hit", "post_evar1"]
+
+
+def write_feed(directory, name, visitors, value="Home | Products", day="2024-01-05"):
+    headers = directory / "column_headers.tsv"
+    headers.write_text("\t".join(HEADERS) + "\n")
+    hits = directory / name
+    with hits.open("w") as f:
+        for visitor in visitors:
+            f.write("\t".join([f"{day} 10:00:00", "1", str(visitor), "home", "0", value]) + "\n")
+    return str(hits), str(headers)
+
+
+def test_sketch_key_is_structured():
+    assert sketch_key("visitors") == ("visitors",)
+    assert sketch_key("visitors", "post_evar1", "a|b") == ("visitors", "post_evar1", "a|b")
+
+
+def test_value_with_separator_is_counted(tmp_path):
+    store = FeedSketchStore(str(tmp_path / "sketches"), 12)
+    hits, headers = write_feed(tmp_path, "hits.tsv", range(100))
+    store.ingest("rs", hits, headers, ["post_evar1"])
+
+    result = store.distinct_count("rs", date(2024, 1, 5), date(2024, 1, 6), "visitors", "post_evar1")
+    assert result["counts"] == {"Home | Products": 100}
+
+
+def test_keys_survive_reload(tmp_path):
+    directory = str(tmp_path / "sketches")
+    hits, headers = write_feed(tmp_path, "hits.tsv", range(50))
+    FeedSketchStore(directory, 12).ingest("rs", hits, headers, ["post_evar1"])
+
+    reloaded = FeedSketchStore(directory, 12)
+    assert ("visitors", "post_evar1", "Home | Products") in reloaded.load_day("rs", "2024-01-05")
+
+
+def test_value_cap_applies(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed_sketches, "FEED_SKETCH_MAX_VALUES", 1)
+    store = FeedSketchStore(str(tmp_path / "sketches"), 12)
+    first = write_feed(tmp_path, "a.tsv", range(10), value="a|1")
+    second = write_feed(tmp_path, "b.tsv", range(10), value="b|2")
+    store.ingest("rs", *first, ["post_evar1"])
+    assert store.ingest("rs", *second, ["post_evar1"])["skipped_values"] == 1
+
+
+def test_concurrent_ingest_same_day_is_not_lost(tmp_path):
+    store = FeedSketchStore(str(tmp_path / "sketches"), 12)
+    feeds = [
+        write_feed(tmp_path, "a.tsv", range(0, 20000)),
+        write_feed(tmp_path, "b.tsv", range(20000, 40000)),
+    ]
+    threads = [threading.Thread(target=store.ingest, args=("rs", *feed, [])) for feed in feeds]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    count = store.distinct_count("rs", date(2024, 1, 5), date(2024, 1, 6), "visitors")["counts"]["visitors"]
+    assert count == pytest.approx(40000, rel=0.05)
+
+
+def test_end_date_is_exclusive(tmp_path):
+    store = FeedSketchStore(str(tmp_path / "sketches"), 12)
+    store.ingest("rs", *write_feed(tmp_path, "a.tsv", range(10), day="2024-01-05"), [])
+    store.ingest("rs", *write_feed(tmp_path, "b.tsv", range(10, 30), day="2024-01-06"), [])
+
+    result = store.distinct_count("rs", date(2024, 1, 5), date(2024, 1, 6), "visitors")
+    assert result["counts"] == {"visitors": 10}
+    assert result["days_covered"] == 1
+    # 같은 날짜를 주면 그 하루를 조회
+    assert store.distinct_count("rs", date(2024, 1, 6), date(2024, 1, 6), "visitors")["counts"] == {"visitors": 20}
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+from tools import get_report
+from tools.get_report import (
+    GetReportParams,
+    GetReportTool,
+    merge_segment_reports,
+    sorted_by_first_metric_desc,
+)
+from utils.cache import report_cache
+
+
+def test_merge_segment_reports_side_by_side():
+    results = [
+        {"rows": [{"itemId": "1", "value": "a", "data": [10]}], "summaryData": {"totals": [10]}},
+        {"rows": [{"itemId": "2", "value": "b", "data": [5]}], "summaryData": {"totals": [5]}},
+    ]
+    merged = merge_segment_reports(["s1", "s2"], ["visits"], results)
+    assert merged["rows"] == [
+        {"itemId": "1", "value": "a", "s1:visits": 10, "s2:visits": None},
+        {"itemId": "2", "value": "b", "s1:visits": None, "s2:visits": 5},
+    ]
+    assert merged["totals"] == {"s1": {"visits": 10}, "s2": {"visits": 5}}
+
+
+def test_merge_segment_reports_records_cancelled_segment():
+    results = [
+        {"rows": [{"itemId": "1", "value": "a", "data": [10]}]},
+        asyncio.CancelledError(),
+    ]
+    merged = merge_segment_reports(["s1", "s2"], ["visits"], results)
+    assert merged["failed_count"] == 1
+    assert "s2" in merged["errors"]
+    assert len(merged["rows"]) == 1
+
+
+def filtered_tool(rows_per_page, pages):
+    tool = GetReportTool(SimpleNamespace(report_suite_id="rs", company_id="c"))
+    calls = []
+
+    async def post_report(session, request_body, meta=None):
+        page = request_body["settings"]["page"]
+        calls.append(page)
+        start = page * rows_per_page
+        rows = [
+            {"itemId": str(i), "value": f"v{i}", "data": [1000 - i]}
+            for i in range(start, start + rows_per_page)
+        ]
+        return {"rows": rows, "lastPage": page == pages - 1}
+
+    tool.post_report = post_report
+    return tool, calls
+
+
+def test_sorted_by_first_metric_desc():
+    body = {"metricContainer": {"metrics": [{"id": "metrics/visits"}]}, "settings": {}}
+    assert sorted_by_first_metric_desc(body)
+    assert not sorted_by_first_metric_desc({**body, "settings": {"dimensionSort": "asc"}})
+    asc = {"metricContainer": {"metrics": [{"id": "metrics/visits", "sort": "asc"}]}}
+    assert not sorted_by_first_metric_desc(asc)
+
+
+def test_fetch_filtered_stops_early_and_skips_report_cache(monkeypatch):
+    monkeypatch.setattr(get_report, "FILTER_SCAN_PAGE_SIZE", 10)
+    tool, calls = filtered_tool(10, 100)
+    before = report_cache.stats()["entries"]
+    params = GetReportParams(
+        date_range="2024-01-01/2024-01-02",
+        metrics=["visits"],
+        dimension="page",
+        limit=100,
+        metric_filters=[{"metric": "visits", "operator": "ge", "value": 975}],
+    )
+    result = asyncio.run(tool.fetch_filtered(None, params, "rs"))
+    assert [row["itemId"] for row in result["rows"]] == [str(i) for i in range(26)]
+    assert result["filter"]["early_stop"] and result["filter"]["complete"]
+    assert calls == [0, 1, 2]
+    assert report_cache.stats()["entries"] == before
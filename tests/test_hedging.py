@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utils import adobe_client
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    monkeypatch.setattr(adobe_client, "_upstream_limiter", None)
+    monkeypatch.setattr(adobe_client, "_metadata_limiter", None)
+    monkeypatch.setattr(adobe_client, "METADATA_CONCURRENCY", 1)
+    monkeypatch.setattr(adobe_client, "_latencies", {})
+    monkeypatch.setattr(adobe_client, "_breakers", {})
+    monkeypatch.setattr(adobe_client, "_last_good", adobe_client.OrderedDict())
+    tracker = adobe_client._latency("metrics")
+    for _ in range(adobe_client.HEDGE_MIN_SAMPLES):
+        tracker.record(0.01)
+
+    durations = []
+    calls = []
+
+    async def fake_request(session, auth, method, path, params, body, meta, acquired=None):
+        async with adobe_client.get_upstream_limiter(path):
+            if acquired is not None:
+                acquired.set()
+            calls.append(len(calls))
+            await asyncio.sleep(durations[len(calls) - 1])
+            return len(calls) - 1
+
+    monkeypatch.setattr(adobe_client, "_request_json", fake_request)
+    return durations, calls
+
+
+def call_metrics():
+    return adobe_client.request_json(
+        None, SimpleNamespace(company_id="c"), "GET", "metrics", params={"rsid": "rs"}
+    )
+
+
+def test_slow_response_is_hedged(upstream, monkeypatch):
+    monkeypatch.setattr(adobe_client, "METADATA_CONCURRENCY", 2)
+    durations, calls = upstream
+    durations.extend([1.0, 0.01])
+    assert asyncio.run(asyncio.wait_for(call_metrics(), 0.8)) == 1
+    assert len(calls) == 2
+
+
+def test_queue_wait_does_not_trigger_hedge(upstream):
+    durations, calls = upstream
+
+    async def main():
+        # 다른 요청이 세마포어를 0.5초 동안 잡고 있음
+        async def hold():
+            async with adobe_client.get_upstream_limiter("metrics"):
+                await asyncio.sleep(0.5)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        result = await call_metrics()
+        await holder
+        return result
+
+    durations.append(0.01)
+    assert asyncio.run(main()) == 0
+    assert len(calls) == 1
+
+
+def test_no_hedge_when_limiter_is_saturated(upstream):
+    durations, calls = upstream
+    durations.extend([0.5, 0.01])
+    # 동시성 1: 헤지 요청은 큐에서 기다리기만 하므로 보내지 않음
+    assert asyncio.run(call_metrics()) == 0
+    assert len(calls) == 1
+
+
+def test_catalog_requests_do_not_wait_behind_reports(upstream):
+    durations, calls = upstream
+    durations.append(0.01)
+
+    async def main():
+        async def hold_reports():
+            async with adobe_client.get_upstream_limiter("reports"):
+                await asyncio.sleep(1.0)
+
+        holders = [asyncio.create_task(hold_reports()) for _ in range(adobe_client.UPSTREAM_CONCURRENCY)]
+        await asyncio.sleep(0)
+        result = await asyncio.wait_for(call_metrics(), 0.5)
+        for holder in holders:
+            holder.cancel()
+        return result
+
+    assert asyncio.run(main()) == 0
+    assert adobe_client.get_upstream_limiter("reports/realtime") is adobe_client.get_upstream_limiter()
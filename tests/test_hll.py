@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from utils.hll import HyperLogLog, hash_values
+
+
+def test_count_within_error():
+    sketch = HyperLogLog(12)
+    sketch.add(str(i) for i in range(100000))
+    assert abs(sketch.count() - 100000) / 100000 < 4 * sketch.relative_error
+
+
+def test_small_cardinality_uses_linear_counting():
+    sketch = HyperLogLog(12)
+    sketch.add(["a", "b", "c", "a"])
+    assert sketch.count() == 3
+
+
+def test_merge_equals_union():
+    left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    left.add(str(i) for i in range(0, 60000))
+    right.add(str(i) for i in range(40000, 100000))
+    union.add(str(i) for i in range(0, 100000))
+    merged = left.copy().merge(right)
+    assert np.array_equal(merged.registers, union.registers)
+    # copy 는 원본을 바꾸지 않음
+    assert left.count() < merged.count()
+
+
+def test_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(14))
+
+
+def test_hash_values_is_stable():
+    assert hash_values(["x"])[0] == hash_values(["x"])[0]
+    assert hash_values(["x"])[0] != hash_values(["y"])[0]
@@ -0,0 +1,64 @@
+from utils import item_index as item_index_module
+from utils.item_index import DimensionItemIndex
+
+
+def test_evicts_oldest_item_of_least_recently_used_dimension():
+    index = DimensionItemIndex(max_items=4)
+    index.add("rs", "variables/page", [("Home", "1"), ("Cart", "2")])
+    index.add("rs", "variables/channel", [("Email", "10"), ("Search", "11")])
+    # page 차원을 최근에 사용 - 다음 제거 대상은 channel 의 가장 오래된 항목
+    assert index.resolve("rs", "page", " home ") == "1"
+
+    index.add("rs", "variables/page", [("Checkout", "3")])
+
+    assert len(index) == 4
+    assert index.evictions == 1
+    assert index.resolve("rs", "channel", "Email") is None
+    assert index.resolve("rs", "channel", "Search") == "11"
+    assert index.resolve("rs", "page", "Checkout") == "3"
+
+
+def test_recently_resolved_item_survives_eviction_within_dimension():
+    index = DimensionItemIndex(max_items=2)
+    index.add("rs", "page", [("Home", "1"), ("Cart", "2")])
+    index.resolve("rs", "page", "Home")
+    index.add("rs", "page", [("Checkout", "3")])
+    assert index.resolve_many("rs", "page", ["Home", "Cart", "Checkout"]) == (
+        {"Home": "1", "Checkout": "3"},
+        ["Cart"],
+    )
+
+
+def test_empty_dimension_is_dropped_after_eviction():
+    index = DimensionItemIndex(max_items=1)
+    index.add("rs", "page", [("Home", "1")])
+    index.add("rs", "channel", [("Email", "10")])
+    assert index.stats()["dimensions"] == 1
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = DimensionItemIndex(max_items=10)
+    index.add("rs", "page", [("Home", "1"), ("Cart", "2")])
+    index.add("rs2", "channel", [("Paid Search", "7")])
+    index.resolve("rs", "page", "Home")
+    index.save(path)
+
+    loaded = DimensionItemIndex(max_items=10)
+    loaded.load(path)
+
+    assert len(loaded) == 3
+    assert loaded.search("rs", "page", "") == index.search("rs", "page", "")
+    assert loaded.resolve("rs2", "channel", "paid search") == "7"
+    # 저장 시점의 사용 순서가 유지됨 - 용량을 줄이면 rs/page 의 Cart 가 먼저 제거됨
+    loaded.max_items = 2
+    loaded.add("rs2", "channel", [])
+    assert loaded.resolve("rs", "page", "Cart") is None
+    assert loaded.resolve("rs", "page", "Home") == "1"
+
+
+def test_load_item_index_ignores_corrupt_file(tmp_path, monkeypatch):
+    path = tmp_path / "index.json"
+    path.write_text("{not json")
+    monkeypatch.setattr(item_index_module, "ITEM_INDEX_PATH", str(path))
+    assert len(item_index_module.load_item_index()) == 0
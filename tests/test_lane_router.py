@@ -0,0 +1,102 @@
+import asyncio
+import socket
+
+from aiohttp import web
+
+from supervisor import worker_lane
+from utils.lane_router import LaneRouter, lane_message_path, message_lane
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_message_path_round_trip():
+    assert lane_message_path(None) == "/messages/"
+    assert lane_message_path(3) == "/messages/3/"
+    assert message_lane("/messages/3/") == 3
+    assert message_lane("/messages/") is None
+    assert message_lane("/sse") is None
+
+
+def test_worker_lane_alternates_between_generations():
+    lanes = {worker_lane(slot, 0, 2) for slot in range(2)}
+    next_lanes = {worker_lane(slot, 1, 2) for slot in range(2)}
+    assert lanes == {0, 1}
+    assert next_lanes == {2, 3}
+    assert {worker_lane(slot, 2, 2) for slot in range(2)} == lanes
+
+
+async def call(router, path, query=b"", body=b""):
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "query_string": query,
+        "headers": [(b"content-type", b"application/json")],
+    }
+    await router(scope, receive, send)
+    return sent[0]["status"], sent[1]["body"]
+
+
+def test_forwards_other_lane_and_passes_own_lane():
+    async def scenario():
+        port = free_port()
+        received = []
+
+        async def handle(request):
+            received.append((request.path, request.query.get("session_id"), await request.read()))
+            return web.Response(status=202, text="Accepted")
+
+        app = web.Application()
+        app.router.add_post("/messages/1/", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+
+        local = []
+
+        async def inner(scope, receive, send):
+            local.append(scope["path"])
+            await send({"type": "http.response.start", "status": 202, "headers": []})
+            await send({"type": "http.response.body", "body": b"local"})
+
+        router = LaneRouter(inner, lane=0, base_port=port - 1)
+        try:
+            forwarded = await call(router, "/messages/1/", b"session_id=abc", b"{}")
+            own = await call(router, "/messages/0/", b"session_id=def")
+        finally:
+            await router._client.close()
+            await runner.cleanup()
+        return forwarded, own, received, local
+
+    forwarded, own, received, local = asyncio.run(scenario())
+    assert forwarded == (202, b"Accepted")
+    assert received == [("/messages/1/", "abc", b"{}")]
+    assert own == (202, b"local")
+    assert local == ["/messages/0/"]
+
+
+def test_unreachable_lane_reports_missing_session():
+    async def scenario():
+        async def inner(scope, receive, send):
+            raise AssertionError("다른 lane 요청은 로컬 앱으로 가면 안 됨")
+
+        router = LaneRouter(inner, lane=0, base_port=free_port() - 5)
+        try:
+            return await call(router, "/messages/5/", b"session_id=abc")
+        finally:
+            await router._client.close()
+
+    assert asyncio.run(scenario()) == (404, b"Could not find session")
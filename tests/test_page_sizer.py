@@ -0,0 +1,50 @@
+import pytest
+from pydantic import ValidationError
+
+from tools.get_report import GetReportParams, slice_report_page
+from utils.page_sizer import AdaptivePageSizer, PageStats
+
+KEY = ("rs", "page")
+
+
+def test_latency_model_separates_fixed_overhead():
+    stats = PageStats()
+    for rows in (100, 800, 100, 1600, 400):
+        stats.observe(rows, 0.5 + rows * 0.001, rows * 100)
+    overhead, per_row = stats.latency_model()
+    assert overhead == pytest.approx(0.5, rel=1e-6)
+    assert per_row == pytest.approx(0.001, rel=1e-6)
+
+
+def test_latency_model_without_row_variation_has_no_intercept():
+    stats = PageStats()
+    stats.observe(100, 1.0, 1000)
+    stats.observe(100, 1.0, 1000)
+    assert stats.latency_model() == (0.0, 0.01)
+
+
+def test_choose_grows_pages_when_overhead_dominates():
+    sizer = AdaptivePageSizer()
+    # 행당 1ms, 요청당 1.5초: 절편이 없으면 ~100 행이 한계로 보임
+    for rows in (80, 160, 320):
+        sizer.observe(KEY, rows, 1.5 + rows * 0.001, rows * 10)
+    # 목표 2초 - 1.5초 = 500 행까지
+    assert sizer.choose(KEY, 10) == 320
+
+
+def test_upstream_limit_is_power_of_two_multiple():
+    sizer = AdaptivePageSizer()
+    assert sizer.choose(KEY, 25) == 200
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": None}, {"page": -1}])
+def test_report_params_reject_invalid_paging(params):
+    with pytest.raises(ValidationError):
+        GetReportParams(date_range="yesterday", metrics=["visits"], **params)
+
+
+def test_slice_report_page():
+    result = {"rows": [{"itemId": str(i)} for i in range(8)], "totalElements": 20}
+    page = slice_report_page(result, 4, 4, 1)
+    assert [r["itemId"] for r in page["rows"]] == ["4", "5", "6", "7"]
+    assert (page["totalPages"], page["firstPage"], page["lastPage"]) == (5, False, False)
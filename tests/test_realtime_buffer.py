@@ -0,0 +1,44 @@
+import datetime
+
+import pytz
+
+from utils.realtime_buffer import RealtimeRingBuffer, parse_minute, row_dimensions
+
+KEY = ("rs", "occurrences", "total", ())
+
+
+def epoch_minute(*args, tz=pytz.UTC):
+    return int(tz.localize(datetime.datetime(*args)).timestamp() // 60)
+
+
+def test_parse_minute_uses_suite_timezone():
+    # 2024-03-05 10:07 (월은 0 부터)
+    item_id = "12402051007"
+    assert parse_minute(item_id, "") == epoch_minute(2024, 3, 5, 10, 7)
+    pacific = pytz.timezone("America/Los_Angeles")
+    assert parse_minute(item_id, "", pacific) == epoch_minute(2024, 3, 5, 18, 7)
+
+
+def test_parse_minute_falls_back_to_value():
+    assert parse_minute("x", "10:07 2024-03-05") == epoch_minute(2024, 3, 5, 10, 7)
+    assert parse_minute("x", "not a time") is None
+
+
+def test_row_dimensions_for_breakdown_rows():
+    assert row_dimensions({"itemId": "1", "value": "a"}) == (["1"], ["a"])
+    assert row_dimensions({"itemIds": ["1", "2"], "values": ["a", "b"]}) == (["1", "2"], ["a", "b"])
+
+
+def test_query_buckets_and_skips_empty_minutes():
+    buffer = RealtimeRingBuffer(120, 1 << 20)
+    now = 1_000_000 * 60
+    buffer.write(KEY, {1_000_000: 3.0, 999_999: 2.0, 999_990: 7.0})
+    points = buffer.query(KEY, hours=1, granularity="5minute", now=now)
+    assert [(p["value"], p["minutes"]) for p in points] == [(7.0, 1), (2.0, 1), (3.0, 1)]
+
+
+def test_old_minute_does_not_overwrite_newer_slot():
+    buffer = RealtimeRingBuffer(60, 1 << 20)
+    buffer.write(KEY, {120: 5.0})
+    buffer.write(KEY, {60: 1.0})
+    assert buffer.query(KEY, hours=1, granularity="minute", now=120 * 60)[-1]["value"] == 5.0
@@ -0,0 +1,65 @@
+import csv
+import os
+
+import pytest
+
+from utils import report_export
+from utils.report_export import CsvReportWriter, NdjsonReportWriter, export_path
+
+ROWS = [{"itemId": "1", "value": "home", "data": [3, 1.5]}]
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_export, "EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def write(path, rows=ROWS):
+    writer = CsvReportWriter(path, "page", ["visits", "bounce_rate"])
+    writer.write_rows(rows)
+    return writer
+
+
+def test_export_path_rejects_path_separators():
+    with pytest.raises(ValueError):
+        export_path("../etc/passwd", "csv")
+    assert export_path("report", "csv").endswith("report.csv")
+
+
+def test_csv_export_commits_to_final_name(export_dir):
+    path = export_path("report", "csv")
+    writer = write(path)
+    writer.commit()
+    with open(path, newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [
+            {"itemId": "1", "page": "home", "visits": "3", "bounce_rate": "1.5"}
+        ]
+    assert os.listdir(export_dir) == ["report.csv"]
+
+
+def test_concurrent_writers_use_distinct_part_files():
+    path = export_path("report", "ndjson")
+    first = NdjsonReportWriter(path, "page", ["visits"])
+    second = NdjsonReportWriter(path, "page", ["visits"])
+    assert first.part_path != second.part_path
+    first.abort()
+    second.abort()
+
+
+def test_existing_file_is_not_overwritten(export_dir):
+    path = export_path("report", "csv")
+    write(path).commit()
+    second = write(path, [])
+    with pytest.raises(ValueError):
+        second.commit()
+    assert os.path.getsize(path) > 0
+    assert os.listdir(export_dir) == ["report.csv"]
+
+
+def test_unique_commit_adds_suffix():
+    path = export_path("report", "csv")
+    write(path).commit(unique=True)
+    second = write(path)
+    second.commit(unique=True)
+    assert second.path.endswith("report-1.csv")
@@ -0,0 +1,138 @@
+import asyncio
+
+from utils.report_fusion import ReportFuser, fusion_key, split_report
+
+
+def body(*metrics, **extra):
+    return {
+        "rsid": "rs",
+        "globalFilters": [{"type": "dateRange", "dateRange": "2024-01-01/2024-01-02"}],
+        "dimension": "variables/page",
+        "metricContainer": {
+            "metrics": [{"columnId": str(i), "id": f"metrics/{m}"} for i, m in enumerate(metrics)],
+            **extra,
+        },
+    }
+
+
+def test_fusion_key_ignores_metric_list_but_not_sort_metric():
+    assert fusion_key(body("visits", "pageviews")) == fusion_key(body("visits", "orders"))
+    assert fusion_key(body("visits")) != fusion_key(body("orders", "visits"))
+
+
+def test_fusion_key_rejects_metric_filters():
+    assert fusion_key(body("visits", metricFilters=[{"id": "0"}])) is None
+    assert fusion_key({"rsid": "rs", "metricContainer": {"metrics": []}}) is None
+
+
+def test_split_report_reorders_columns():
+    fused = {
+        "columns": {
+            "columnIds": ["0", "1", "2"],
+            "columnErrors": [{"columnId": "2", "errorCode": "x"}],
+        },
+        "rows": [{"itemId": "1", "value": "a", "data": [1, 2, 3]}],
+        "summaryData": {"totals": [10, 20, 30]},
+    }
+    result = split_report(fused, 3, [2, 0], ["a", "b"])
+    assert result["columns"]["columnIds"] == ["a", "b"]
+    assert result["columns"]["columnErrors"] == [{"columnId": "a", "errorCode": "x"}]
+    assert result["rows"][0]["data"] == [3, 1]
+    assert result["summaryData"]["totals"] == [30, 10]
+
+
+def fake_report(request_body):
+    ids = [m["id"] for m in request_body["metricContainer"]["metrics"]]
+    return {
+        "columns": {"columnIds": [m["columnId"] for m in request_body["metricContainer"]["metrics"]]},
+        "rows": [{"itemId": "1", "value": "a", "data": ids}],
+        "summaryData": {"totals": ids},
+    }
+
+
+def run_concurrently(fuser, send, bodies):
+    async def main():
+        async def slow_first(session, request_body, meta):
+            await asyncio.sleep(0.05)
+            return fake_report(request_body)
+
+        # 첫 요청이 실행 중이어야 뒤따르는 요청이 병합됨
+        first = asyncio.create_task(fuser.submit(None, body("visits"), None, slow_first))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(
+            *(fuser.submit(None, b, None, send) for b in bodies), return_exceptions=True
+        )
+        await first
+        return results
+
+    return asyncio.run(main())
+
+
+def test_solo_request_is_sent_without_waiting():
+    fuser = ReportFuser(10.0, True)
+    calls = []
+
+    async def send(session, request_body, meta):
+        calls.append(request_body)
+        return fake_report(request_body)
+
+    async def main():
+        return await asyncio.wait_for(fuser.submit(None, body("visits"), None, send), 1.0)
+
+    assert asyncio.run(main())["summaryData"]["totals"] == ["metrics/visits"]
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_are_fused_and_split():
+    fuser = ReportFuser(0.01, True)
+    calls = []
+
+    async def send(session, request_body, meta):
+        calls.append(request_body)
+        return fake_report(request_body)
+
+    results = run_concurrently(fuser, send, [body("visits", "orders"), body("visits", "revenue")])
+    assert len(calls) == 1
+    assert results[0]["summaryData"]["totals"] == ["metrics/visits", "metrics/orders"]
+    assert results[1]["summaryData"]["totals"] == ["metrics/visits", "metrics/revenue"]
+
+
+def test_fused_failure_falls_back_to_individual_requests():
+    fuser = ReportFuser(0.01, True)
+
+    async def send(session, request_body, meta):
+        ids = [m["id"] for m in request_body["metricContainer"]["metrics"]]
+        if "metrics/broken" in ids:
+            raise RuntimeError("invalid metric")
+        return fake_report(request_body)
+
+    good, bad = run_concurrently(fuser, send, [body("visits", "orders"), body("visits", "broken")])
+    assert good["summaryData"]["totals"] == ["metrics/visits", "metrics/orders"]
+    assert isinstance(bad, RuntimeError)
+
+
+def test_cancelled_batch_does_not_leave_callers_waiting():
+    fuser = ReportFuser(0.01, True)
+
+    async def main():
+        async def slow_first(session, request_body, meta):
+            await asyncio.sleep(0.05)
+            return fake_report(request_body)
+
+        async def hang(session, request_body, meta):
+            await asyncio.sleep(10)
+
+        first = asyncio.create_task(fuser.submit(None, body("visits"), None, slow_first))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(fuser.submit(None, body("visits", m), None, hang))
+            for m in ("orders", "revenue")
+        ]
+        await asyncio.sleep(0.03)
+        for task in list(fuser._tasks):
+            task.cancel()
+        await first
+        return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1.0)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
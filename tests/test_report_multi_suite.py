@@ -0,0 +1,22 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from tools.get_report_multi_suite import GetReportMultiSuiteParams, merge_suite_reports
+
+
+def test_cancelled_suite_is_recorded_as_error():
+    report = {"rows": [{"itemId": "1", "value": "a", "data": [3]}], "summaryData": {"totals": [3]}}
+    merged = merge_suite_reports(
+        ["rs1", "rs2"], ["metrics/visits"], [report, asyncio.CancelledError()]
+    )
+    assert [row["rsid"] for row in merged["rows"]] == ["rs1"]
+    assert set(merged["errors"]) == {"rs2"}
+
+
+@pytest.mark.parametrize("field, value", [("limit", 0), ("limit", None), ("page", -1)])
+def test_limit_and_page_use_report_bounds(field, value):
+    with pytest.raises(ValidationError) as info:
+        GetReportMultiSuiteParams(date_range="yesterday", metrics=["metrics/visits"], **{field: value})
+    assert field in str(info.value)
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from utils.report_warmer import CronSchedule, WarmSpec
+
+
+def test_steps_ranges_and_lists():
+    schedule = CronSchedule("*/15 9-10 * * 1,3")
+    assert schedule.fields[0] == {0, 15, 30, 45}
+    assert schedule.fields[1] == {9, 10}
+    # 2024-01-01 은 월요일
+    assert schedule.matches(datetime(2024, 1, 1, 9, 30))
+    assert not schedule.matches(datetime(2024, 1, 2, 9, 30))
+    assert not schedule.matches(datetime(2024, 1, 1, 9, 31))
+
+
+def test_sunday_as_seven():
+    # 2024-01-07 은 일요일
+    assert CronSchedule("0 0 * * 7").matches(datetime(2024, 1, 7))
+
+
+def test_day_and_weekday_are_ored_when_both_restricted():
+    schedule = CronSchedule("0 8 1 * 1")
+    assert schedule.matches(datetime(2024, 2, 1, 8))  # 1일 (목요일)
+    assert schedule.matches(datetime(2024, 1, 8, 8))  # 월요일
+    assert not schedule.matches(datetime(2024, 1, 9, 8))
+
+
+def test_day_and_weekday_are_anded_when_one_is_wildcard():
+    schedule = CronSchedule("0 8 */2 * 1")
+    assert schedule.matches(datetime(2024, 1, 15, 8))  # 홀수 일 + 월요일
+    assert not schedule.matches(datetime(2024, 1, 8, 8))  # 짝수 일
+
+
+@pytest.mark.parametrize("expression", ["* * *", "60 * * * *", "* * 0 * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_due_once_per_minute():
+    spec = WarmSpec("s", "30 7 * * *", {})
+    assert spec.due(datetime(2024, 1, 1, 7, 30, 5))
+    assert not spec.due(datetime(2024, 1, 1, 7, 30, 40))
+    assert not spec.due(datetime(2024, 1, 1, 7, 31))
+
+
+def test_slot_passed_during_long_run_is_not_skipped():
+    spec = WarmSpec("s", "30 7 * * *", {})
+    assert not spec.due(datetime(2024, 1, 1, 7, 25))
+    # 이전 워밍이 7:25 ~ 7:34 동안 실행됨
+    assert spec.due(datetime(2024, 1, 1, 7, 34))
+    assert not spec.due(datetime(2024, 1, 1, 7, 35))
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from utils.trend import analyze_series, fill_missing_days, parse_day, rolling_baseline
+
+
+def test_rolling_baseline_matches_direct_computation():
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 10, size=(30, 2))
+    mean, std, counts = rolling_baseline(values, 7)
+    for day in (7, 15, 29):
+        window = values[day - 7 : day]
+        assert np.allclose(mean[day], window.mean(axis=0))
+        assert np.allclose(std[day], window.std(axis=0, ddof=1))
+    assert counts[0].tolist() == [0, 0]
+    assert counts[3].tolist() == [3, 3]
+
+
+def test_rolling_baseline_is_stable_for_large_values():
+    # 큰 값 + 작은 변동: 누적 제곱합 방식은 여기서 분산이 무너짐
+    values = (1e9 + np.tile([0.0, 1.0], 20))[:, None]
+    _, std, _ = rolling_baseline(values, 14)
+    assert np.allclose(std[14:, 0], np.std([0.0, 1.0] * 7, ddof=1))
+
+
+def test_rolling_baseline_skips_missing_days():
+    values = np.array([[1.0], [np.nan], [3.0], [5.0]])
+    mean, _, counts = rolling_baseline(values, 3)
+    assert counts[:, 0].tolist() == [0, 1, 1, 2]
+    assert mean[3, 0] == 2.0
+
+
+def test_fill_missing_days_uses_nan():
+    days = [date(2024, 1, 3), date(2024, 1, 1)]
+    full, filled = fill_missing_days(days, np.array([[3.0], [1.0]]))
+    assert full == [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)]
+    assert filled[0, 0] == 1.0 and np.isnan(filled[1, 0]) and filled[2, 0] == 3.0
+
+
+def test_missing_day_is_not_an_anomaly():
+    start = date(2024, 1, 1)
+    days = [start + timedelta(days=i) for i in range(28)]
+    values = np.full((28, 1), 100.0) + np.tile([0.0, 2.0], 14)[:, None]
+    values[20] = np.nan
+    values[25] = 500.0
+    result = analyze_series(days, values, ["visits"], window=10, threshold=3.0, seasonal=False)
+    assert [a["date"] for a in result["anomalies"]] == ["2024-01-26"]
+    assert result["excluded_days"] == ["2024-01-21"]
+    assert result["days"] == 27
+
+
+def test_parse_day():
+    assert parse_day({"itemId": "1240005"}) == date(2024, 1, 5)
+    assert parse_day({"itemId": "x", "value": "2024-01-05"}) == date(2024, 1, 5)
+    assert parse_day({"itemId": "x", "value": "Jan 5"}) is None